@@ -0,0 +1,187 @@
+﻿/* Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+ * sacad is licensed under Mulan PubL v2.
+ * You can use this software according to the terms and conditions of the Mulan PubL v2.
+ * You may obtain a copy of Mulan PubL v2 at:
+ *          http://license.coscl.org.cn/MulanPubL-2.0
+ * THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+ * EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+ * MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+ * See the Mulan PubL v2 for more details.
+ */
+
+using System.Collections.Generic;
+using System.Linq;
+using AcDb = Autodesk.AutoCAD.DatabaseServices;
+using AcRx = Autodesk.AutoCAD.Runtime;
+
+// ReSharper disable InconsistentNaming
+
+namespace SacadMgd
+{
+    public enum GroupKey
+    {
+        Type,
+        Layer,
+        Linetype,
+        ColorIndex,
+        TextStyle,
+    }
+
+    public enum Aggregate
+    {
+        Count,
+        Length,
+        Area,
+        Extents,
+    }
+
+    [PyType("sacad.aggregate.AggregateRow")]
+    public sealed class AggregateRow
+    {
+        public List<object> key;
+        public int? count;
+        public double? length;
+        public double? area;
+        public PyWrapper<Extents3d> extents;
+    }
+
+    /// <summary>
+    /// Aggregation of entities by SelectMode.AGGREGATE, whose semantics must
+    /// stay the same as sacad.aggregate.
+    /// </summary>
+    public sealed class Aggregator
+    {
+        private readonly List<GroupKey> groupBy;
+        private readonly List<Aggregate> aggregates;
+
+        private readonly Dictionary<string, AggregateRow> rows =
+            new Dictionary<string, AggregateRow>();
+
+        private readonly List<AggregateRow> orderedRows =
+            new List<AggregateRow>();
+
+        private readonly Dictionary<AggregateRow, AcDb.Extents3d> extents =
+            new Dictionary<AggregateRow, AcDb.Extents3d>();
+
+        public Aggregator(List<GroupKey> groupBy, List<Aggregate> aggregates)
+        {
+            this.groupBy = groupBy ?? new List<GroupKey>();
+            this.aggregates = aggregates?.Count > 0
+                ? aggregates
+                : new List<Aggregate> { Aggregate.Count };
+        }
+
+        public void Add(AcDb.Entity entity)
+        {
+            var key = groupBy.Select(k => KeyOf(entity, k)).ToList();
+            var id = string.Join("\u0001", key.Select(v =>
+                v == null ? "\u0000" : $"{v.GetType().Name}:{v}"));
+
+            AggregateRow row;
+            if (!rows.TryGetValue(id, out row))
+            {
+                row = new AggregateRow
+                {
+                    key = key,
+                    count = aggregates.Contains(Aggregate.Count)
+                        ? 0
+                        : (int?)null,
+                    length = aggregates.Contains(Aggregate.Length)
+                        ? 0.0
+                        : (double?)null,
+                    area = aggregates.Contains(Aggregate.Area)
+                        ? 0.0
+                        : (double?)null,
+                };
+                rows[id] = row;
+                orderedRows.Add(row);
+            }
+
+            if (row.count.HasValue) row.count++;
+            if (row.length.HasValue) row.length += LengthOf(entity);
+            if (row.area.HasValue) row.area += AreaOf(entity);
+
+            var bounds = entity.Bounds;
+            if (aggregates.Contains(Aggregate.Extents) && bounds.HasValue)
+            {
+                AcDb.Extents3d union;
+                if (extents.TryGetValue(row, out union))
+                {
+                    union.AddExtents(bounds.Value);
+                    extents[row] = union;
+                }
+                else
+                {
+                    extents[row] = bounds.Value;
+                }
+            }
+        }
+
+        /// <summary>
+        /// Rows in the order of the first entity of each group.
+        /// </summary>
+        public List<PyWrapper<AggregateRow>> GetRows()
+        {
+            foreach (var pair in extents)
+            {
+                pair.Key.extents =
+                    PyWrapper<Extents3d>.Create((Extents3d)pair.Value);
+            }
+
+            return orderedRows
+                .Select(r => PyWrapper<AggregateRow>.Create(r))
+                .ToList();
+        }
+
+        private static object KeyOf(AcDb.Entity entity, GroupKey key)
+        {
+            switch (key)
+            {
+                case GroupKey.Type:
+                    return Entity.PyTypeOf(entity);
+                case GroupKey.Layer:
+                    return entity.Layer;
+                case GroupKey.Linetype:
+                    return entity.Linetype;
+                case GroupKey.ColorIndex:
+                    return entity.ColorIndex;
+                case GroupKey.TextStyle:
+                    return (entity as AcDb.DBText)?.TextStyleName
+                           ?? (entity as AcDb.MText)?.TextStyleName;
+                default:
+                    return null;
+            }
+        }
+
+        private static double LengthOf(AcDb.Entity entity)
+        {
+            var curve = entity as AcDb.Curve;
+            if (curve == null) return 0.0;
+
+            try
+            {
+                return curve.GetDistanceAtParameter(curve.EndParam)
+                       - curve.GetDistanceAtParameter(curve.StartParam);
+            }
+            catch (AcRx.Exception)
+            {
+                return 0.0;
+            }
+        }
+
+        private static double AreaOf(AcDb.Entity entity)
+        {
+            var curve = entity as AcDb.Curve;
+            if (curve == null) return 0.0;
+
+            try
+            {
+                return curve.Area;
+            }
+            catch (AcRx.Exception)
+            {
+                return 0.0;
+            }
+        }
+    }
+}
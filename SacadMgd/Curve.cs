@@ -230,13 +230,23 @@ namespace SacadMgd
             if (normal != null) polyline.Normal = normal.ToVector3d();
             if (thickness.HasValue) polyline.Thickness = thickness.Value;
 
-            foreach (var v in vertices)
+            if (vertices != null)
             {
-                polyline.AddVertexAt(polyline.NumberOfVertices,
-                    v.__mbr__.point.ToPoint2d(),
-                    v.__mbr__.bulge ?? 0,
-                    v.__mbr__.start_width ?? constant_width ?? 0,
-                    v.__mbr__.end_width ?? constant_width ?? 0);
+                // Vertices replace those of an existing polyline, which is
+                // patched by DbUpdateQuery.
+                var oldCount = polyline.NumberOfVertices;
+
+                foreach (var v in vertices)
+                {
+                    polyline.AddVertexAt(polyline.NumberOfVertices,
+                        v.__mbr__.point.ToPoint2d(),
+                        v.__mbr__.bulge ?? 0,
+                        v.__mbr__.start_width ?? constant_width ?? 0,
+                        v.__mbr__.end_width ?? constant_width ?? 0);
+                }
+
+                for (var i = 0; i < oldCount; i++)
+                    polyline.RemoveVertexAt(0);
             }
 
             return base.ToArx(obj, db);
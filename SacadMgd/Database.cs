@@ -177,6 +177,20 @@ namespace SacadMgd
                 : null;
         }
 
+        /// <summary>
+        /// Full name of the Python type converted from the entity, or null if
+        /// the entity is not supported.
+        /// </summary>
+        public static string PyTypeOf(AcDb.Entity arxEntity)
+        {
+            Type type;
+            string pyType;
+            return ArxTypes.TryGetValue(arxEntity.GetType(), out type)
+                   && Python.PyTypes.TryGetValue(type, out pyType)
+                ? pyType
+                : null;
+        }
+
         internal static void RegisterALl()
         {
             var asm = Assembly.GetExecutingAssembly();
@@ -9,6 +9,7 @@
  * See the Mulan PubL v2 for more details.
  */
 
+using System.Collections.Generic;
 using System.Diagnostics.CodeAnalysis;
 using AcAp = Autodesk.AutoCAD.ApplicationServices;
 using AcDb = Autodesk.AutoCAD.DatabaseServices;
@@ -98,6 +99,33 @@ namespace SacadMgd
             return null;
         }
 
+        /// <summary>
+        /// Entities of all blocks, by the ids known to the client, i.e. their
+        /// OldIdPtr. Ids from the client are looked up here, since an
+        /// ObjectId made of a stale or forged pointer crashes AutoCAD once it
+        /// is dereferenced, even by IsValid.
+        /// </summary>
+        public static Dictionary<long, AcDb.ObjectId> GetEntityIds(
+            this AcDb.Database db)
+        {
+            var trans = db.TransactionManager.TopTransaction;
+            var table = (AcDb.BlockTable)trans.GetObject(db.BlockTableId,
+                AcDb.OpenMode.ForRead);
+
+            var ids = new Dictionary<long, AcDb.ObjectId>();
+            foreach (var bid in table)
+            {
+                var block = (AcDb.BlockTableRecord)trans.GetObject(bid,
+                    AcDb.OpenMode.ForRead);
+                foreach (var eid in block)
+                {
+                    if (eid.IsValid) ids[eid.OldIdPtr.ToInt64()] = eid;
+                }
+            }
+
+            return ids;
+        }
+
         public static AcDb.LayerTableRecord GetLayer(this AcDb.Database db,
             string name)
         {
@@ -44,6 +44,8 @@ namespace SacadMgd
         public bool? upsert;
         public ZoomMode? zoom_mode;
         public double? zoom_factor;
+        public bool? report_failed_entities;
+        public Dictionary<string, List<long>> grouping;
 
         public override Result Execute()
         {
@@ -279,9 +281,10 @@ namespace SacadMgd
 
             var modelSpace = clientDb
                 .block_table[AcDb.BlockTableRecord.ModelSpace].__mbr__;
-            var reversed_group = ReverseGroup(clientDb);
-            foreach (var entity in modelSpace.entities)
+            var reversed_group = ReverseGroup(clientDb, grouping);
+            for (var i = 0; i < modelSpace.entities.Count; i++)
             {
+                var entity = modelSpace.entities[i];
                 try
                 {
                     var newEntity = (AcDb.Entity)entity.__mbr__.ToArx(null, db);
@@ -302,7 +305,7 @@ namespace SacadMgd
 
                     result.num_inserted++;
 
-                    Group value;
+                    string value;
                     if (entity.__mbr__.id.HasValue &&
                         reversed_group.TryGetValue(entity.__mbr__.id.Value,
                             out value))
@@ -315,6 +318,13 @@ namespace SacadMgd
                     Util.ConsoleWriteLine(
                         $"{entity.__cls__} insertion failed: {ex.Message}");
                     result.num_failure++;
+
+                    if (report_failed_entities == true)
+                    {
+                        if (result.failed_entities == null)
+                            result.failed_entities = new List<int>();
+                        result.failed_entities.Add(i);
+                    }
                 }
             }
 
@@ -345,9 +355,10 @@ namespace SacadMgd
             doc.Editor.SetCurrentView(view);
         }
 
-        private static Dictionary<long, Group> ReverseGroup(Database db)
+        private static Dictionary<long, string> ReverseGroup(Database db,
+            Dictionary<string, List<long>> grouping)
         {
-            var reversed = new Dictionary<long, Group>();
+            var reversed = new Dictionary<long, string>();
             foreach (var entry in db.GetGroupDict())
             {
                 var group = entry.Value.__mbr__;
@@ -355,17 +366,28 @@ namespace SacadMgd
 
                 foreach (var eid in group.entity_ids)
                 {
-                    reversed[eid] = group;
+                    reversed[eid] = group.name;
+                }
+            }
+
+            if (grouping == null) return reversed;
+
+            // Groups which already exist in the drawing.
+            foreach (var entry in grouping)
+            {
+                foreach (var eid in entry.Value)
+                {
+                    reversed[eid] = entry.Key;
                 }
             }
 
             return reversed;
         }
 
-        private static void DoGrouping(AcDb.Entity entity, Group group,
+        private static void DoGrouping(AcDb.Entity entity, string groupName,
             AcDb.Database db)
         {
-            var arxGroup = db.GetGroup(group.name);
+            var arxGroup = db.GetGroup(groupName);
             try
             {
                 arxGroup.UpgradeOpen();
@@ -387,6 +409,16 @@ namespace SacadMgd
         public bool? explode_blocks;
         public List<string> block_names;
         public bool? select_by_prompt;
+        public List<Vector3d> region;
+        public PyWrapper<EntityFilter> filter;
+        public List<GroupKey> group_by;
+        public List<Aggregate> aggregates;
+        public PyWrapper<Projection> projection;
+        public int? page_size;
+        public string cursor;
+        public Dictionary<string, string> table_versions;
+
+        private Pager pager;
 
         public override Result Execute()
         {
@@ -398,6 +430,18 @@ namespace SacadMgd
             var db = AcDb.HostApplicationServices.WorkingDatabase;
             try
             {
+                if (page_size.HasValue && mode != Mode.TestEntities)
+                {
+                    if (mode == Mode.GetUserSelection && explode_blocks == true)
+                    {
+                        result.status = Status.Failure;
+                        result.message = "Exploded entities cannot be paged.";
+                        return result;
+                    }
+
+                    pager = new Pager(page_size.Value, cursor);
+                }
+
                 using (db.TransactionManager.StartTransaction())
                 {
                     switch (mode)
@@ -414,10 +458,30 @@ namespace SacadMgd
                         case Mode.GetGroups:
                             GetGroups(db, result);
                             break;
+                        case Mode.Window:
+                        case Mode.Crossing:
+                        case Mode.Fence:
+                            GetRegion(db, result);
+                            break;
+                        case Mode.Aggregate:
+                            GetAggregate(db, result);
+                            break;
                         default:
                             throw new ArgumentOutOfRangeException();
                     }
 
+                    if (pager != null && pager.IsStale
+                        && result.status != Status.Failure)
+                    {
+                        result.db = PyWrapper<Database>.Create(new Database());
+                        result.status = Status.Failure;
+                        result.message = "The cursor is invalid or stale.";
+                        return result;
+                    }
+
+                    result.cursor = pager?.NextCursor;
+                    projection?.__mbr__.Apply(result.db.__mbr__);
+
                     if (result.status == Status.Unknown)
                         result.status = Status.Success;
                 }
@@ -431,22 +495,46 @@ namespace SacadMgd
             return result;
         }
 
+        /// <summary>
+        /// Reports the version of the table, and whether the client has cached
+        /// the table of the version, which is not sent back then.
+        /// </summary>
+        private bool IsCached(AcDb.Database db, AcDb.ObjectId tableId,
+            string name, DbSelectResult result)
+        {
+            var version = TableVersion.Of(db, tableId);
+            result.table_versions = result.table_versions ??
+                                    new Dictionary<string, string>();
+            result.table_versions[name] = version;
+
+            string cached;
+            return table_versions != null &&
+                   table_versions.TryGetValue(name, out cached) &&
+                   cached == version;
+        }
+
         private void GetTable(AcDb.Database db, DbSelectResult result)
         {
             var trans = db.TransactionManager.TopTransaction;
             result.db = result.db ?? PyWrapper<Database>.Create(new Database());
 
-            if ((table_flags & (int)TableFlags.ModelSpace) != 0)
+            // Symbol tables and blocks are selected with the first page.
+            var flags = cursor == null
+                ? table_flags
+                : table_flags & (int)TableFlags.ModelSpace;
+
+            if ((flags & (int)TableFlags.ModelSpace) != 0)
             {
                 result.db.__mbr__.block_table =
                     result.db.__mbr__.block_table ??
                     new Dictionary<string, PyWrapper<BlockTableRecord>>();
 
                 SelectBlock(db, db.GetBlock(AcDb.BlockTableRecord.ModelSpace),
-                    result.db.__mbr__.block_table);
+                    result.db.__mbr__.block_table, filter?.__mbr__, pager);
             }
 
-            if ((table_flags & (int)TableFlags.TextStyle) != 0)
+            if ((flags & (int)TableFlags.TextStyle) != 0 &&
+                !IsCached(db, db.TextStyleTableId, "text_style_table", result))
             {
                 result.db.__mbr__.text_style_table =
                     result.db.__mbr__.text_style_table ??
@@ -456,7 +544,8 @@ namespace SacadMgd
                     result.db.__mbr__.text_style_table);
             }
 
-            if ((table_flags & (int)TableFlags.Linetype) != 0)
+            if ((flags & (int)TableFlags.Linetype) != 0 &&
+                !IsCached(db, db.LinetypeTableId, "linetype_table", result))
             {
                 result.db.__mbr__.linetype_table =
                     result.db.__mbr__.linetype_table ??
@@ -466,7 +555,8 @@ namespace SacadMgd
                     result.db.__mbr__.linetype_table);
             }
 
-            if ((table_flags & (int)TableFlags.Layer) != 0)
+            if ((flags & (int)TableFlags.Layer) != 0 &&
+                !IsCached(db, db.LayerTableId, "layer_table", result))
             {
                 result.db.__mbr__.layer_table =
                     result.db.__mbr__.layer_table ??
@@ -476,7 +566,8 @@ namespace SacadMgd
                     result.db.__mbr__.layer_table);
             }
 
-            if ((table_flags & (int)TableFlags.DimStyle) != 0)
+            if ((flags & (int)TableFlags.DimStyle) != 0 &&
+                !IsCached(db, db.DimStyleTableId, "dim_style_table", result))
             {
                 result.db.__mbr__.dim_style_table =
                     result.db.__mbr__.dim_style_table ??
@@ -486,7 +577,8 @@ namespace SacadMgd
                     result.db.__mbr__.dim_style_table);
             }
 
-            if ((table_flags & (int)TableFlags.MLeaderStyle) != 0)
+            if ((flags & (int)TableFlags.MLeaderStyle) != 0 &&
+                !IsCached(db, db.MLeaderStyleDictionaryId, "m_leader_style_dict", result))
             {
                 result.db.__mbr__.m_leader_style_dict =
                     result.db.__mbr__.m_leader_style_dict ??
@@ -496,7 +588,7 @@ namespace SacadMgd
                     result.db.__mbr__.m_leader_style_dict);
             }
 
-            if ((table_flags & (int)TableFlags.Blocks) != 0
+            if ((flags & (int)TableFlags.Blocks) != 0
                 && block_names != null)
             {
                 result.db.__mbr__.block_table =
@@ -525,10 +617,11 @@ namespace SacadMgd
         }
 
         private static void SelectBlock(AcDb.Database db,
-            AcDb.BlockTableRecord arxBlock, BlockTable blockTable)
+            AcDb.BlockTableRecord arxBlock, BlockTable blockTable,
+            EntityFilter entityFilter = null, Pager pager = null)
         {
             var block = new BlockTableRecord();
-            block.FromArx(arxBlock, db);
+            block.FromArx(arxBlock, db, entityFilter, pager);
 
             // *MODEL_SPACE needs special treatment for case-insensitivity。
             var blockName = arxBlock.Name;
@@ -614,14 +707,21 @@ namespace SacadMgd
                         continue;
                     }
 
-                    var entity = Entity.Convert(arxEntity, db);
-                    if (entity == null) continue;
+                    if (filter != null && !filter.__mbr__.Match(arxEntity))
+                        continue;
 
-                    modelSpace.entities.Add(PyWrapper<Entity>.Create(entity));
+                    if (!Pager.Collect(pager, arxEntity, db,
+                            modelSpace.entities))
+                    {
+                        break;
+                    }
                 }
 
                 foreach (AcDb.Entity arxEntity in exploded)
                 {
+                    if (filter != null && !filter.__mbr__.Match(arxEntity))
+                        continue;
+
                     var entity = Entity.Convert(arxEntity, db);
                     if (entity == null) continue;
 
@@ -653,19 +753,20 @@ namespace SacadMgd
 
                 var rids = ent.GetPersistentReactorIds();
                 if ((rids?.Count ?? 0) == 0) continue;
+                if (filter != null && !filter.__mbr__.Match(ent)) continue;
 
-                foreach (AcDb.ObjectId rid in rids)
-                {
-                    if (!groupIds.Contains(rid)) continue;
-
-                    var resultEntity = Entity.Convert(ent, db);
-                    if (resultEntity == null) continue;
+                // Entities of several groups are selected once, as the pages
+                // are resumed by ids.
+                if (!rids.Cast<AcDb.ObjectId>().Any(groupIds.Contains))
+                    continue;
 
-                    resultModelSpace.entities.Add(
-                        PyWrapper<Entity>.Create(resultEntity));
-                }
+                if (!Pager.Collect(pager, ent, db, resultModelSpace.entities))
+                    break;
             }
 
+            // Groups are selected with the first page.
+            if (cursor != null) return;
+
             var resultGroupDict = result.db.__mbr__.GetGroupDict();
             foreach (var group in groups)
             {
@@ -676,6 +777,54 @@ namespace SacadMgd
             }
         }
 
+        private void GetRegion(AcDb.Database db, DbSelectResult result)
+        {
+            var trans = db.TransactionManager.TopTransaction;
+            var test = Region.TestOf(mode);
+
+            var modelSpace = db.GetBlock(AcDb.BlockTableRecord.ModelSpace);
+            var resultModelSpace = result.db.__mbr__.GetModelSpace();
+            foreach (var eid in modelSpace)
+            {
+                if (!eid.IsValid) continue;
+
+                var arxEntity = (AcDb.Entity)trans.GetObject(
+                    eid, AcDb.OpenMode.ForRead);
+                if (filter != null && !filter.__mbr__.Match(arxEntity))
+                    continue;
+
+                var bounds = arxEntity.Bounds;
+                if (!bounds.HasValue || !test(bounds.Value, region)) continue;
+
+                if (!Pager.Collect(pager, arxEntity, db,
+                        resultModelSpace.entities))
+                {
+                    break;
+                }
+            }
+        }
+
+        private void GetAggregate(AcDb.Database db, DbSelectResult result)
+        {
+            var trans = db.TransactionManager.TopTransaction;
+            var aggregator = new Aggregator(group_by, aggregates);
+
+            var modelSpace = db.GetBlock(AcDb.BlockTableRecord.ModelSpace);
+            foreach (var eid in modelSpace)
+            {
+                if (!eid.IsValid) continue;
+
+                var arxEntity = (AcDb.Entity)trans.GetObject(
+                    eid, AcDb.OpenMode.ForRead);
+                if (filter != null && !filter.__mbr__.Match(arxEntity))
+                    continue;
+
+                aggregator.Add(arxEntity);
+            }
+
+            result.rows = aggregator.GetRows();
+        }
+
         private static void SelectSymbols<TRecord>(
             AcDb.Database db, AcDb.ObjectId tableId,
             IDictionary<string, PyWrapper<TRecord>> table)
@@ -728,6 +877,10 @@ namespace SacadMgd
             GetUserSelection,
             TestEntities,
             GetGroups,
+            Window,
+            Crossing,
+            Fence,
+            Aggregate,
         }
 
         private enum TableFlags
@@ -742,9 +895,193 @@ namespace SacadMgd
         }
     }
 
+    /// <summary>
+    /// Executes a list of queries in order. As a whole they are processed by
+    /// one SACAD_DBOP, so the document is locked only once.
+    /// </summary>
+    public sealed class DbCompoundQuery : DbQuery
+    {
+        public List<PyWrapper<DbQuery>> queries;
+
+        public override Result Execute()
+        {
+            var result = new DbCompoundResult
+            {
+                results = new List<PyWrapper<Result>>()
+            };
+
+            if (queries == null)
+            {
+                result.status = Status.Success;
+                return result;
+            }
+
+            foreach (var query in queries)
+            {
+                Result subResult;
+                try
+                {
+                    subResult = query.__mbr__.Execute();
+                }
+                catch (Exception ex)
+                {
+                    Util.ConsoleWriteLine(ex);
+                    subResult = new Result
+                    {
+                        status = Status.Unknown,
+                        message = $"Unhandled exception: {ex.Message}"
+                    };
+                }
+
+                result.results.Add(PyWrapper<Result>.Create(subResult));
+            }
+
+            if (result.results.All(r => r.__mbr__.status == Status.Success))
+                result.status = Status.Success;
+            else if (result.results.Any(r =>
+                         r.__mbr__.status == Status.Success ||
+                         r.__mbr__.status == Status.Warning))
+                result.status = Status.Warning;
+            else
+                result.status = Status.Failure;
+
+            return result;
+        }
+    }
+
+    /// <summary>
+    /// Patches existing entities by their ids. Entities of the model space of
+    /// the database are patches, with only the fields to be changed. Values
+    /// are assigned to all entities of the model space passing the filter.
+    /// </summary>
+    public sealed class DbUpdateQuery : DbQuery
+    {
+        public PyWrapper<EntityFilter> filter;
+        public PyWrapper<Entity> values;
+
+        public override Result Execute()
+        {
+            var result = new DbUpdateResult();
+
+            var db = AcDb.HostApplicationServices.WorkingDatabase;
+            try
+            {
+                var clientDb = database?.__mbr__;
+
+                using (var trans = db.TransactionManager.StartTransaction())
+                {
+                    PyWrapper<BlockTableRecord> modelSpace = null;
+                    clientDb?.block_table?.TryGetValue(
+                        AcDb.BlockTableRecord.ModelSpace, out modelSpace);
+
+                    var patches = modelSpace?.__mbr__.entities;
+                    var entityIds = patches?.Any() == true
+                        ? db.GetEntityIds()
+                        : null;
+                    foreach (var patch in patches ??
+                                          new List<PyWrapper<Entity>>())
+                    {
+                        try
+                        {
+                            UpdateEntity(db, patch.__mbr__, entityIds, trans);
+                            result.num_updated++;
+                        }
+                        catch (Exception ex)
+                        {
+                            Util.ConsoleWriteLine(
+                                $"{patch.__cls__} update failed: {ex.Message}");
+                            result.num_failure++;
+                        }
+                    }
+
+                    if (values != null) AssignValues(db, trans, result);
+
+                    trans.Commit();
+                }
+
+                if (result.num_updated > 0)
+                {
+                    result.status = result.num_failure > 0
+                        ? Status.Warning
+                        : Status.Success;
+                }
+                else
+                {
+                    result.status = result.num_failure > 0
+                        ? Status.Failure
+                        : Status.Success;
+                }
+            }
+            catch (Exception ex)
+            {
+                Util.ConsoleWriteLine(ex);
+                result.message = $"Unhandled exception: {ex.Message}";
+            }
+
+            return result;
+        }
+
+        private void AssignValues(AcDb.Database db, AcDb.Transaction trans,
+            DbUpdateResult result)
+        {
+            var value = values.__mbr__;
+            if (value.layer != null && db.GetLayer(value.layer) == null)
+            {
+                Util.ConsoleWriteLine($"Unknown layer {value.layer}.");
+                result.num_failure++;
+                return;
+            }
+
+            var modelSpace = db.GetBlock(AcDb.BlockTableRecord.ModelSpace);
+            foreach (var eid in modelSpace)
+            {
+                if (!eid.IsValid) continue;
+
+                var arxEntity = (AcDb.Entity)trans.GetObject(
+                    eid, AcDb.OpenMode.ForRead);
+                if (filter != null && !filter.__mbr__.Match(arxEntity))
+                    continue;
+
+                try
+                {
+                    arxEntity.UpgradeOpen();
+                    value.ToArx(arxEntity, db);
+                    result.num_updated++;
+                }
+                catch (Exception ex)
+                {
+                    Util.ConsoleWriteLine(
+                        $"{values.__cls__} update failed: {ex.Message}");
+                    result.num_failure++;
+                }
+            }
+        }
+
+        private static void UpdateEntity(AcDb.Database db, Entity patch,
+            Dictionary<long, AcDb.ObjectId> entityIds, AcDb.Transaction trans)
+        {
+            if (!patch.id.HasValue)
+                throw new ArgumentException("Entity without id.");
+            if (patch.layer != null && db.GetLayer(patch.layer) == null)
+                throw new ArgumentException($"Unknown layer {patch.layer}.");
+
+            AcDb.ObjectId eid;
+            if (!entityIds.TryGetValue(patch.id.Value, out eid))
+                throw new ArgumentException($"Invalid id {patch.id}.");
+
+            // ToArx casts the object to the type of the patch, before any
+            // field is changed, so patches of wrong types fail as a whole.
+            patch.ToArx(trans.GetObject(eid, AcDb.OpenMode.ForWrite), db);
+        }
+    }
+
     public sealed class DbDeleteQuery : DbQuery
     {
         public bool? delete_group_entities;
+        public List<long> entity_ids;
+        public PyWrapper<EntityFilter> filter;
+        public DbSelectQuery.Mode? mode;
+        public List<Vector3d> region;
 
         public override Result Execute()
         {
@@ -757,10 +1094,13 @@ namespace SacadMgd
 
                 using (var trans = db.TransactionManager.StartTransaction())
                 {
-                    DeleteEntities(db, clientDb?.block_table, trans, result);
+                    DeleteEntities(db, CollectIds(db, clientDb, trans),
+                        trans, result);
                     DeleteGroups(db, clientDb?.group_dict, trans, result);
                     trans.Commit();
                 }
+
+                result.status = Status.Success;
             }
             catch (Exception ex)
             {
@@ -771,21 +1111,74 @@ namespace SacadMgd
             return result;
         }
 
-        private void DeleteEntities(AcDb.Database db, BlockTable blockTable,
-            AcDb.Transaction trans, DbDeleteResult result)
+        /// <summary>
+        /// Ids of the entities of the block table, of entity_ids, and of the
+        /// entities of the model space passing the filter and in the region.
+        /// </summary>
+        private HashSet<AcDb.ObjectId> CollectIds(AcDb.Database db,
+            Database clientDb, AcDb.Transaction trans)
         {
-            foreach (var block in blockTable.Values)
+            var ids = new HashSet<AcDb.ObjectId>();
+
+            var blocks = clientDb?.block_table?.Values ??
+                         Enumerable.Empty<PyWrapper<BlockTableRecord>>();
+            var clientIds = blocks
+                .SelectMany(b => b.__mbr__.entities)
+                .Where(e => e.__mbr__.id.HasValue)
+                .Select(e => e.__mbr__.id.Value)
+                .Concat(entity_ids ?? new List<long>())
+                .ToList();
+
+            // Ids unknown to the database are skipped, like erased ones.
+            if (clientIds.Any())
             {
-                foreach (var entity in block.__mbr__.entities)
+                var entityIds = db.GetEntityIds();
+                foreach (var id in clientIds)
                 {
-                    if (!entity.__mbr__.id.HasValue) continue;
-                    var eid =
-                        new AcDb.ObjectId(new IntPtr(entity.__mbr__.id.Value));
-                    if (!eid.IsValid) continue;
-                    trans.GetObject(eid, AcDb.OpenMode.ForWrite).Erase();
-                    result.num_deleted++;
+                    AcDb.ObjectId eid;
+                    if (entityIds.TryGetValue(id, out eid)) ids.Add(eid);
                 }
             }
+
+            // Without filter or region, nothing of the model space is deleted.
+            if (filter == null && region == null) return ids;
+
+            var test = region != null
+                ? Region.TestOf(mode ?? DbSelectQuery.Mode.Window)
+                : null;
+            var modelSpace = db.GetBlock(AcDb.BlockTableRecord.ModelSpace);
+            foreach (var eid in modelSpace)
+            {
+                if (!eid.IsValid) continue;
+
+                var arxEntity = (AcDb.Entity)trans.GetObject(
+                    eid, AcDb.OpenMode.ForRead);
+                if (filter != null && !filter.__mbr__.Match(arxEntity))
+                    continue;
+
+                if (test != null)
+                {
+                    var bounds = arxEntity.Bounds;
+                    if (!bounds.HasValue || !test(bounds.Value, region))
+                        continue;
+                }
+
+                ids.Add(eid);
+            }
+
+            return ids;
+        }
+
+        private static void DeleteEntities(AcDb.Database db,
+            IEnumerable<AcDb.ObjectId> ids, AcDb.Transaction trans,
+            DbDeleteResult result)
+        {
+            foreach (var eid in ids)
+            {
+                if (!eid.IsValid || eid.IsErased) continue;
+                trans.GetObject(eid, AcDb.OpenMode.ForWrite).Erase();
+                result.num_deleted++;
+            }
         }
 
         private void DeleteGroups(AcDb.Database db, GroupDict groupDict,
@@ -801,6 +1194,7 @@ namespace SacadMgd
                 {
                     foreach (var eid in group.GetAllEntityIds())
                     {
+                        if (eid.IsErased) continue;
                         trans.GetObject(eid, AcDb.OpenMode.ForWrite).Erase();
                         result.num_deleted++;
                     }
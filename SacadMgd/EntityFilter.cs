@@ -0,0 +1,155 @@
+﻿/* Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+ * sacad is licensed under Mulan PubL v2.
+ * You can use this software according to the terms and conditions of the Mulan PubL v2.
+ * You may obtain a copy of Mulan PubL v2 at:
+ *          http://license.coscl.org.cn/MulanPubL-2.0
+ * THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+ * EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+ * MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+ * See the Mulan PubL v2 for more details.
+ */
+
+using System.Collections.Generic;
+using System.Linq;
+using System.Text.RegularExpressions;
+using AcDb = Autodesk.AutoCAD.DatabaseServices;
+
+// ReSharper disable InconsistentNaming
+
+namespace SacadMgd
+{
+    /// <summary>
+    /// Filters of entities built by sacad.filters, whose semantics must stay
+    /// the same as the method match of their Python counterparts.
+    /// </summary>
+    public abstract class EntityFilter
+    {
+        public abstract bool Match(AcDb.Entity entity);
+
+        /// <summary>
+        /// Wildcards where "*" matches any sequence of characters, and "?"
+        /// matches any single character.
+        /// </summary>
+        protected static Regex Wildcard(string pattern, bool ignoreCase)
+        {
+            var regex = string.Concat(pattern.Select(c =>
+                c == '*' ? ".*" : c == '?' ? "." : Regex.Escape(c.ToString())));
+            var options = RegexOptions.Singleline
+                          | RegexOptions.CultureInvariant;
+            if (ignoreCase) options |= RegexOptions.IgnoreCase;
+            return new Regex($"^(?:{regex})\\z", options);
+        }
+
+        protected static bool MatchAny(ref Regex[] regexes,
+            List<string> patterns, string name)
+        {
+            regexes = regexes ?? (patterns ?? new List<string>())
+                .Select(p => Wildcard(p, true))
+                .ToArray();
+            return name != null && regexes.Any(r => r.IsMatch(name));
+        }
+    }
+
+    public sealed class AllOf : EntityFilter
+    {
+        public List<PyWrapper<EntityFilter>> filters;
+
+        public override bool Match(AcDb.Entity entity) =>
+            filters?.All(f => f.__mbr__.Match(entity)) ?? true;
+    }
+
+    public sealed class AnyOf : EntityFilter
+    {
+        public List<PyWrapper<EntityFilter>> filters;
+
+        public override bool Match(AcDb.Entity entity) =>
+            filters?.Any(f => f.__mbr__.Match(entity)) ?? false;
+    }
+
+    public sealed class Not : EntityFilter
+    {
+        public PyWrapper<EntityFilter> filter;
+
+        public override bool Match(AcDb.Entity entity) =>
+            filter != null && !filter.__mbr__.Match(entity);
+    }
+
+    public sealed class TypeIn : EntityFilter
+    {
+        public List<string> types;
+
+        public override bool Match(AcDb.Entity entity)
+        {
+            var pyType = Entity.PyTypeOf(entity);
+            return pyType != null && types?.Contains(pyType) == true;
+        }
+    }
+
+    public sealed class LayerIn : EntityFilter
+    {
+        public List<string> patterns;
+
+        private Regex[] _regexes;
+
+        public override bool Match(AcDb.Entity entity) =>
+            MatchAny(ref _regexes, patterns, entity.Layer);
+    }
+
+    public sealed class LinetypeIn : EntityFilter
+    {
+        public List<string> patterns;
+
+        private Regex[] _regexes;
+
+        public override bool Match(AcDb.Entity entity) =>
+            MatchAny(ref _regexes, patterns, entity.Linetype);
+    }
+
+    public sealed class ColorIn : EntityFilter
+    {
+        public List<int> color_indices;
+
+        public override bool Match(AcDb.Entity entity) =>
+            color_indices?.Contains(entity.ColorIndex) == true;
+    }
+
+    public sealed class TextLike : EntityFilter
+    {
+        public string pattern;
+        public bool? ignore_case;
+
+        private Regex _regex;
+
+        public override bool Match(AcDb.Entity entity)
+        {
+            var text = (entity as AcDb.DBText)?.TextString
+                       ?? (entity as AcDb.MText)?.Contents;
+            if (text == null || pattern == null) return false;
+
+            _regex = _regex ?? Wildcard(pattern, ignore_case == true);
+            return _regex.IsMatch(text);
+        }
+    }
+
+    public sealed class InGroups : EntityFilter
+    {
+        public List<string> group_names;
+
+        private HashSet<AcDb.ObjectId> _groupIds;
+
+        public override bool Match(AcDb.Entity entity)
+        {
+            if (entity.Database == null) return false;
+
+            _groupIds = _groupIds ?? new HashSet<AcDb.ObjectId>(
+                (group_names ?? new List<string>())
+                .Select(entity.Database.GetGroup)
+                .Where(g => g != null)
+                .Select(g => g.ObjectId));
+
+            var rids = entity.GetPersistentReactorIds();
+            return rids != null
+                   && rids.Cast<AcDb.ObjectId>().Any(_groupIds.Contains);
+        }
+    }
+}
@@ -0,0 +1,126 @@
+﻿/* Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+ * sacad is licensed under Mulan PubL v2.
+ * You can use this software according to the terms and conditions of the Mulan PubL v2.
+ * You may obtain a copy of Mulan PubL v2 at:
+ *          http://license.coscl.org.cn/MulanPubL-2.0
+ * THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+ * EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+ * MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+ * See the Mulan PubL v2 for more details.
+ */
+
+using System;
+using System.Collections.Generic;
+using System.Globalization;
+using System.Text;
+using AcDb = Autodesk.AutoCAD.DatabaseServices;
+
+namespace SacadMgd
+{
+    /// <summary>
+    /// Pages of entities selected into model space, whose semantics must stay
+    /// the same as sacad.loopback. The cursor of a page is the id of its last
+    /// entity, right after which the next page resumes.
+    /// </summary>
+    public sealed class Pager
+    {
+        private readonly int pageSize;
+        private long? after;
+        private int count;
+        private long lastId;
+        private bool more;
+
+        public Pager(int pageSize, string cursor)
+        {
+            if (pageSize < 1)
+                throw new ArgumentOutOfRangeException(nameof(pageSize));
+
+            this.pageSize = pageSize;
+            if (cursor != null) after = Decode(cursor);
+        }
+
+        /// <summary>
+        /// Whether the cursor was never met, i.e. the last entity of the
+        /// previous page has been erased, or is selected no more.
+        /// </summary>
+        public bool IsStale => after.HasValue;
+
+        /// <summary>
+        /// Cursor of the next page, or null if this page is the last one.
+        /// </summary>
+        public string NextCursor => more ? Encode(lastId) : null;
+
+        /// <summary>
+        /// Whether the selected entity is skipped, being at or before the
+        /// cursor.
+        /// </summary>
+        public bool Skip(long id)
+        {
+            if (!after.HasValue) return false;
+            if (id == after) after = null;
+            return true;
+        }
+
+        /// <summary>
+        /// Whether the selection stops at the selected entity, since the page
+        /// is full.
+        /// </summary>
+        public bool Stop()
+        {
+            if (count < pageSize) return false;
+            more = true;
+            return true;
+        }
+
+        public void Add(long id)
+        {
+            count++;
+            lastId = id;
+        }
+
+        /// <summary>
+        /// Convert the selected entity into entities, unless it is skipped by
+        /// the pager, which may be null. Returns false if the selection stops.
+        /// </summary>
+        public static bool Collect(Pager pager, AcDb.Entity arxEntity,
+            AcDb.Database db, List<PyWrapper<Entity>> entities)
+        {
+            var id = arxEntity.ObjectId.OldIdPtr.ToInt64();
+            if (pager != null)
+            {
+                if (pager.Skip(id)) return true;
+                if (pager.Stop()) return false;
+            }
+
+            var entity = Entity.Convert(arxEntity, db);
+            if (entity == null) return true;
+
+            entities.Add(PyWrapper<Entity>.Create(entity));
+            pager?.Add(id);
+            return true;
+        }
+
+        private static string Encode(long id) =>
+            Convert.ToBase64String(Encoding.ASCII.GetBytes(
+                id.ToString(CultureInfo.InvariantCulture)));
+
+        private static long Decode(string cursor)
+        {
+            try
+            {
+                return long.Parse(
+                    Encoding.ASCII.GetString(Convert.FromBase64String(cursor)),
+                    NumberStyles.AllowLeadingSign,
+                    CultureInfo.InvariantCulture);
+            }
+            catch (FormatException)
+            {
+                return 0; // Never the id of any entity, so the page fails.
+            }
+            catch (OverflowException)
+            {
+                return 0;
+            }
+        }
+    }
+}
@@ -0,0 +1,94 @@
+﻿/* Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+ * sacad is licensed under Mulan PubL v2.
+ * You can use this software according to the terms and conditions of the Mulan PubL v2.
+ * You may obtain a copy of Mulan PubL v2 at:
+ *          http://license.coscl.org.cn/MulanPubL-2.0
+ * THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+ * EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+ * MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+ * See the Mulan PubL v2 for more details.
+ */
+
+using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using System.Linq;
+using System.Reflection;
+using AcDb = Autodesk.AutoCAD.DatabaseServices;
+
+// ReSharper disable InconsistentNaming
+
+namespace SacadMgd
+{
+    /// <summary>
+    /// Projections of entities built by sacad.projection, whose semantics must
+    /// stay the same as the method apply of their Python counterpart. Fields
+    /// not projected are set to null, so that they are not serialized.
+    /// </summary>
+    public sealed class Projection
+    {
+        public List<string> fields;
+        public Dictionary<string, List<string>> type_fields;
+        public bool? ids_only;
+
+        private static readonly List<string> Nothing = new List<string>();
+
+        private static readonly ConcurrentDictionary<Type, FieldInfo[]>
+            NullableFields = new ConcurrentDictionary<Type, FieldInfo[]>();
+
+        /// <summary>
+        /// Project the entities of model space, those of blocks are left as
+        /// they are.
+        /// </summary>
+        public void Apply(Database db)
+        {
+            PyWrapper<BlockTableRecord> modelSpace;
+            if (db.block_table == null || !db.block_table.TryGetValue(
+                    AcDb.BlockTableRecord.ModelSpace, out modelSpace))
+            {
+                return;
+            }
+
+            foreach (var entity in modelSpace.__mbr__.entities ??
+                                   new List<PyWrapper<Entity>>())
+            {
+                Apply(entity.__mbr__);
+            }
+        }
+
+        public void Apply(Entity entity)
+        {
+            var keep = FieldsOf(entity);
+            if (keep == null) return;
+
+            foreach (var field in NullableFields.GetOrAdd(entity.GetType(),
+                         GetNullableFields))
+            {
+                if (field.Name != "id" && !keep.Contains(field.Name))
+                    field.SetValue(entity, null);
+            }
+        }
+
+        private List<string> FieldsOf(Entity entity)
+        {
+            if (ids_only == true) return Nothing;
+
+            string pyType;
+            List<string> keep;
+            if (type_fields != null
+                && Python.PyTypes.TryGetValue(entity.GetType(), out pyType)
+                && type_fields.TryGetValue(pyType, out keep))
+            {
+                return keep;
+            }
+
+            return fields;
+        }
+
+        private static FieldInfo[] GetNullableFields(Type type) =>
+            type.GetFields(BindingFlags.Public | BindingFlags.Instance)
+                .Where(f => !f.IsInitOnly && (!f.FieldType.IsValueType
+                    || Nullable.GetUnderlyingType(f.FieldType) != null))
+                .ToArray();
+    }
+}
@@ -0,0 +1,187 @@
+﻿/* Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+ * sacad is licensed under Mulan PubL v2.
+ * You can use this software according to the terms and conditions of the Mulan PubL v2.
+ * You may obtain a copy of Mulan PubL v2 at:
+ *          http://license.coscl.org.cn/MulanPubL-2.0
+ * THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+ * EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+ * MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+ * See the Mulan PubL v2 for more details.
+ */
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using AcDb = Autodesk.AutoCAD.DatabaseServices;
+
+namespace SacadMgd
+{
+    /// <summary>
+    /// Selection by regions against geometric extents, projected onto the XY
+    /// plane of WCS, whose semantics must stay the same as sacad.region.
+    /// </summary>
+    public static class Region
+    {
+        /// <summary>
+        /// The test of the mode, which is Window, Crossing or Fence.
+        /// </summary>
+        public static Func<AcDb.Extents3d, List<Vector3d>, bool> TestOf(
+            DbSelectQuery.Mode? mode)
+        {
+            switch (mode)
+            {
+                case DbSelectQuery.Mode.Window:
+                    return InWindow;
+                case DbSelectQuery.Mode.Crossing:
+                    return InCrossing;
+                case DbSelectQuery.Mode.Fence:
+                    return InFence;
+                default:
+                    throw new ArgumentException($"Not a region mode: {mode}.");
+            }
+        }
+
+        public static bool InWindow(AcDb.Extents3d extents,
+            List<Vector3d> region)
+        {
+            var box = Box(extents);
+            var corners = Corners(box);
+            var polygon = Polygon(region);
+
+            return corners.All(c => PointInPolygon(c, polygon))
+                   && !polygon.Any(p => box[0] < p[0] && p[0] < box[2]
+                                        && box[1] < p[1] && p[1] < box[3])
+                   && !Edges(polygon, true).Any(e => Edges(corners, true)
+                       .Any(f => SegmentsCross(e[0], e[1], f[0], f[1])));
+        }
+
+        public static bool InCrossing(AcDb.Extents3d extents,
+            List<Vector3d> region)
+        {
+            var box = Box(extents);
+            var corners = Corners(box);
+            var polygon = Polygon(region);
+
+            return corners.Any(c => PointInPolygon(c, polygon))
+                   || polygon.Any(p => PointInBox(p, box))
+                   || Edges(polygon, true).Any(e => Edges(corners, true)
+                       .Any(f => SegmentsTouch(e[0], e[1], f[0], f[1])));
+        }
+
+        public static bool InFence(AcDb.Extents3d extents,
+            List<Vector3d> region)
+        {
+            var box = Box(extents);
+            var corners = Corners(box);
+            var points = region?.Select(p => new[] { p.X, p.Y }).ToArray();
+            if (points == null || points.Length < 2)
+            {
+                throw new ArgumentException(
+                    "Fence of at least 2 points expected.");
+            }
+
+            return points.Any(p => PointInBox(p, box))
+                   || Edges(points, false).Any(e => Edges(corners, true)
+                       .Any(f => SegmentsTouch(e[0], e[1], f[0], f[1])));
+        }
+
+        private static double[] Box(AcDb.Extents3d extents)
+        {
+            var lo = extents.MinPoint;
+            var hi = extents.MaxPoint;
+            return new[]
+            {
+                Math.Min(lo.X, hi.X), Math.Min(lo.Y, hi.Y),
+                Math.Max(lo.X, hi.X), Math.Max(lo.Y, hi.Y),
+            };
+        }
+
+        private static double[][] Corners(double[] box) => new[]
+        {
+            new[] { box[0], box[1] }, new[] { box[2], box[1] },
+            new[] { box[2], box[3] }, new[] { box[0], box[3] },
+        };
+
+        private static double[][] Polygon(List<Vector3d> region)
+        {
+            var points = region?.Select(p => new[] { p.X, p.Y }).ToArray()
+                         ?? new double[0][];
+            if (points.Length == 2)
+            {
+                return Corners(new[]
+                {
+                    Math.Min(points[0][0], points[1][0]),
+                    Math.Min(points[0][1], points[1][1]),
+                    Math.Max(points[0][0], points[1][0]),
+                    Math.Max(points[0][1], points[1][1]),
+                });
+            }
+
+            if (points.Length < 3)
+            {
+                throw new ArgumentException(
+                    "Rectangle of 2 corners, or polygon of at least 3 " +
+                    "vertices expected.");
+            }
+
+            return points;
+        }
+
+        private static IEnumerable<double[][]> Edges(double[][] points,
+            bool closed)
+        {
+            var n = points.Length;
+            for (var i = 0; i < (closed ? n : n - 1); i++)
+                yield return new[] { points[i], points[(i + 1) % n] };
+        }
+
+        private static bool PointInBox(double[] p, double[] box) =>
+            box[0] <= p[0] && p[0] <= box[2]
+                           && box[1] <= p[1] && p[1] <= box[3];
+
+        private static bool PointInPolygon(double[] p, double[][] polygon)
+        {
+            var inside = false;
+            foreach (var e in Edges(polygon, true))
+            {
+                double[] a = e[0], b = e[1];
+                if (Orientation(a, b, p) == 0 && Within(a, b, p)) return true;
+                if ((a[1] > p[1]) != (b[1] > p[1]) &&
+                    p[0] < (b[0] - a[0]) * (p[1] - a[1]) / (b[1] - a[1])
+                    + a[0])
+                {
+                    inside = !inside;
+                }
+            }
+
+            return inside;
+        }
+
+        private static int Orientation(double[] a, double[] b, double[] c)
+        {
+            var cross = (b[0] - a[0]) * (c[1] - a[1])
+                        - (b[1] - a[1]) * (c[0] - a[0]);
+            return Math.Sign(cross);
+        }
+
+        private static bool Within(double[] a, double[] b, double[] p) =>
+            Math.Min(a[0], b[0]) <= p[0] && p[0] <= Math.Max(a[0], b[0])
+            && Math.Min(a[1], b[1]) <= p[1] && p[1] <= Math.Max(a[1], b[1]);
+
+        private static bool SegmentsCross(double[] a, double[] b, double[] c,
+            double[] d) =>
+            Orientation(a, b, c) * Orientation(a, b, d) < 0
+            && Orientation(c, d, a) * Orientation(c, d, b) < 0;
+
+        private static bool SegmentsTouch(double[] a, double[] b, double[] c,
+            double[] d)
+        {
+            int o1 = Orientation(a, b, c), o2 = Orientation(a, b, d);
+            int o3 = Orientation(c, d, a), o4 = Orientation(c, d, b);
+            if (o1 * o2 < 0 && o3 * o4 < 0) return true;
+
+            return o1 == 0 && Within(a, b, c) || o2 == 0 && Within(a, b, d)
+                || o3 == 0 && Within(c, d, a) || o4 == 0 && Within(c, d, b);
+        }
+    }
+}
@@ -9,6 +9,8 @@
  * See the Mulan PubL v2 for more details.
  */
 
+using System.Collections.Generic;
+
 // ReSharper disable InconsistentNaming
 
 namespace SacadMgd
@@ -36,12 +38,23 @@ namespace SacadMgd
         public int num_failure;
 
         public Vector3d user_insertion_point;
+        public List<int> failed_entities;
     }
 
     [PyType("sacad.result.DBSelectResult")]
     public sealed class DbSelectResult : Result
     {
         public PyWrapper<Database> db;
+        public string cursor;
+        public List<PyWrapper<AggregateRow>> rows;
+        public Dictionary<string, string> table_versions;
+    }
+
+    [PyType("sacad.result.DBUpdateResult")]
+    public sealed class DbUpdateResult : Result
+    {
+        public int num_updated;
+        public int num_failure;
     }
 
     [PyType("sacad.result.DBDeleteResult")]
@@ -49,4 +62,10 @@ namespace SacadMgd
     {
         public int num_deleted;
     }
+
+    [PyType("sacad.result.DBCompoundResult")]
+    public sealed class DbCompoundResult : Result
+    {
+        public List<PyWrapper<Result>> results;
+    }
 }
\ No newline at end of file
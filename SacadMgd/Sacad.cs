@@ -11,6 +11,7 @@
 
 using System;
 using System.Collections.Generic;
+using System.Globalization;
 using System.IO;
 using System.Linq;
 using System.Net.NetworkInformation;
@@ -94,9 +95,88 @@ namespace SacadMgd
             AcRt.CommandFlags.DocExclusiveLock | AcRt.CommandFlags.Redraw)]
         public static void DbOperationCommand()
         {
-            DoOperationCommand("db operation", message =>
-                Util.Deserialize<PyWrapper<DbQuery>>(message).__mbr__
-                    .Execute());
+            DoOperationCommand("db operation", DbOperation);
+        }
+
+        /// <summary>
+        /// Keep processing requests from the connection until a stop request
+        /// arrives, or nothing arrives within the idle timeout. This saves
+        /// the command invocation through COM for every request.
+        /// </summary>
+        [AcRt.CommandMethod("SACAD_SERVE",
+            AcRt.CommandFlags.Session | AcRt.CommandFlags.Redraw)]
+        public static void ServeCommand()
+        {
+            NetworkStream netStream = null;
+
+            try
+            {
+                netStream = GetNetStream("serve");
+                netStream.ReadTimeout = PromptIdleTimeout("serve");
+
+                while (true)
+                {
+                    string request;
+                    try
+                    {
+                        request = ReceiveMessage(netStream);
+                    }
+                    catch (IOException)
+                    {
+                        // Idle timeout, or the client has gone.
+                        break;
+                    }
+
+                    var sep = request.IndexOf('\n');
+                    var op = sep < 0 ? request : request.Substring(0, sep);
+                    var payload = sep < 0
+                        ? string.Empty
+                        : request.Substring(sep + 1);
+
+                    switch (op)
+                    {
+                        case "stop":
+                            SendMessage(netStream, "stop");
+                            return;
+                        case "ping":
+                            SendMessage(netStream, "pong");
+                            break;
+                        case "dbop":
+                            SendMessage(netStream, ExecuteOperation(
+                                "db operation", payload, LockedDbOperation));
+                            AcAp.Application.UpdateScreen();
+                            break;
+                        case "docop":
+                            SendMessage(netStream, ExecuteOperation(
+                                "doc operation", payload,
+                                message => new Result()));
+                            break;
+                        default:
+                            throw new InvalidDataException(
+                                $"Unknown serve operation \"{op}\".");
+                    }
+                }
+            }
+            catch (Exception ex)
+            {
+                Util.ConsoleWriteLine($"[sacad serve] error: {ex}");
+            }
+        }
+
+        private static Result DbOperation(string message)
+        {
+            return Util.Deserialize<PyWrapper<DbQuery>>(message).__mbr__
+                .Execute();
+        }
+
+        private static Result LockedDbOperation(string message)
+        {
+            // ReSharper disable once AccessToStaticMemberViaDerivedType
+            var doc = AcAp.Application.DocumentManager.MdiActiveDocument;
+            using (doc.LockDocument())
+            {
+                return DbOperation(message);
+            }
         }
 
         private static void DoOperationCommand(string cmdTitle,
@@ -108,28 +188,32 @@ namespace SacadMgd
             {
                 netStream = GetNetStream(cmdTitle);
                 var request = ReceiveMessage(netStream);
+                SendMessage(netStream,
+                    ExecuteOperation(cmdTitle, request, opFunc));
+            }
+            catch (Exception ex)
+            {
+                Util.ConsoleWriteLine($"[sacad {cmdTitle}] error: {ex}");
+            }
+        }
+
+        private static string ExecuteOperation(string cmdTitle,
+            string request, Func<string, Result> opFunc)
+        {
+            try
+            {
                 var result = opFunc.Invoke(request);
-                var response = Util.Serialize(PyWrapper<Result>.Create(result));
-                SendMessage(netStream, response);
+                return Util.Serialize(PyWrapper<Result>.Create(result));
             }
             catch (Exception ex)
             {
                 Util.ConsoleWriteLine($"[sacad {cmdTitle}] error: {ex}");
 
-                if (netStream != null)
-                    try
-                    {
-                        var result = PyWrapper<Result>.Create(new Result
-                        {
-                            status = Status.Unknown,
-                            message = $"Unhandled exception: {ex.Message}"
-                        });
-                        SendMessage(netStream, Util.Serialize(result));
-                    }
-                    catch
-                    {
-                        // ignored
-                    }
+                return Util.Serialize(PyWrapper<Result>.Create(new Result
+                {
+                    status = Status.Unknown,
+                    message = $"Unhandled exception: {ex.Message}"
+                }));
             }
         }
 
@@ -177,6 +261,24 @@ namespace SacadMgd
             return skeyInput.StringResult;
         }
 
+        private static int PromptIdleTimeout(string cmdName)
+        {
+            // ReSharper disable once AccessToStaticMemberViaDerivedType
+            var editor = AcAp.Application.DocumentManager.MdiActiveDocument
+                .Editor;
+
+            var option = new AcEi.PromptStringOptions(
+                    $"\n[sacad {cmdName}] idle timeout: ")
+                { AllowSpaces = false };
+
+            var timeoutInput = editor.GetString(option);
+            if (timeoutInput.Status != AcEi.PromptStatus.OK)
+                throw new InvalidOperationException("Wrong PromptStatus.");
+
+            return (int)(double.Parse(timeoutInput.StringResult,
+                CultureInfo.InvariantCulture) * 1000);
+        }
+
         private static NetworkStream GetNetStream(string cmdInfo)
         {
             var skey = PromptSkey(cmdInfo);
@@ -203,13 +305,35 @@ namespace SacadMgd
                     "NetworkStream cannot read.");
             }
 
-            int msgLen;
             using (var memStream = new MemoryStream())
             {
-                int b;
+                var lenLine = ReceiveLine(netStream);
+                if (lenLine == "*")
+                {
+                    // Chunked framing, of a request sent in pieces by
+                    // Python, terminated by a chunk of length 0.
+                    int chunkLen;
+                    while ((chunkLen = int.Parse(ReceiveLine(netStream))) > 0)
+                    {
+                        ReceiveBytes(netStream, memStream, chunkLen);
+                    }
+                }
+                else
+                {
+                    ReceiveBytes(netStream, memStream, int.Parse(lenLine));
+                }
+
+                return Encoding.UTF8.GetString(memStream.ToArray());
+            }
+        }
+
+        private static string ReceiveLine(NetworkStream netStream)
+        {
+            using (var memStream = new MemoryStream())
+            {
                 while (true)
                 {
-                    b = netStream.ReadByte();
+                    var b = netStream.ReadByte();
                     if (b == -1)
                     {
                         throw new EndOfStreamException(
@@ -220,26 +344,25 @@ namespace SacadMgd
                     memStream.WriteByte((byte)b);
                 }
 
-                if (b != LineBreak)
-                {
-                    throw new InvalidDataException(
-                        "Fail to read body length line.");
-                }
-
-                msgLen = int.Parse(Encoding.UTF8.GetString(
-                    memStream.ToArray()));
+                return Encoding.UTF8.GetString(memStream.ToArray());
             }
+        }
 
-            using (var memStream = new MemoryStream())
+        private static void ReceiveBytes(NetworkStream netStream,
+            MemoryStream memStream, int length)
+        {
+            while (length > 0)
             {
-                do
+                var readNum = netStream.Read(ReadBuf, 0,
+                    Math.Min(length, ReadBuf.Length));
+                if (readNum == 0)
                 {
-                    var readNum = netStream.Read(ReadBuf, 0, ReadBuf.Length);
-                    memStream.Write(ReadBuf, 0, readNum);
-                    msgLen -= readNum;
-                } while (msgLen > 0);
+                    throw new EndOfStreamException(
+                        "EOF while reading body.");
+                }
 
-                return Encoding.UTF8.GetString(memStream.ToArray());
+                memStream.Write(ReadBuf, 0, readNum);
+                length -= readNum;
             }
         }
 
@@ -87,6 +87,14 @@ namespace SacadMgd
         }
 
         public override DBObject FromArx(AcDb.DBObject obj, AcDb.Database db)
+            => FromArx(obj, db, null);
+
+        /// <summary>
+        /// Convert the block, with only the entities passing the filter, and
+        /// only those of the page if pager is not null.
+        /// </summary>
+        public DBObject FromArx(AcDb.DBObject obj, AcDb.Database db,
+            EntityFilter entityFilter, Pager pager = null)
         {
             var block = (AcDb.BlockTableRecord)obj;
             var trans = db.TransactionManager.TopTransaction;
@@ -98,11 +106,10 @@ namespace SacadMgd
 
                 var arxEntity = (AcDb.Entity)trans.GetObject(
                     eid, AcDb.OpenMode.ForRead);
+                if (entityFilter != null && !entityFilter.Match(arxEntity))
+                    continue;
 
-                var entity = Entity.Convert(arxEntity, db);
-                if (entity == null) continue;
-
-                entities.Add(PyWrapper<Entity>.Create(entity));
+                if (!Pager.Collect(pager, arxEntity, db, entities)) break;
             }
 
             return base.FromArx(obj, db);
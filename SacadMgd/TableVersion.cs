@@ -0,0 +1,70 @@
+﻿/* Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+ * sacad is licensed under Mulan PubL v2.
+ * You can use this software according to the terms and conditions of the Mulan PubL v2.
+ * You may obtain a copy of Mulan PubL v2 at:
+ *          http://license.coscl.org.cn/MulanPubL-2.0
+ * THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+ * EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+ * MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+ * See the Mulan PubL v2 for more details.
+ */
+
+using System;
+using System.Collections.Concurrent;
+using System.Runtime.CompilerServices;
+using AcDb = Autodesk.AutoCAD.DatabaseServices;
+
+namespace SacadMgd
+{
+    /// <summary>
+    /// Versions of symbol tables (and of the dictionary of multileader
+    /// styles) of databases, which change whenever any record of them is
+    /// appended, modified or erased, so that clients can cache the tables.
+    /// A version is a token of the database, which differs between documents
+    /// and between loads of this module, and the number of changes counted
+    /// since the database is tracked.
+    /// </summary>
+    public static class TableVersion
+    {
+        private static readonly ConditionalWeakTable<AcDb.Database, Counter>
+            Counters = new ConditionalWeakTable<AcDb.Database, Counter>();
+
+        public static string Of(AcDb.Database db, AcDb.ObjectId tableId)
+        {
+            var counter = Counters.GetValue(db, Track);
+            long count;
+            counter.Counts.TryGetValue(tableId, out count);
+            return $"{counter.Token}:{count}";
+        }
+
+        private static Counter Track(AcDb.Database db)
+        {
+            var counter = new Counter();
+            db.ObjectAppended += (sender, e) => counter.Add(e.DBObject);
+            db.ObjectModified += (sender, e) => counter.Add(e.DBObject);
+            db.ObjectErased += (sender, e) => counter.Add(e.DBObject);
+            db.ObjectUnappended += (sender, e) => counter.Add(e.DBObject);
+            db.ObjectReappended += (sender, e) => counter.Add(e.DBObject);
+            return counter;
+        }
+
+        private sealed class Counter
+        {
+            public readonly string Token = Guid.NewGuid().ToString("N")
+                .Substring(0, 8);
+
+            public readonly ConcurrentDictionary<AcDb.ObjectId, long> Counts =
+                new ConcurrentDictionary<AcDb.ObjectId, long>();
+
+            public void Add(AcDb.DBObject obj)
+            {
+                // Records of blocks are modified by every entity appended.
+                if (obj is AcDb.BlockTableRecord) return;
+                if (!(obj is AcDb.SymbolTableRecord || obj is AcDb.MLeaderStyle))
+                    return;
+
+                Counts.AddOrUpdate(obj.OwnerId, 1, (id, count) => count + 1);
+            }
+        }
+    }
+}
@@ -11,17 +11,150 @@
 
 """sacad: SACAD stands for Simple AutoCAD."""
 
-from .acad import *
-from .accm import *
-from .acdb import *
-from .acge import *
-from .constant import *
-from .crud import *
-from .error import *
-from .jsonify import *
-from .result import *
+import importlib
+
+from typing import TYPE_CHECKING
+
+# Submodules are imported on first access of their members (PEP 562), so that
+# `import sacad` is cheap, and building or serializing queries works without
+# the COM stack (pywin32) or numpy.
+_EXPORTS = {
+    'acad': (
+        'Acad', 'instant_acad',
+    ),
+    'accm': (
+        'ColorMethod', 'Color',
+    ),
+    'acdb': (
+        'MODEL_SPACE', 'ObjectId', 'TDBObject', 'LineWeight',
+        'TextHorizontalMode', 'TextVerticalMode', 'AttachmentPoint',
+        'DimensionCenterMarkType', 'LineSpacingStyle',
+        'HatchObjectType', 'HatchStyle', 'HatchPatternType',
+        'HatchLoopTypes', 'ContentType', 'LeaderDirectionType',
+        'TextAngleType', 'TextAlignmentType', 'TextAttachmentType',
+        'TextAttachmentDirection', 'DBObject', 'Entity',
+        'BlockReference', 'DBText', 'MText', 'MLeader', 'HatchLoop',
+        'Hatch', 'Shape', 'Solid', 'Curve', 'Arc', 'Circle', 'Ellipse',
+        'Line', 'Vertex', 'Polyline', 'Dimension', 'AlignedDimension',
+        'ArcDimension', 'DiametricDimension', 'LineAngularDimension2',
+        'Point3AngularDimension', 'RadialDimension',
+        'RadialDimensionLarge', 'RotatedDimension', 'SymbolTableRecord',
+        'BlockTableRecord', 'DimStyleTableRecord', 'LayerTableRecord',
+        'LinetypeSegment', 'LinetypeTableRecord', 'FontDescriptor',
+        'TextStyleTableRecord', 'MLeaderStyle', 'Group', 'Database',
+        'Extents3d',
+    ),
+    'acge': (
+        'Vector', 'Vector2d', 'Vector3d', 'Number', 'Matrix3d',
+    ),
+    'aggregate': (
+        'GroupKey', 'Aggregate', 'AggregateRow', 'aggregate',
+    ),
+    'batch': (
+        'EntityBatch', 'LineBatch', 'CircleBatch', 'PolylineBatch',
+        'TextBatch',
+    ),
+    'cache': (
+        'TableCache', 'content_hash',
+    ),
+    'constant': (
+        'ACAD_2010', 'ACAD_2011', 'ACAD_2012', 'ACAD_2013', 'ACAD_2014',
+        'ACAD_2015', 'ACAD_2016', 'ACAD_2017', 'ACAD_2018', 'ACAD_2019',
+        'ACAD_2020', 'ACAD_2021', 'ACAD_2022', 'ACAD_2023',
+        'ACAD_LATEST',
+    ),
+    'crud': (
+        'ZoomMode', 'SelectMode', 'TableFlags', 'DBOperator',
+        'DBInsert', 'DBInsertQuery', 'DBSelect', 'DBSelectQuery',
+        'DBUpdate', 'DBUpdateQuery', 'DBDelete', 'DBDeleteQuery', 'DBCompound',
+        'DBCompoundQuery',
+        'split_insert_query',
+    ),
+    'error': (
+        'Error', 'JsonifyError', 'QueryError', 'SessionError',
+        'AcadNotFoundError', 'AcadNotSupportedError', 'AcadConnectionError',
+        'AcadComError', 'AcadTcpError',
+    ),
+    'filters': (
+        'EntityFilter', 'AllOf', 'AnyOf', 'Not', 'TypeIn', 'LayerIn',
+        'LinetypeIn', 'ColorIn', 'TextLike', 'InGroups', 'of_type',
+        'on_layer', 'with_linetype', 'with_color', 'text_like', 'in_group',
+    ),
+    'jsonify': (
+        'Jsonify', 'Fragment', 'Stream',
+    ),
+    'loopback': (
+        'LoopbackAcad', 'LoopbackComAcad', 'LoopbackPeer', 'LoopbackSession',
+    ),
+    'parallel': (
+        'FragmentPool',
+    ),
+    'pool': (
+        'SessionPool', 'SessionStats',
+    ),
+    'projection': (
+        'Projection', 'project', 'ids_only',
+    ),
+    'region': (
+        'in_window', 'in_crossing', 'in_fence', 'extents_of',
+    ),
+    'result': (
+        'Result', 'Status', 'DBInsertResult', 'DBSelectResult',
+        'DBUpdateResult', 'DBDeleteResult', 'DBCompoundResult',
+    ),
+    'retry': (
+        'RetryError', 'RetryStats', 'RetryPolicy', 'FixedRetryPolicy',
+        'AdaptiveRetryPolicy', 'retryable',
+    ),
+    'submitter': (
+        'BackgroundSubmitter',
+    ),
+    'tracking': (
+        'ChangeTracker',
+    ),
+}
+
+_MODULE_OF = {name: module for module, names in _EXPORTS.items()
+              for name in names}
+
+if TYPE_CHECKING:
+    from .acad import *
+    from .accm import *
+    from .acdb import *
+    from .acge import *
+    from .aggregate import *
+    from .batch import *
+    from .cache import *
+    from .constant import *
+    from .crud import *
+    from .error import *
+    from .filters import *
+    from .jsonify import *
+    from .loopback import *
+    from .parallel import *
+    from .pool import *
+    from .projection import *
+    from .region import *
+    from .result import *
+    from .retry import *
+    from .submitter import *
+    from .tracking import *
 
 __all__ = []
 
 __version__ = '0.0.1'
 __author__ = 'nadesico19@gmail.com'
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULE_OF))
@@ -12,22 +12,31 @@
 """A facade for user code to access features of sacad conveniently ."""
 
 from contextlib import contextmanager
-from typing import List, Optional, Union
-
-import pythoncom
+from typing import List, Optional, Sequence, Type, Union
 
+from sacad.acdb import Entity
 from sacad.acge import Vector3d
+from sacad.aggregate import Aggregate, GroupKey
+from sacad.cache import TableCache
 from sacad.constant import ACAD_LATEST
 from sacad.crud import (
     DBInsert,
     DBInsertQuery,
     DBSelect,
     DBSelectQuery,
+    DBUpdate,
+    DBUpdateQuery,
     DBDelete,
     DBDeleteQuery,
+    DBCompound,
+    DBCompoundQuery,
+    DBOperator,
+    DBQuery,
     SelectMode,
 )
 from sacad.env import available_acad
+from sacad.filters import EntityFilter
+from sacad.retry import RetryPolicy
 from sacad.session import Session
 
 __all__ = [
@@ -41,7 +50,8 @@ class Acad:
     A front-end to facilitate access to various features provided by sacad.
     """
 
-    def __init__(self, acad_name=ACAD_LATEST, host='127.0.0.1', port=48652):
+    def __init__(self, acad_name=ACAD_LATEST, host='127.0.0.1', port=48652,
+                 retry_policy: Optional[RetryPolicy] = None):
         """
         Initialization.
 
@@ -52,10 +62,14 @@ class Acad:
         :param acad_name: version identifier defined in constant.py.
         :param host: hostname of TCP listener.
         :param port: port of TCP listener.
+        :param retry_policy: policy to retry COM calls rejected by a busy
+                             AutoCAD, AdaptiveRetryPolicy if not specified.
         """
-        self._session = Session(acad_name, host, port)
+        self._session = Session(acad_name, host, port,
+                                retry_policy=retry_policy)
+        self._table_cache = TableCache()
 
-    def open(self, netload=True):
+    def open(self, netload: Optional[bool] = True):
         """
         Create a connection to the specified version of AutoCAD. This will
         launch a new AutoCAD process automatically, if it is not running.
@@ -66,6 +80,11 @@ class Acad:
                         module has been loaded. But the command executing will
                         clear the user's selection set, so cause some operations
                         fail when calling Editor.SelectImplied.
+                        None to execute it only if the C# module does not
+                        respond without it, within
+                        config.connection_probe_timeout_seconds. If it is not
+                        loaded, AutoCAD echoes "Unknown command" for the probe,
+                        and opening takes that timeout longer.
         """
         if not self._session.is_alive():
             self._session.open(netload=netload)
@@ -86,6 +105,30 @@ class Acad:
         """
         self._session.close()
 
+    @contextmanager
+    def serving(self, idle_timeout: Optional[float] = None):
+        """
+        Use with statement to process a burst of requests in one serving loop.
+
+        Normally every request is triggered by a command sent through the COM
+        interface, which is by far the most expensive part of small requests.
+        Inside this context, AutoCAD keeps processing requests until the
+        context exits, so the command is sent only once.
+
+        AutoCAD does not respond to the user while serving.
+
+        :param idle_timeout: seconds of inactivity after which AutoCAD leaves
+                             the serving loop. It will be re-entered by the
+                             next request automatically. It must be longer
+                             than config.serve_expiry_margin_seconds.
+        """
+        self.open()
+        self._session.start_serving(idle_timeout)
+        try:
+            yield self
+        finally:
+            self._session.stop_serving()
+
     def activate(self):
         """
         Brings the AutoCAD window into the foreground and activates the window.
@@ -103,6 +146,7 @@ class Acad:
             insertion_point: Optional[Vector3d] = None,
             prompt_insertion_point: Optional[bool] = None,
             upsert: Optional[bool] = None,
+            diff: bool = False,
             **kwargs) -> DBInsert:
         """
         Create an insertion type of transaction to be executed in AutoCAD.
@@ -113,17 +157,28 @@ class Acad:
                        of a point, which becomes the insertion point.
         :param upsert: when styles with same name already exist, True will lead
                        to updates. Otherwise, only insertion occurs.
+        :param diff: with upsert, send only the records of symbol tables
+                     missing or different from the ones of table_cache,
+                     which is refreshed first.
         :param kwargs: other parameters of DBInsertQuery.__init__.
         """
         return DBInsert(self._session, DBInsertQuery(
             insertion_point=insertion_point,
             prompt_insertion_point=prompt_insertion_point,
             upsert=upsert,
-            **kwargs))
+            **kwargs), cache=self._table_cache if diff else None)
 
-    def db_get_tables(self, table_flags: int, **kwargs) -> DBSelect:
+    def db_get_tables(self, table_flags: int, cached: bool = True,
+                      **kwargs) -> DBSelect:
+        """
+        Create a transaction for getting symbol tables and blocks.
+
+        :param cached: serve symbol tables unchanged since they were selected
+                       last time from table_cache.
+        """
         return DBSelect(self._session, DBSelectQuery(
-            mode=SelectMode.GET_TABLES, table_flags=table_flags, **kwargs))
+            mode=SelectMode.GET_TABLES, table_flags=table_flags, **kwargs),
+            cache=self._table_cache if cached else None)
 
     def db_get_user_selection(
             self, by_prompt: bool = False, **kwargs) -> DBSelect:
@@ -150,6 +205,71 @@ class Acad:
         return DBSelect(self._session, DBSelectQuery(
             mode=SelectMode.GET_GROUPS, group_names=names, **kwargs))
 
+    def db_get_window(self, *points: Vector3d, crossing: bool = False,
+                      **kwargs) -> DBSelect:
+        """
+        Create a transaction for getting entities of model space in a region,
+        without user interaction.
+
+        :param points: two corners of a rectangle, or vertices of a polygon.
+        :param crossing: when True is specified, entities crossing the
+                         boundary are selected as well, otherwise only those
+                         entirely inside.
+        :param kwargs: other parameters of DBSelectQuery.__init__.
+        """
+        return DBSelect(self._session, DBSelectQuery(
+            mode=SelectMode.CROSSING if crossing else SelectMode.WINDOW,
+            region=list(points), **kwargs))
+
+    def db_get_fence(self, *points: Vector3d, **kwargs) -> DBSelect:
+        """
+        Create a transaction for getting entities of model space touched by
+        a polyline through the points, without user interaction.
+
+        :param kwargs: other parameters of DBSelectQuery.__init__.
+        """
+        return DBSelect(self._session, DBSelectQuery(
+            mode=SelectMode.FENCE, region=list(points), **kwargs))
+
+    def db_aggregate(self, group_by: Sequence[GroupKey] = (),
+                     aggregates: Sequence[Aggregate] = (Aggregate.COUNT,),
+                     **kwargs) -> DBSelect:
+        """
+        Create a transaction for aggregating entities of model space into
+        DBSelectResult.rows, one row of each group, without sending back the
+        entities.
+
+        :param group_by: keys grouping the entities, or nothing to aggregate
+                         all entities into one row.
+        :param aggregates: functions computed for each group.
+        :param kwargs: other parameters of DBSelectQuery.__init__, e.g. filter.
+        """
+        return DBSelect(self._session, DBSelectQuery(
+            mode=SelectMode.AGGREGATE, group_by=list(group_by),
+            aggregates=list(aggregates), **kwargs))
+
+    def db_update(self, **kwargs) -> DBUpdate:
+        """
+        Create a transaction for patching existing entities, by DBUpdate.patch
+        or by DBUpdate.track, which sends only the changed fields.
+
+        :param kwargs: parameters of DBUpdateQuery.__init__.
+        """
+        return DBUpdate(self._session, DBUpdateQuery(**kwargs))
+
+    def db_update_where(self, filter: Optional[EntityFilter],
+                        entity_type: Type[Entity] = Entity,
+                        **fields) -> DBUpdate:
+        """
+        Create a transaction for assigning the fields to all entities of
+        model space passing the filter, e.g.
+        `acad.db_update_where(on_layer('A'), layer='B').submit().num_updated`.
+
+        :param entity_type: see DBUpdate.assign.
+        """
+        return DBUpdate(self._session, DBUpdateQuery()).assign(
+            filter, entity_type, **fields)
+
     def db_delete(
             self,
             delete_group_entities: Optional[bool] = None,
@@ -158,6 +278,19 @@ class Acad:
             delete_group_entities=delete_group_entities,
             **kwargs))
 
+    def db_compound(self, *ops: Union[DBOperator, DBQuery]) -> DBCompound:
+        """
+        Create a transaction bundling several operations, which are executed
+        in order in a single request, under a single document lock.
+
+        :param ops: operators or queries to be bundled, more can be added by
+                    DBCompound.add later.
+        """
+        compound = DBCompound(self._session, DBCompoundQuery())
+        for op in ops:
+            compound.add(op)
+        return compound
+
     def send_command(self, name, *args):
         com = self._session.com_acad
         cmd = com.buildcmd(name, *map(str, args))
@@ -189,9 +322,15 @@ class Acad:
     def com(self):
         return self._session.com_acad
 
+    @property
+    def table_cache(self) -> TableCache:
+        """Symbol tables selected by db_get_tables, of the session."""
+        return self._table_cache
+
 
 @contextmanager
-def instant_acad(netload=True, acad_name=ACAD_LATEST, sta=False, **kwargs):
+def instant_acad(netload: Optional[bool] = True, acad_name=ACAD_LATEST,
+                 sta=False, **kwargs):
     """
     Use with statement to create an auto open/close instance of Acad.
 
@@ -203,11 +342,17 @@ def instant_acad(netload=True, acad_name=ACAD_LATEST, sta=False, **kwargs):
                     module has been loaded. But the command executing will
                     clear the user's selection set, so cause some operations
                     fail when calling Editor.SelectImplied.
+                    None to execute it only if the C# module does not respond
+                    without it, within config.connection_probe_timeout_seconds.
+                    If it is not loaded, AutoCAD echoes "Unknown command" for
+                    the probe, and opening takes that timeout longer.
     :param acad_name: version identifier defined in constant.py.
     :param sta: initialize COM as single-thread apartment (STA). This is useful
                 when submissions are done by threads other than caller of this.
     :param kwargs: other parameters of Acad.__init__
     """
+    import pythoncom
+
     acad = Acad(acad_name=acad_name, **kwargs)
     try:
         if sta:
@@ -14,13 +14,16 @@
 import math
 from dataclasses import dataclass, field
 from enum import IntEnum
-from typing import Dict, List, Optional, TypeVar
+from typing import TYPE_CHECKING, Dict, List, Optional, TypeVar
 
 from sacad.accm import Color
-from sacad.acge import Matrix3d, Number, Vector2d, Vector3d
+from sacad.acge import Number, Vector2d, Vector3d
 from sacad.jsonify import Jsonify
 from sacad.util import csharp_polymorphic_type
 
+if TYPE_CHECKING:
+    from sacad.acge import Matrix3d
+
 __all__ = [
     'MODEL_SPACE',
     # 'PAPER_SPACE',
@@ -274,9 +277,9 @@ class Entity(DBObject):
     line_weight: Optional[LineWeight] = None
     # TODO transparency: Optional[Transparency] = None
     visible: Optional[bool] = None
-    matrix: Optional[Matrix3d] = None
+    matrix: Optional['Matrix3d'] = None
 
-    def transform_by(self, matrix: Matrix3d):
+    def transform_by(self, matrix: 'Matrix3d'):
         self.matrix = matrix if self.matrix is None else matrix @ self.matrix
 
 
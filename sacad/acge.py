@@ -13,11 +13,10 @@
 
 import math
 import operator as op
+import threading
 
 from typing import Type, Union
 
-import numpy as np
-
 from sacad.jsonify import Jsonify
 
 __all__ = [
@@ -32,6 +31,8 @@ Vector = Union['Vector2d', 'Vector3d']
 Number = Union[int, float]
 NumberClass = (int, float)
 
+_matrix3d_lock = threading.Lock()
+
 
 class _VectorBase(tuple, Jsonify):
     def __init_subclass__(cls: Type[Vector], **kwargs):
@@ -41,6 +42,8 @@ class _VectorBase(tuple, Jsonify):
         setattr(cls, '_zaxis', cls(0, 0, 1))
 
     def transform_by(self, matrix: 'Matrix3d'):
+        import numpy as np
+
         v = np.array((0, 0, 0, 1), dtype=float)
         if isinstance(self, Vector2d):
             v[:2] = self
@@ -183,90 +186,107 @@ class Vector3d(_VectorBase):
             )
 
 
-class Matrix3d(np.ndarray, Jsonify):
-    def __new__(cls, *args, **kwargs):
-        return super().__new__(cls, shape=(4, 4), buffer=(
-            args[0] if isinstance(args[0], np.ndarray)
-            else np.array(args, dtype=float)))
-
-    def _jsonify_traverse_dict(self, self_dict):
-        return list(self.flat)
-
-    @staticmethod
-    def identity() -> 'Matrix3d':
-        return Matrix3d(np.identity(4))
-
-    def move(self,
-             offset_x: Number = 0,
-             offset_y: Number = 0,
-             offset_z: Number = 0) -> 'Matrix3d':
-        transfer = Matrix3d(np.array((
-            1, 0, 0, offset_x,
-            0, 1, 0, offset_y,
-            0, 0, 1, offset_z,
-            0, 0, 0, 1,
-        ), dtype=float))
-        return Matrix3d(np.dot(transfer, self))
-
-    def rotate(self, degrees: Number, axis: Vector3d = Vector3d.zaxis()) \
-            -> 'Matrix3d':
-        return self.rotater(math.radians(degrees), axis)
-
-    def rotater(self, radians: Number, axis: Vector3d = Vector3d.zaxis()) \
-            -> 'Matrix3d':
-        cosa, sina = math.cos(radians), math.sin(radians)
-        if axis == Vector3d.xaxis():
-            rotation = Matrix3d(np.array((
-                1, 0, 0, 0,
-                0, cosa, -sina, 0,
-                0, sina, cosa, 0,
+def __getattr__(name):
+    # Matrix3d is defined on first access, so that numpy is not imported by
+    # users who never need it, e.g. when only serializing entities.
+    if name == 'Matrix3d':
+        with _matrix3d_lock:
+            if 'Matrix3d' not in globals():
+                globals()['Matrix3d'] = _define_matrix3d()
+        return globals()['Matrix3d']
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def _define_matrix3d():
+    import numpy as np
+
+    class Matrix3d(np.ndarray, Jsonify):
+        def __new__(cls, *args, **kwargs):
+            return super().__new__(cls, shape=(4, 4), buffer=(
+                args[0] if isinstance(args[0], np.ndarray)
+                else np.array(args, dtype=float)))
+
+        def _jsonify_traverse_dict(self, self_dict):
+            return list(self.flat)
+
+        @staticmethod
+        def identity() -> 'Matrix3d':
+            return Matrix3d(np.identity(4))
+
+        def move(self,
+                 offset_x: Number = 0,
+                 offset_y: Number = 0,
+                 offset_z: Number = 0) -> 'Matrix3d':
+            transfer = Matrix3d(np.array((
+                1, 0, 0, offset_x,
+                0, 1, 0, offset_y,
+                0, 0, 1, offset_z,
                 0, 0, 0, 1,
             ), dtype=float))
-        elif axis == Vector3d.yaxis():
-            rotation = Matrix3d(np.array((
-                cosa, 0, sina, 0,
-                0, 1, 0, 0,
-                -sina, 0, cosa, 0,
+            return Matrix3d(np.dot(transfer, self))
+
+        def rotate(self, degrees: Number, axis: Vector3d = Vector3d.zaxis()) \
+                -> 'Matrix3d':
+            return self.rotater(math.radians(degrees), axis)
+
+        def rotater(self, radians: Number, axis: Vector3d = Vector3d.zaxis()) \
+                -> 'Matrix3d':
+            cosa, sina = math.cos(radians), math.sin(radians)
+            if axis == Vector3d.xaxis():
+                rotation = Matrix3d(np.array((
+                    1, 0, 0, 0,
+                    0, cosa, -sina, 0,
+                    0, sina, cosa, 0,
+                    0, 0, 0, 1,
+                ), dtype=float))
+            elif axis == Vector3d.yaxis():
+                rotation = Matrix3d(np.array((
+                    cosa, 0, sina, 0,
+                    0, 1, 0, 0,
+                    -sina, 0, cosa, 0,
+                    0, 0, 0, 1,
+                ), dtype=float))
+            elif axis == Vector3d.zaxis():
+                rotation = Matrix3d(np.array((
+                    cosa, -sina, 0, 0,
+                    sina, cosa, 0, 0,
+                    0, 0, 1, 0,
+                    0, 0, 0, 1,
+                ), dtype=float))
+            else:
+                norm = axis / abs(axis)
+                one_cosa = 1 - cosa
+                rotation = Matrix3d(np.array((
+                    # row 0
+                    norm.x * norm.x * one_cosa + cosa,
+                    norm.x * norm.y * one_cosa - norm.z * sina,
+                    norm.x * norm.z * one_cosa + norm.y * sina,
+                    0,
+                    # row 1
+                    norm.x * norm.y * one_cosa + norm.z * sina,
+                    norm.y * norm.y * one_cosa + cosa,
+                    norm.y * norm.z * one_cosa - norm.x * sina,
+                    0,
+                    # row 2
+                    norm.x * norm.z * one_cosa - norm.y * sina,
+                    norm.y * norm.z * one_cosa + norm.x * sina,
+                    norm.z * norm.z * one_cosa + cosa,
+                    0,
+                    # row 3
+                    0, 0, 0, 1,
+                ), dtype=float))
+            return Matrix3d(np.dot(rotation, self))
+
+        def scale(self, linear_factor: Number = 1, mirror_x: bool = False,
+                  mirror_y: bool = False, mirror_z: bool = False) \
+                -> 'Matrix3d':
+            scale = Matrix3d(np.array((
+                linear_factor * (-1 if mirror_x else 1), 0, 0, 0,
+                0, linear_factor * (-1 if mirror_y else 1), 0, 0,
+                0, 0, linear_factor * (-1 if mirror_z else 1), 0,
                 0, 0, 0, 1,
             ), dtype=float))
-        elif axis == Vector3d.zaxis():
-            rotation = Matrix3d(np.array((
-                cosa, -sina, 0, 0,
-                sina, cosa, 0, 0,
-                0, 0, 1, 0,
-                0, 0, 0, 1,
-            ), dtype=float))
-        else:
-            norm = axis / abs(axis)
-            one_cosa = 1 - cosa
-            rotation = Matrix3d(np.array((
-                # row 0
-                norm.x * norm.x * one_cosa + cosa,
-                norm.x * norm.y * one_cosa - norm.z * sina,
-                norm.x * norm.z * one_cosa + norm.y * sina,
-                0,
-                # row 1
-                norm.x * norm.y * one_cosa + norm.z * sina,
-                norm.y * norm.y * one_cosa + cosa,
-                norm.y * norm.z * one_cosa - norm.x * sina,
-                0,
-                # row 2
-                norm.x * norm.z * one_cosa - norm.y * sina,
-                norm.y * norm.z * one_cosa + norm.x * sina,
-                norm.z * norm.z * one_cosa + cosa,
-                0,
-                # row 3
-                0, 0, 0, 1,
-            ), dtype=float))
-        return Matrix3d(np.dot(rotation, self))
-
-    def scale(self, linear_factor: Number = 1, mirror_x: bool = False,
-              mirror_y: bool = False, mirror_z: bool = False) \
-            -> 'Matrix3d':
-        scale = Matrix3d(np.array((
-            linear_factor * (-1 if mirror_x else 1), 0, 0, 0,
-            0, linear_factor * (-1 if mirror_y else 1), 0, 0,
-            0, 0, linear_factor * (-1 if mirror_z else 1), 0,
-            0, 0, 0, 1,
-        ), dtype=float))
-        return Matrix3d(np.dot(scale, self))
+            return Matrix3d(np.dot(scale, self))
+
+    Matrix3d.__qualname__ = 'Matrix3d'  # picklable by module attribute.
+    return Matrix3d
@@ -0,0 +1,214 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""
+Aggregation of entities by SelectMode.AGGREGATE, so that SacadMgd sends
+back a small table of rows instead of the entities, e.g. the number of
+entities and the total length of curves of each layer:
+
+    acad.db_aggregate([GroupKey.LAYER],
+                      [Aggregate.COUNT, Aggregate.LENGTH]).submit().rows
+
+The function aggregate is the reference of the semantics of SacadMgd, so that
+aggregations can be tested without AutoCAD. Lengths and areas of entities
+reported by AutoCAD (e.g. Curve.area) are preferred, otherwise they are
+computed for lines, arcs, circles and polylines, and extents are estimated
+by sacad.region.extents_of.
+"""
+
+import math
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sacad.acdb import (
+    Arc,
+    Circle,
+    Curve,
+    DBText,
+    Entity,
+    Extents3d,
+    Line,
+    MText,
+    Polyline,
+)
+from sacad.acge import Vector3d
+from sacad.filters import DEFAULT_LAYER, DEFAULT_LINETYPE, _color_index
+from sacad.jsonify import Jsonify
+from sacad.region import extents_of
+
+__all__ = [
+    'GroupKey',
+    'Aggregate',
+    'AggregateRow',
+    'aggregate',
+]
+
+
+class GroupKey(IntEnum):
+    TYPE = 0  # full name of the Python type, e.g. 'sacad.acdb.Line'
+    LAYER = 1
+    LINETYPE = 2
+    COLOR_INDEX = 3
+    TEXT_STYLE = 4  # None for entities other than DBText and MText
+
+
+class Aggregate(IntEnum):
+    COUNT = 0
+    LENGTH = 1  # sum of lengths of curves
+    AREA = 2  # sum of areas of curves
+    EXTENTS = 3  # union of extents
+
+
+@dataclass
+class AggregateRow(Jsonify):
+    # Values of the group keys, in the order of DBSelectQuery.group_by.
+    key: List[Any] = field(default_factory=list)
+
+    # Only the aggregates requested are reported.
+    count: Optional[int] = None
+    length: Optional[float] = None
+    area: Optional[float] = None
+    extents: Optional[Extents3d] = None
+
+
+def aggregate(entities: Iterable[Entity],
+              group_by: Sequence[GroupKey] = (),
+              aggregates: Sequence[Aggregate] = (Aggregate.COUNT,)) \
+        -> List[AggregateRow]:
+    """
+    Aggregate the entities the same as SacadMgd does. Rows are in the order
+    of the first entity of each group.
+    """
+    rows: Dict[Tuple, AggregateRow] = {}
+    for entity in entities:
+        key = [_key_of(entity, k) for k in group_by]
+        row = rows.get(tuple(key))
+        if row is None:
+            row = rows[tuple(key)] = _new_row(key, aggregates)
+
+        if row.count is not None:
+            row.count += 1
+        if row.length is not None:
+            row.length += _length(entity)
+        if row.area is not None:
+            row.area += _area(entity)
+        if Aggregate.EXTENTS in aggregates:
+            row.extents = _union(row.extents, extents_of(entity))
+
+    return list(rows.values())
+
+
+def _new_row(key: List[Any],
+             aggregates: Sequence[Aggregate]) -> AggregateRow:
+    return AggregateRow(
+        key=key,
+        count=0 if Aggregate.COUNT in aggregates else None,
+        length=0.0 if Aggregate.LENGTH in aggregates else None,
+        area=0.0 if Aggregate.AREA in aggregates else None)
+
+
+def _key_of(entity: Entity, key: GroupKey) -> Any:
+    if key == GroupKey.TYPE:
+        return entity._jsonify_classname()
+    if key == GroupKey.LAYER:
+        return entity.layer or DEFAULT_LAYER
+    if key == GroupKey.LINETYPE:
+        return entity.linetype or DEFAULT_LINETYPE
+    if key == GroupKey.COLOR_INDEX:
+        return _color_index(entity)
+    if key == GroupKey.TEXT_STYLE:
+        if isinstance(entity, (DBText, MText)):
+            return entity.text_style_name or 'Standard'
+        return None
+    raise ValueError(f'Unknown group key {key}.')
+
+
+def _length(entity: Entity) -> float:
+    if isinstance(entity, Line):
+        if entity.start_point is None or entity.end_point is None:
+            return 0.0
+        return math.dist(_xyz(entity.start_point), _xyz(entity.end_point))
+    if isinstance(entity, Arc):
+        return (entity.radius or 0.0) * _sweep(entity)
+    if isinstance(entity, Circle):
+        return entity.circumference()
+    if isinstance(entity, Polyline):
+        return sum(chord * _bulge_factor(bulge)
+                   for chord, bulge, _, _ in _segments(entity))
+    return 0.0
+
+
+def _area(entity: Entity) -> float:
+    if not isinstance(entity, Curve):
+        return 0.0
+    if entity.area is not None:
+        return entity.area
+    if isinstance(entity, Arc):
+        # The area between the arc and its chord, like AutoCAD.
+        theta = _sweep(entity)
+        return (entity.radius or 0.0) ** 2 * (theta - math.sin(theta)) / 2
+    if isinstance(entity, Circle):
+        return math.pi * (entity.radius or 0.0) ** 2
+    if isinstance(entity, Polyline):
+        # As if closed, like AutoCAD: the shoelace formula plus the signed
+        # areas of circular segments of bulges.
+        total = 0.0
+        for chord, bulge, a, b in _segments(entity, closed=True):
+            total += a[0] * b[1] - b[0] * a[1]
+            if bulge:
+                theta = 4 * math.atan(bulge)
+                r = chord / (2 * math.sin(theta / 2))
+                total += r * r * (theta - math.sin(theta))
+        return abs(total) / 2
+    return 0.0
+
+
+def _sweep(arc: Arc) -> float:
+    if arc.total_angle is not None:
+        return arc.total_angle
+    start, end = arc.start_angle or 0.0, arc.end_angle or 0.0
+    return (end - start) % (2 * math.pi)
+
+
+def _segments(polyline: Polyline, closed: Optional[bool] = None):
+    """(chord, bulge, start, end) of each segment of the polyline."""
+    vertices = polyline.vertices or []
+    closed = polyline.closed if closed is None else closed
+    n = len(vertices)
+    for i in range(n if closed and n > 1 else n - 1):
+        v, w = vertices[i], vertices[(i + 1) % n]
+        a, b = (v.point.x, v.point.y), (w.point.x, w.point.y)
+        yield math.dist(a, b), v.bulge or 0.0, a, b
+
+
+def _bulge_factor(bulge: float) -> float:
+    """Ratio of the length of the arc to its chord."""
+    if not bulge:
+        return 1.0
+    theta = 4 * math.atan(abs(bulge))
+    return theta / (2 * math.sin(theta / 2))
+
+
+def _xyz(p: Vector3d) -> Tuple[float, float, float]:
+    return p.x, p.y, p.z if len(p) > 2 else 0.0
+
+
+def _union(a: Optional[Extents3d],
+           b: Optional[Extents3d]) -> Optional[Extents3d]:
+    if a is None or b is None:
+        return b if a is None else a
+    return Extents3d(
+        min_point=Vector3d(*(min(p, q) for p, q in zip(
+            _xyz(a.min_point), _xyz(b.min_point)))),
+        max_point=Vector3d(*(max(p, q) for p, q in zip(
+            _xyz(a.max_point), _xyz(b.max_point)))))
@@ -0,0 +1,316 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Columnar batches of entities, backed by NumPy arrays."""
+
+import dataclasses
+import json
+
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Type
+
+import numpy as np
+
+from sacad.acdb import Circle, DBText, Entity, Line, Polyline
+from sacad.jsonify import CLASS_KEY, MEMBER_KEY, Fragment, Jsonify
+
+__all__ = [
+    'EntityBatch',
+    'LineBatch',
+    'CircleBatch',
+    'PolylineBatch',
+    'TextBatch',
+]
+
+# Formatted with the values given by _json_floats.
+_VECTOR2D = '{"__cls__": "sacad.acge.Vector2d", "__mbr__": [%s, %s]}'
+_VECTOR3D = '{"__cls__": "sacad.acge.Vector3d", "__mbr__": [%s, %s, %s]}'
+
+
+class EntityBatch:
+    """
+    Entities of one type, stored by columns rather than as one Python object
+    per entity, and serialized directly from the columns.
+
+    Besides the geometry of each batch type, any other field of the entity
+    type (layer, color, linetype...) can be given as a keyword argument,
+    either a single value shared by every entity, or a sequence (or an array)
+    with one value per entity.
+
+    A batch is inserted by insert_batch of DBInsert.model_space, and arrives
+    at SacadMgd as ordinary entities.
+    """
+
+    entity_type: Type[Entity] = Entity
+
+    def __init__(self, size: int, **properties):
+        self._size = size
+        self._columns: Dict[str, List[str]] = {}
+        self._shared: Dict[str, str] = {}
+
+        fields = {f.name for f in dataclasses.fields(self.entity_type)}
+        for key, value in properties.items():
+            if key not in fields:
+                raise TypeError(f'{self.entity_type.__name__} has no field '
+                                f'{key!r}.')
+            self._set(key, value)
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(size={self._size})'
+
+    def to_fragments(self, size: Optional[int] = None) -> Iterator[Fragment]:
+        """
+        Serialize the entities into fragments of at most size entities each,
+        so that large batches can still be split by DBInsert.submit.
+        """
+        size = size or self._size or 1
+        template = self._template()
+        rows = zip(*self._columns.values()) if self._columns \
+            else iter(lambda: (), None)
+
+        for start in range(0, self._size, size):
+            count = min(size, self._size - start)
+            texts = [template % next(rows) for _ in range(count)]
+            yield Fragment(', '.join(texts), count)
+
+    def to_fragment(self) -> Fragment:
+        """Serialize all entities into one fragment."""
+        return next(self.to_fragments(), Fragment('', 0))
+
+    def _set(self, key: str, value: Any):
+        """Set a field, shared if value is a single value."""
+        if _is_single(value):
+            if value is not None:
+                self._shared[key] = _render(value)
+            return
+
+        values = value.tolist() if isinstance(value, np.ndarray) \
+            else list(value)
+        self._check_size(key, len(values))
+        cache = {}
+        self._columns[key] = [
+            _render_cached(v, cache) for v in values]
+
+    def _set_column(self, key: str, texts: List[str]):
+        """Set a field to already serialized values, one per entity."""
+        self._check_size(key, len(texts))
+        self._columns[key] = texts
+
+    def _set_points(self, key: str, points: Any):
+        """Set a Vector3d field from an array of shape (N, 2|3) or (2|3,)."""
+        arr = np.asarray(points, dtype=float)
+        if arr.ndim == 1:
+            arr = arr[np.newaxis]
+            shared = True
+        else:
+            shared = False
+        if arr.ndim != 2 or arr.shape[1] not in (2, 3):
+            raise ValueError(f'{key} must be of shape (N, 2) or (N, 3).')
+        if arr.shape[1] == 2:
+            arr = np.column_stack((arr, np.zeros(len(arr))))
+
+        texts = [_VECTOR3D % tuple(p) for p in _json_floats(arr)]
+        if shared:
+            self._shared[key] = texts[0]
+        else:
+            self._set_column(key, texts)
+
+    def _check_size(self, key: str, size: int):
+        if size != self._size:
+            raise ValueError(f'{key} has {size} values, '
+                             f'{self._size} expected.')
+
+    def _template(self) -> str:
+        head = self.entity_type()._jsonify_to_dict()
+        members = [f'{json.dumps(k)}: {json.dumps(v)}'.replace('%', '%%')
+                   for k, v in head[MEMBER_KEY].items()]
+        members += [f'{json.dumps(k)}: {v}'.replace('%', '%%')
+                    for k, v in self._shared.items()]
+        members += [json.dumps(k).replace('%', '%%') + ': %s'
+                    for k in self._columns]
+        return (f'{{"{CLASS_KEY}": {json.dumps(head[CLASS_KEY])}, '
+                f'"{MEMBER_KEY}": {{' + ', '.join(members) + '}}')
+
+
+class LineBatch(EntityBatch):
+    entity_type = Line
+
+    def __init__(self, start: Any, end: Any, **properties):
+        """
+        Initialization.
+
+        :param start: start points, of shape (N, 2) or (N, 3), or a single
+                      point of shape (2,) or (3,) shared by all lines.
+        :param end: end points, of the same shapes as start.
+        """
+        super().__init__(_size({'start': start, 'end': end}), **properties)
+        self._set_points('start_point', start)
+        self._set_points('end_point', end)
+
+
+class CircleBatch(EntityBatch):
+    entity_type = Circle
+
+    def __init__(self, center: Any, radius: Any, **properties):
+        """
+        Initialization.
+
+        :param center: centers, of shape (N, 2) or (N, 3).
+        :param radius: radius of all circles, or of each one, of shape (N,).
+        """
+        super().__init__(_size({'center': center}), **properties)
+        self._set_points('center', center)
+        self._set('radius', _numbers(radius))
+
+
+class PolylineBatch(EntityBatch):
+    entity_type = Polyline
+
+    def __init__(self, offsets: Any, xy: Any, bulge: Any = None,
+                 widths: Any = None, **properties):
+        """
+        Initialization.
+
+        The vertices of all polylines are stored one after another, like a
+        CSR matrix: vertices of the i-th polyline are
+        xy[offsets[i]:offsets[i + 1]].
+
+        :param offsets: index of the first vertex of each polyline, followed
+                        by the number of vertices, of shape (N + 1,).
+        :param xy: vertices, of shape (M, 2).
+        :param bulge: bulge of each vertex, of shape (M,).
+        :param widths: start and end widths of each vertex, of shape (M, 2).
+        """
+        offsets = np.asarray(offsets, dtype=np.int64)
+        xy = np.asarray(xy, dtype=float)
+        if offsets.ndim != 1 or len(offsets) < 1:
+            raise ValueError('offsets must be of shape (N + 1,).')
+        if xy.ndim != 2 or xy.shape[1] != 2:
+            raise ValueError('xy must be of shape (M, 2).')
+        if offsets[0] != 0 or offsets[-1] != len(xy) \
+                or np.any(np.diff(offsets) < 0):
+            raise ValueError('offsets must rise from 0 to len(xy).')
+
+        super().__init__(len(offsets) - 1, **properties)
+
+        members = [(_VECTOR2D, _json_floats(xy))]
+        template = '{"__cls__": "sacad.acdb.Vertex", "__mbr__": {"point": %s'
+        if bulge is not None:
+            members.append(('%s', _json_floats(_numbers(bulge, len(xy)))))
+            template += ', "bulge": %s'
+        if widths is not None:
+            widths = np.asarray(widths, dtype=float)
+            if widths.shape != (len(xy), 2):
+                raise ValueError('widths must be of shape (M, 2).')
+            members.append(('%s', _json_floats(widths[:, 0])))
+            members.append(('%s', _json_floats(widths[:, 1])))
+            template += ', "start_width": %s, "end_width": %s'
+        template += '}}'
+
+        columns = [[fmt % (tuple(v) if isinstance(v, list) else (v,))
+                    for v in values] for fmt, values in members]
+        vertices = [template % v for v in zip(*columns)]
+
+        bounds = offsets.tolist()
+        self._set_column('vertices', [
+            '[' + ', '.join(vertices[s:e]) + ']'
+            for s, e in zip(bounds, bounds[1:])])
+
+
+class TextBatch(EntityBatch):
+    entity_type = DBText
+
+    def __init__(self, position: Any, strings: Sequence[str],
+                 height: Any = None, **properties):
+        """
+        Initialization.
+
+        :param position: positions of texts, of shape (N, 2) or (N, 3), or a
+                         single point of shape (2,) or (3,) shared by all.
+        :param strings: the text of each entity.
+        :param height: height of all texts, or of each one, of shape (N,).
+        """
+        super().__init__(_size({'position': position}, strings=len(strings)),
+                         **properties)
+        self._set_points('position', position)
+        self._set_column('text_string', [json.dumps(s) for s in strings])
+        self._set('height', _numbers(height))
+
+
+def _size(points: Dict[str, Any], **sizes: int) -> int:
+    """
+    Number of entities, given by arrays of points of shape (N, 2|3) and other
+    sizes, which must agree. A single point of shape (2|3,) is shared by all
+    entities, there is one entity if all points are such ones.
+    """
+    for key, value in points.items():
+        if np.ndim(value) != 1:
+            sizes[key] = len(np.atleast_2d(np.asarray(value, dtype=float)))
+
+    if len(set(sizes.values())) > 1:
+        raise ValueError('Numbers of entities disagree: ' + ', '.join(
+            f'{k} has {n}' for k, n in sizes.items()) + '.')
+    return next(iter(sizes.values()), 1)
+
+
+def _is_single(value: Any) -> bool:
+    return value is None or isinstance(
+        value, (str, bytes, int, float, bool, Jsonify, np.generic)) \
+        or isinstance(value, np.ndarray) and value.ndim == 0
+
+
+def _numbers(value: Any, size: Optional[int] = None) -> Any:
+    if value is None or _is_single(value):
+        value = None if value is None else float(value)
+        if size is None or value is None:
+            return value
+        return np.full(size, value)
+    arr = np.asarray(value, dtype=float)
+    if size is not None and arr.shape != (size,):
+        raise ValueError(f'{size} values expected, got {arr.shape}.')
+    return arr
+
+
+def _json_floats(arr: np.ndarray) -> list:
+    """
+    arr.tolist() of a 1-D or 2-D array, whose values are formatted by %s as
+    json.dumps writes them, i.e. non-finite ones as Infinity, -Infinity and
+    NaN rather than inf and nan.
+    """
+    values = arr.tolist()
+    if np.isfinite(arr).all():
+        return values
+    if arr.ndim == 1:
+        return [json.dumps(v) for v in values]
+    return [[json.dumps(v) for v in row] for row in values]
+
+
+def _render(value: Any) -> str:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, Jsonify):
+        return value.serialize()
+    if isinstance(value, IntEnum):
+        return str(int(value))
+    return json.dumps(value)
+
+
+def _render_cached(value: Any, cache: Dict[Any, str]) -> str:
+    try:
+        text = cache.get(value)
+    except TypeError:  # unhashable
+        return _render(value)
+    if text is None:
+        text = cache[value] = _render(value)
+    return text
@@ -0,0 +1,84 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Time taken by importing sacad, each measured in a fresh interpreter."""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+from typing import Dict, List
+
+# The time of an interpreter doing nothing is subtracted from each scenario.
+SCENARIOS = {
+    'baseline': 'pass',
+    'import sacad': 'import sacad',
+    'serialize a query': (
+        'import sacad\n'
+        'insert = sacad.DBInsert(None, sacad.DBInsertQuery())\n'
+        'insert.model_space.insert(sacad.Line.new(0, 0, 1, 1))\n'
+        'insert.query.serialize()'),
+    'import Matrix3d': 'from sacad import Matrix3d',
+    'import Acad': 'from sacad import Acad',
+}
+
+_TIMER = '''
+import time
+_start = time.perf_counter()
+exec(compile({code!r}, '<scenario>', 'exec'))
+_elapsed = time.perf_counter() - _start
+import sys
+print(_elapsed, ' '.join(m for m in ('numpy', 'pythoncom', 'winreg')
+                         if m in sys.modules))
+'''
+
+
+def measure(code: str, repeat: int) -> List[float]:
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, '-c', _TIMER.format(code=code)],
+            check=True, capture_output=True, text=True).stdout
+        times.append(float(out.split()[0]))
+    return times
+
+
+def loaded_modules(code: str) -> List[str]:
+    out = subprocess.run(
+        [sys.executable, '-c', _TIMER.format(code=code)],
+        check=True, capture_output=True, text=True).stdout
+    return out.split()[1:]
+
+
+def run(repeat=10) -> Dict[str, float]:
+    """
+    :return: median milliseconds taken by each scenario.
+    """
+    return {name: statistics.median(measure(code, repeat)) * 1000
+            for name, code in SCENARIOS.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sacad.benchmark.import_time', description=__doc__)
+    parser.add_argument('-n', '--repeat', type=int, default=10,
+                        help='number of interpreters per scenario.')
+    args = parser.parse_args(argv)
+
+    print(f'{"scenario":<20} {"median ms":>10}  heavy modules loaded')
+    for name, ms in run(args.repeat).items():
+        modules = ', '.join(loaded_modules(SCENARIOS[name])) or '-'
+        print(f'{name:<20} {ms:>10.1f}  {modules}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,301 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Time taken by the hot paths of serialization and geometry."""
+
+import argparse
+import datetime
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import timeit
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from sacad.acdb import (
+    Arc,
+    Circle,
+    DBText,
+    Entity,
+    Line,
+    MText,
+    Polyline,
+    RotatedDimension,
+    Vertex,
+)
+from sacad.acge import Vector2d, Vector3d
+from sacad.crud import DBInsert, DBInsertQuery
+from sacad.jsonify import Jsonify
+
+# Each benchmark prepares its data, and returns the operation to be timed.
+Benchmark = Callable[[], Callable[[], object]]
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str):
+    def register(setup: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def lines(n: int) -> List[Entity]:
+    return [Line.new(i, 0, i, 100) for i in range(n)]
+
+
+def mixed_entities(n: int) -> List[Entity]:
+    """Entities of the kinds drawn most often, in equal numbers."""
+    makers = [
+        lambda i: Line.new(i, 0, i + 10, 10, layer='0'),
+        lambda i: Circle.new(i, i, 5),
+        lambda i: Arc.new(i, 0, 5, 0, 1.5),
+        lambda i: Polyline.new(*(Vertex.new(i + x, y) for x, y in
+                                 ((0, 0), (10, 0), (10, 10), (0, 10))),
+                               closed=True),
+        lambda i: DBText.new(i, 0, f'text {i}', height=2.5),
+        lambda i: MText.new(i, 0, f'mtext\\P{i}', text_height=2.5),
+        lambda i: RotatedDimension.new(0, i, 0, i + 10, 0, i + 5, 5),
+    ]
+    return [makers[i % len(makers)](i) for i in range(n)]
+
+
+def _query_of(entities: List[Entity]) -> DBInsertQuery:
+    op = DBInsert(None, DBInsertQuery())
+    op.model_space.insert_many(entities)
+    return op.query
+
+
+@benchmark('serialize 1000 lines')
+def _serialize_lines():
+    query = _query_of(lines(1000))
+    return query.serialize
+
+
+@benchmark('serialize 1000 mixed')
+def _serialize_mixed():
+    query = _query_of(mixed_entities(1000))
+    return query.serialize
+
+
+@benchmark('deserialize 1000 lines')
+def _deserialize_lines():
+    text = _query_of(lines(1000)).serialize()
+    return lambda: Jsonify.deserialize(text)
+
+
+@benchmark('deserialize 1000 mixed')
+def _deserialize_mixed():
+    text = _query_of(mixed_entities(1000)).serialize()
+    return lambda: Jsonify.deserialize(text)
+
+
+@benchmark('Vector2d add/mul')
+def _vector2d_arithmetic():
+    a, b = Vector2d(1, 2), Vector2d(3, 4)
+    return lambda: (a + b) * 0.5 - a
+
+
+@benchmark('Vector3d add/mul')
+def _vector3d_arithmetic():
+    a, b = Vector3d(1, 2, 3), Vector3d(4, 5, 6)
+    return lambda: (a + b) * 0.5 - a
+
+
+@benchmark('Vector2d rotate')
+def _vector2d_rotate():
+    v = Vector2d(1, 2)
+    return lambda: v.rotate(30)
+
+
+@benchmark('Vector3d rotate')
+def _vector3d_rotate():
+    v, axis = Vector3d(1, 2, 3), Vector3d(1, 1, 1)
+    return lambda: v.rotate(30, axis)
+
+
+@benchmark('Matrix3d compose')
+def _matrix3d_compose():
+    from sacad.acge import Matrix3d
+    m = Matrix3d.identity()
+    return lambda: m.move(1, 2, 3).rotate(30).scale(2)
+
+
+@benchmark('Vector3d transform_by')
+def _vector3d_transform_by():
+    from sacad.acge import Matrix3d
+    m = Matrix3d.identity().move(1, 2, 3).rotate(30)
+    v = Vector3d(1, 2, 3)
+    return lambda: v.transform_by(m)
+
+
+@benchmark('Entity transform_by')
+def _entity_transform_by():
+    from sacad.acge import Matrix3d
+    m = Matrix3d.identity().rotate(30)
+    line = Line.new(0, 0, 1, 1)
+
+    def transform():
+        line.matrix = None
+        line.transform_by(m)
+        line.transform_by(m)
+
+    return transform
+
+
+@benchmark('DBObject.clone')
+def _clone():
+    polyline = mixed_entities(4)[3]
+    return polyline.clone
+
+
+@benchmark('Polyline.new 100 vertices')
+def _polyline_new():
+    points = [(i, i * i) for i in range(100)]
+    return lambda: Polyline.new(*(Vertex.new(x, y) for x, y in points))
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline: Optional[float]
+    current: Optional[float]
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if not self.baseline or self.current is None:
+            return None
+        return self.current / self.baseline
+
+    def verdict(self, tolerance: float) -> str:
+        if self.ratio is None:
+            return 'new' if self.baseline is None else 'missing'
+        if self.ratio > 1 + tolerance:
+            return 'slower'
+        if self.ratio < 1 / (1 + tolerance):
+            return 'faster'
+        return ''
+
+
+def measure(setup: Benchmark, repeat=5, min_seconds=0.2) -> float:
+    """
+    :return: median seconds taken by one call of the operation.
+    """
+    timer = timeit.Timer(setup())
+    number, _ = timer.autorange()
+    number = max(int(number * min_seconds / 0.2), 1)
+    return statistics.median(
+        t / number for t in timer.repeat(repeat, number))
+
+
+def run(patterns: Optional[List[str]] = None, repeat=5,
+        min_seconds=0.2) -> Dict[str, float]:
+    """
+    :param patterns: shell-style patterns of benchmark names, all of them by
+                     default.
+    :return: median seconds per call of each benchmark.
+    """
+    return {name: measure(BENCHMARKS[name], repeat, min_seconds)
+            for name in select(patterns)}
+
+
+def select(patterns: Optional[List[str]] = None) -> List[str]:
+    """Get names of benchmarks matching any of the shell-style patterns."""
+    return [name for name in BENCHMARKS
+            if not patterns or any(fnmatch.fnmatch(name, p)
+                                   for p in patterns)]
+
+
+def save_baseline(path: str, results: Dict[str, float]):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        }, f, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def compare(results: Dict[str, float],
+            baseline: Dict[str, float]) -> List[Comparison]:
+    names = list(results) + [n for n in baseline if n not in results]
+    return [Comparison(n, baseline.get(n), results.get(n)) for n in names]
+
+
+def report(comparisons: List[Comparison], tolerance=0.1) -> str:
+    rows = [f'{"benchmark":<28} {"baseline":>10} {"current":>10} '
+              f'{"ratio":>7}']
+    for c in comparisons:
+        ratio = f'{c.ratio:.2f}' if c.ratio is not None else '-'
+        rows.append(f'{c.name:<28} {_format_time(c.baseline):>10} '
+                      f'{_format_time(c.current):>10} {ratio:>7}  '
+                      f'{c.verdict(tolerance)}'.rstrip())
+    return '\n'.join(rows)
+
+
+def _format_time(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return '-'
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m sacad.benchmark.micro', description=__doc__)
+    parser.add_argument('patterns', nargs='*', metavar='PATTERN',
+                        help='run only benchmarks whose names match.')
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+                        help='number of timings per benchmark.')
+    parser.add_argument('-t', '--min-time', type=float, default=0.2,
+                        help='minimum seconds of each timing.')
+    parser.add_argument('--save', metavar='FILE',
+                        help='save the results as a baseline.')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='compare the results with a saved baseline.')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='relative change reported as slower/faster.')
+    parser.add_argument('--strict', action='store_true',
+                        help='exit with 1 if anything is slower than the '
+                             'baseline.')
+    args = parser.parse_args(argv)
+
+    results = run(args.patterns, args.repeat, args.min_time)
+    baseline = {}
+    if args.compare:
+        names = select(args.patterns)
+        baseline = {n: t for n, t in load_baseline(args.compare).items()
+                    if n in names or n not in BENCHMARKS}
+    comparisons = compare(results, baseline)
+    print(report(comparisons, args.tolerance))
+
+    if args.save:
+        save_baseline(args.save, results)
+
+    if args.strict and any(c.verdict(args.tolerance) == 'slower'
+                           for c in comparisons):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,402 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""
+End-to-end scenarios of the demos against a loopback AutoCAD, with the time
+split into phases, at several sizes.
+"""
+
+import argparse
+import dataclasses
+import itertools
+import json
+import math
+import sys
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+from sacad.accm import Color
+from sacad.acdb import (
+    Arc,
+    LayerTableRecord,
+    Line,
+    MODEL_SPACE,
+    Polyline,
+    Vertex,
+)
+from sacad.acge import Vector2d
+from sacad.crud import (
+    DBDeleteQuery,
+    DBInsert,
+    DBInsertQuery,
+    DBQuery,
+    DBSelectQuery,
+    SelectMode,
+    TableFlags,
+    ZoomMode,
+)
+from sacad.jsonify import Fragment, Jsonify
+from sacad.loopback import LoopbackAcad, LoopbackSession
+from sacad.result import Result
+
+
+@dataclass
+class Phases:
+    """Seconds spent in each phase of a scenario, and its peak memory."""
+    entities: int = 0
+    generation: float = 0.0
+    serialization: float = 0.0
+    transport: float = 0.0
+    execution: float = 0.0
+    deserialization: float = 0.0
+    peak_memory: Optional[int] = None
+
+    @property
+    def total(self) -> float:
+        return self.generation + self.serialization + self.transport \
+            + self.execution + self.deserialization
+
+
+class Probe:
+    """Submits the queries of a scenario, recording time of each phase."""
+
+    def __init__(self, session: LoopbackSession):
+        self.session = session
+        self.acad: LoopbackAcad = session.acad
+        self.phases = Phases()
+
+    @contextmanager
+    def generating(self):
+        start_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.generation += time.perf_counter() - start_at
+
+    def submit(self, query: DBQuery, lazy=False) -> Result:
+        """
+        :param lazy: send the query by pieces of serialize_iter, so that
+                     generation and serialization of entities inserted lazily
+                     are counted as transport.
+        """
+        phases = self.phases
+
+        start_at = time.perf_counter()
+        request = query.serialize_iter() if lazy else query.serialize()
+        serialized_at = time.perf_counter()
+
+        executed = self.acad.execute_seconds
+        response = self.session.db_operation(request)
+        responded_at = time.perf_counter()
+        execution = self.acad.execute_seconds - executed
+
+        result = Jsonify.deserialize(response)
+        phases.deserialization += time.perf_counter() - responded_at
+
+        phases.serialization += serialized_at - start_at
+        phases.transport += responded_at - serialized_at - execution
+        phases.execution += execution
+        return result
+
+
+# A scenario draws with the probe at the given size, and returns the number
+# of entities drawn.
+Scenario = Callable[[Probe, int], int]
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+# Sizes run by default, chosen to take from milliseconds to seconds.
+DEFAULT_SIZES: Dict[str, List[int]] = {}
+
+
+def scenario(name: str, sizes: List[int]):
+    def register(func: Scenario) -> Scenario:
+        SCENARIOS[name] = func
+        DEFAULT_SIZES[name] = sizes
+        return func
+
+    return register
+
+
+@scenario('mandelbrot', [30, 90, 180])
+def mandelbrot(probe: Probe, width: int) -> int:
+    """demo/01_mandelbrot.py, on a grid of width x (width * 2 / 3) cells."""
+    height, depth = width * 2 // 3, 32
+
+    with probe.generating():
+        trans = DBInsert(None, DBInsertQuery(
+            zoom_mode=ZoomMode.ADDED, zoom_factor=1.5))
+
+        trans.layer_table.insert_many(
+            LayerTableRecord(name=f'LAYER{i}', color=Color.rgb(j, j, j))
+            for i, j in map(lambda k: (k, k * 8), range(depth)))
+
+        for x, y in itertools.product(range(width), range(height)):
+            xn, yn = xc, yc = \
+                float(x) / width * 3 - 2, float(y) / height * 2 - 1
+            for i in range(depth):
+                if xn ** 2 + yn ** 2 > 4:
+                    trans.model_space.insert(Polyline.new(
+                        Vertex.new(x - 0.25, y, bulge=1),
+                        Vertex.new(x + 0.25, y, bulge=1),
+                        closed=True, constant_width=0.5, layer=f'LAYER{i}'))
+                    break
+                xn, yn = xn ** 2 - yn ** 2 + xc, 2 * xn * yn + yc
+
+    probe.submit(trans.query)
+    return len(trans.query.database.get_block(MODEL_SPACE).entities)
+
+
+@scenario('mandelbrot/batch', [30, 90, 180])
+def mandelbrot_batch(probe: Probe, width: int) -> int:
+    """The same as mandelbrot, drawn as a PolylineBatch computed by NumPy."""
+    import numpy as np
+    from sacad.batch import PolylineBatch
+
+    height, depth = width * 2 // 3, 32
+
+    with probe.generating():
+        trans = DBInsert(None, DBInsertQuery(
+            zoom_mode=ZoomMode.ADDED, zoom_factor=1.5))
+
+        trans.layer_table.insert_many(
+            LayerTableRecord(name=f'LAYER{i}', color=Color.rgb(j, j, j))
+            for i, j in map(lambda k: (k, k * 8), range(depth)))
+
+        x, y = (a.ravel() for a in np.meshgrid(
+            np.arange(width), np.arange(height), indexing='ij'))
+        c = (x / width * 3 - 2) + 1j * (y / height * 2 - 1)
+        z = c.copy()
+        escaped = np.full(len(c), -1)
+        for i in range(depth):
+            escaped[(escaped < 0) & (np.abs(z) > 2)] = i
+            z = np.where(escaped < 0, z * z + c, z)
+
+        cells = escaped >= 0
+        x, y, escaped = x[cells], y[cells], escaped[cells]
+        xy = np.empty((len(x) * 2, 2))
+        xy[0::2, 0], xy[1::2, 0] = x - 0.25, x + 0.25
+        xy[0::2, 1] = xy[1::2, 1] = y
+
+        trans.model_space.insert_batch(PolylineBatch(
+            np.arange(0, len(xy) + 1, 2), xy, bulge=np.ones(len(xy)),
+            closed=True, constant_width=0.5,
+            layer=[f'LAYER{i}' for i in escaped.tolist()]))
+
+    probe.submit(trans.query)
+    return len(x)
+
+
+@scenario('entities', [10, 100, 500])
+def entities(probe: Probe, count: int) -> int:
+    """demo/02_entities.py, drawing count copies of the golden spiral."""
+    with probe.generating():
+        trans = DBInsert(None, DBInsertQuery(
+            zoom_mode=ZoomMode.ADDED, zoom_factor=1.5))
+        for i in range(count):
+            trans.model_space.insert_many(_golden_section_arcs(
+                center=Vector2d(i % 32 * 200, i // 32 * 200)))
+
+    probe.submit(trans.query)
+    return len(trans.query.database.get_block(MODEL_SPACE).entities)
+
+
+@scenario('entities/lazy', [10, 100, 500])
+def entities_lazy(probe: Probe, count: int) -> int:
+    """The same as entities, inserted lazily by a single generator."""
+    with probe.generating():
+        trans = DBInsert(None, DBInsertQuery(
+            zoom_mode=ZoomMode.ADDED, zoom_factor=1.5))
+        trans.model_space.insert_many((
+            arc for i in range(count) for arc in _golden_section_arcs(
+                center=Vector2d(i % 32 * 200, i // 32 * 200))), lazy=True)
+
+    probe.submit(trans.query, lazy=True)
+    return Fragment.count_in(
+        trans.query.database.get_block(MODEL_SPACE).entities)
+
+
+@scenario('select/delete', [1000, 5000, 20000])
+def select_delete(probe: Probe, count: int) -> int:
+    """Select count lines of model space, then delete them by their ids."""
+    setup = DBInsertQuery()
+    setup.database.get_block(MODEL_SPACE).entities.extend(
+        Line.new(i, 0, i, 10) for i in range(count))
+    probe.acad.execute_query(setup)
+
+    selected = probe.submit(DBSelectQuery(
+        mode=SelectMode.GET_TABLES, table_flags=TableFlags.MODEL_SPACE))
+
+    with probe.generating():
+        query = DBDeleteQuery()
+        query.database.get_block(MODEL_SPACE).entities.extend(
+            selected.db.get_block(MODEL_SPACE).entities)
+
+    result = probe.submit(query)
+    assert result.num_deleted == count, result
+    return count
+
+
+def _golden_section_arcs(center: Vector2d, direction=Vector2d(100),
+                         num=10, tolerance=1e-6):
+    for i in range(num):
+        yield Polyline.new(*(Vertex.new(v.x, v.y)
+                             for v in _rect_vertices(center, direction)),
+                           closed=True)
+
+        radius = abs(direction)
+        normal_dir = direction.normalize()
+
+        cross_prod = Vector2d.xaxis() @ direction.normalize()
+        dot_prod = Vector2d.xaxis() * direction.normalize()
+
+        start_angle = math.acos(dot_prod) * (
+            cross_prod / abs(cross_prod) if abs(cross_prod) > tolerance else 1)
+
+        yield Arc.new_vec2(center, radius, start_angle,
+                           start_angle + math.pi / 2)
+
+        next_radius = radius * (math.sqrt(1.25) - 0.5)
+        next_normal_dir = normal_dir.rotate(90)
+
+        direction = next_normal_dir * next_radius
+        center += next_normal_dir * (radius - next_radius)
+
+
+def _rect_vertices(start_pos: Vector2d,
+                   direction: Vector2d) -> Iterator[Vector2d]:
+    pos = start_pos
+    for _ in range(4):
+        yield pos
+        pos += direction
+        direction = direction.rotate(90)
+
+
+def measure(func: Scenario, size: int, memory=True, serve=False,
+            latency=0.0) -> Phases:
+    """
+    Run a scenario once against a new loopback AutoCAD.
+
+    :param memory: also run it under tracemalloc for the peak memory, which
+                   is a separate run since tracing slows everything down.
+    :param serve: submit in serving mode, i.e. without any command per
+                  request.
+    :param latency: seconds the loopback AutoCAD waits before each response.
+    """
+    phases = _run_once(func, size, serve, latency)
+
+    if memory:
+        tracemalloc.start()
+        try:
+            _run_once(func, size, serve, latency)
+            _, phases.peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return phases
+
+
+def _run_once(func: Scenario, size: int, serve: bool,
+              latency: float) -> Phases:
+    session = LoopbackSession(LoopbackAcad(latency))
+    try:
+        session.open()
+        if serve:
+            session.start_serving()
+
+        probe = Probe(session)
+        probe.phases.entities = func(probe, size)
+        return probe.phases
+    finally:
+        session.close()
+
+
+def run(names: Optional[List[str]] = None,
+        sizes: Optional[List[int]] = None, repeat=3,
+        **kwargs) -> Dict[str, Dict[int, Phases]]:
+    """
+    :param names: scenarios to run, all of them by default.
+    :param sizes: sizes of every scenario, DEFAULT_SIZES by default.
+    :param repeat: runs of each size, whose median total time is taken.
+    :param kwargs: passed to measure.
+    :return: phases of each scenario, by size.
+    """
+    results = {}
+    for name in names or SCENARIOS:
+        results[name] = {}
+        for size in sizes or DEFAULT_SIZES[name]:
+            runs = sorted((measure(SCENARIOS[name], size, **kwargs)
+                           for _ in range(max(repeat, 1))),
+                          key=lambda p: p.total)
+            results[name][size] = runs[(len(runs) - 1) // 2]
+    return results
+
+
+def report(results: Dict[str, Dict[int, Phases]]) -> str:
+    columns = ('generation', 'serialization', 'transport', 'execution',
+               'deserialization', 'total')
+    header = f'{"scenario":<16} {"size":>6} {"entities":>8} ' + ' '.join(
+        f'{c[:7]:>8}' for c in columns) + f' {"us/ent":>7} {"peak MB":>8}'
+
+    rows = [header, '(phases in ms)']
+    for name, by_size in results.items():
+        for size, phases in by_size.items():
+            ms = ' '.join(f'{getattr(phases, c) * 1000:>8.1f}'
+                          for c in columns)
+            per_entity = phases.total / max(phases.entities, 1) * 1e6
+            peak = '-' if phases.peak_memory is None \
+                else f'{phases.peak_memory / 2 ** 20:.1f}'
+            rows.append(f'{name:<16} {size:>6} {phases.entities:>8} {ms} '
+                        f'{per_entity:>7.1f} {peak:>8}')
+    return '\n'.join(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sacad.benchmark.scenario', description=__doc__)
+    parser.add_argument('names', nargs='*', metavar='SCENARIO',
+                        help=f'scenarios to run: {", ".join(SCENARIOS)}.')
+    parser.add_argument('-s', '--sizes', type=int, nargs='+',
+                        help='sizes of the scenarios, overriding defaults.')
+    parser.add_argument('-n', '--repeat', type=int, default=3,
+                        help='runs of each size.')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip measuring the peak memory.')
+    parser.add_argument('--serve', action='store_true',
+                        help='submit in serving mode.')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds the loopback AutoCAD waits before '
+                             'each response.')
+    parser.add_argument('--json', metavar='FILE',
+                        help='also save the results as JSON.')
+    args = parser.parse_args(argv)
+    for name in args.names:
+        if name not in SCENARIOS:
+            parser.error(f'unknown scenario {name!r}.')
+
+    results = run(args.names, args.sizes, args.repeat,
+                  memory=not args.no_memory, serve=args.serve,
+                  latency=args.latency)
+    print(report(results))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({name: {size: dataclasses.asdict(phases)
+                              for size, phases in by_size.items()}
+                       for name, by_size in results.items()}, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
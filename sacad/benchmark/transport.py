@@ -0,0 +1,240 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""
+Round-trip latency and throughput of the transport (`sacad.io`) over
+loopback, across payload sizes and numbers of concurrent connections.
+"""
+
+import argparse
+import math
+import socket
+import sys
+import threading
+import time
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Type
+
+from sacad.io import Requester
+
+# Sends a request and waits for its response.
+RequestFunc = Callable[[str], str]
+
+
+class Transport:
+    """
+    A way to carry requests to a peer and back, to be benchmarked.
+
+    Subclasses registered in TRANSPORTS can be compared with each other,
+    e.g. a new framing or compression against the current one.
+    """
+
+    def __init__(self, response_size: Optional[int] = None):
+        """
+        Initialization.
+
+        :param response_size: bytes of each response, the same as the request
+                              if None.
+        """
+        self.response_size = response_size
+
+    def connect(self) -> RequestFunc:
+        """Open a new connection to a new peer."""
+        raise NotImplementedError
+
+    def close(self):
+        """Close every connection opened."""
+        raise NotImplementedError
+
+
+class RequesterTransport(Transport):
+    """Requester, with the `<length>\\n<body>` framing of SacadMgd."""
+
+    def __init__(self, response_size: Optional[int] = None,
+                 host='127.0.0.1'):
+        super().__init__(response_size)
+        self.host = host
+        self._connections: List[tuple] = []
+
+    def connect(self) -> RequestFunc:
+        with socket.socket() as s:
+            s.bind((self.host, 0))
+            port = s.getsockname()[1]
+
+        req = Requester()
+        peer = EchoPeer(self.host, port, self.response_size)
+        req.open(self.host, port, on_listening=peer.start)
+        self._connections.append((req, peer))
+        return lambda msg: req.request(msg).result()
+
+    def close(self):
+        for req, peer in self._connections:
+            req.close()
+            peer.join()
+        self._connections.clear()
+
+
+TRANSPORTS: Dict[str, Type[Transport]] = {
+    'requester': RequesterTransport,
+}
+
+
+class EchoPeer(threading.Thread):
+    """
+    Connects to a listener, then answers each frame with a frame of the same
+    size (or response_size), until the connection is closed.
+    """
+
+    def __init__(self, host: str, port: int,
+                 response_size: Optional[int] = None):
+        super().__init__(daemon=True)
+        self.address = (host, port)
+        self.response_size = response_size
+
+    def run(self):
+        with socket.create_connection(self.address) as sock, \
+                sock.makefile('rb') as file:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            response = b''
+            while num_bytes := file.readline():
+                size = int(num_bytes)
+                file.read(size)
+
+                if self.response_size is not None:
+                    size = self.response_size
+                if len(response) != size:
+                    response = f'{size}\n'.encode() + b'x' * size
+                sock.sendall(response)
+
+
+@dataclass
+class Measurement:
+    size: int
+    concurrency: int
+    requests: int
+    seconds: float
+    bytes: int
+    latencies: List[float]
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes / 2 ** 20 / self.seconds if self.seconds > 0 \
+            else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Latency in seconds at the q-th percentile, by nearest rank."""
+        if not self.latencies:
+            return math.nan
+        rank = math.ceil(q / 100 * len(self.latencies))
+        return self.latencies[min(max(rank, 1), len(self.latencies)) - 1]
+
+
+def measure(transport: Transport, size: int, concurrency=1, seconds=1.0,
+            warmup=10) -> Measurement:
+    """
+    Send requests of size bytes over concurrency connections, each driven by
+    its own thread, for about the given seconds.
+    """
+    funcs = [transport.connect() for _ in range(concurrency)]
+    payload = 'x' * size
+    latencies: List[List[float]] = [[] for _ in funcs]
+    sizes = [0] * concurrency
+
+    for func in funcs:
+        for _ in range(warmup):
+            func(payload)
+
+    barrier = threading.Barrier(concurrency + 1)
+    deadline = 0.0
+
+    def work(index: int):
+        func, lats = funcs[index], latencies[index]
+        barrier.wait()
+        while (start_at := time.perf_counter()) < deadline:
+            response = func(payload)
+            lats.append(time.perf_counter() - start_at)
+            sizes[index] += size + len(response)
+
+    threads = [threading.Thread(target=work, args=(i,), daemon=True)
+               for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+
+    start_at = time.perf_counter()
+    deadline = start_at + seconds
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start_at
+
+    merged = sorted(lat for lats in latencies for lat in lats)
+    return Measurement(size=size, concurrency=concurrency,
+                       requests=len(merged), seconds=elapsed,
+                       bytes=sum(sizes), latencies=merged)
+
+
+def run(transport_name='requester', sizes=(16, 1024, 65536, 2 ** 20),
+        concurrencies=(1, 4), seconds=1.0,
+        response_size: Optional[int] = None) -> List[Measurement]:
+    results = []
+    for concurrency in concurrencies:
+        for size in sizes:
+            transport = TRANSPORTS[transport_name](response_size)
+            try:
+                results.append(
+                    measure(transport, size, concurrency, seconds))
+            finally:
+                transport.close()
+    return results
+
+
+def report(results: List[Measurement]) -> str:
+    rows = [f'{"size":>9} {"conns":>5} {"requests":>8} {"req/s":>9} '
+            f'{"MB/s":>8} {"p50 us":>9} {"p90 us":>9} {"p99 us":>9} '
+            f'{"max us":>9}']
+    for m in results:
+        lats = ' '.join(f'{m.percentile(q) * 1e6:>9.0f}'
+                        for q in (50, 90, 99, 100))
+        rows.append(f'{m.size:>9} {m.concurrency:>5} {m.requests:>8} '
+                    f'{m.requests_per_second:>9.0f} '
+                    f'{m.megabytes_per_second:>8.1f} {lats}')
+    return '\n'.join(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sacad.benchmark.transport', description=__doc__)
+    parser.add_argument('-t', '--transport', choices=list(TRANSPORTS),
+                        default='requester', help='transport to measure.')
+    parser.add_argument('-s', '--sizes', type=int, nargs='+',
+                        default=[16, 1024, 65536, 2 ** 20],
+                        help='bytes of each request.')
+    parser.add_argument('-c', '--concurrency', type=int, nargs='+',
+                        default=[1, 4],
+                        help='numbers of concurrent connections.')
+    parser.add_argument('-d', '--seconds', type=float, default=1.0,
+                        help='duration of each measurement.')
+    parser.add_argument('-r', '--response-size', type=int,
+                        help='bytes of each response, the same as the '
+                             'request by default.')
+    args = parser.parse_args(argv)
+
+    print(report(run(args.transport, args.sizes, args.concurrency,
+                     args.seconds, args.response_size)))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""
+Cache of symbol tables selected by SelectMode.GET_TABLES, so that repeated
+reads of them are served locally. SacadMgd reports a version of each symbol
+table selected, which changes whenever any record of the table is appended,
+modified or erased, and differs between documents. Versions cached are sent
+with the query, and tables of the same versions are not sent back:
+
+    acad.db_get_tables(TableFlags.LAYER).submit()  # Sent back.
+    acad.db_get_tables(TableFlags.LAYER).submit()  # From acad.table_cache.
+
+Tables are copied into and out of the cache, so changing the tables of
+results never changes the cache. Records to be upserted can be compared with
+the ones cached by content hashes, see DBInsert.
+"""
+
+import copy
+import dataclasses
+import hashlib
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sacad.acdb import DBObject
+from sacad.result import DBSelectResult, Status
+
+__all__ = [
+    'TableCache',
+    'content_hash',
+]
+
+
+class TableCache:
+    def __init__(self):
+        # Versions and records of tables by names of fields of Database,
+        # e.g. 'layer_table'.
+        self._tables: Dict[str, Tuple[str, Dict]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._tables)
+
+    def versions(self) -> Dict[str, str]:
+        """Versions of the tables cached, for DBSelectQuery.table_versions."""
+        return {name: version for name, (version, _) in self._tables.items()}
+
+    def get(self, name: str) -> Optional[Dict]:
+        """A copy of the records of the table cached, or None."""
+        cached = self._tables.get(name)
+        return None if cached is None else copy.deepcopy(cached[1])
+
+    def is_unchanged(self, name: str, key: str, record: DBObject) -> bool:
+        """
+        Whether the record cached of the key, in the table of the name, has
+        the same content as the record, by the fields of the record not None.
+        Such a record changes nothing if it is upserted.
+        """
+        cached = self._tables.get(name)
+        old = None if cached is None else cached[1].get(key)
+        if old is None or type(old) is not type(record):
+            return False
+        names = _specified(record)
+        return content_hash(old, names) == content_hash(record, names)
+
+    def merge(self, result: DBSelectResult):
+        """
+        Fill the tables of the result, which are not sent back, from the
+        cache, and cache the tables which are sent back.
+        """
+        if result.status == Status.FAILURE or result.db is None:
+            return
+        for name, version in (result.table_versions or {}).items():
+            cached = self._tables.get(name)
+            if cached is not None and cached[0] == version:
+                setattr(result.db, name, copy.deepcopy(cached[1]))
+                self.hits += 1
+            else:
+                self._tables[name] = (
+                    version, copy.deepcopy(getattr(result.db, name)))
+                self.misses += 1
+
+    def clear(self):
+        self._tables.clear()
+
+
+def content_hash(record: DBObject, names: Optional[Iterable[str]] = None) \
+        -> str:
+    """
+    Digest of the fields of the names of the record, or of all of its fields
+    not None, except the id, which differs between documents.
+    """
+    names = _specified(record) if names is None else names
+    content = type(record)(
+        **{n: getattr(record, n) for n in names if n != 'id'})
+    return hashlib.sha1(content.serialize().encode()).hexdigest()
+
+
+def _specified(record: DBObject) -> List[str]:
+    return [f.name for f in dataclasses.fields(record)
+            if f.name != 'id' and getattr(record, f.name) is not None]
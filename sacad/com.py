@@ -10,18 +10,25 @@
 # See the Mulan PSL v2 for more details.
 
 import os.path
-import time
+import threading
 
 from contextlib import suppress
+from typing import Optional
 
 import pythoncom
 import win32com.client as com
 import win32con
 import win32gui
 
-from functools import wraps
-
 from sacad.error import AcadComError
+from sacad.retry import (
+    AdaptiveRetryPolicy,
+    FixedRetryPolicy,
+    RetryError,
+    RetryPolicy,
+    RetryStats,
+    retryable,
+)
 
 __all__ = ['ComAcad']
 
@@ -30,41 +37,112 @@ RPC_E_CALL_REJECTED = -2147418111
 E_NO_DOCUMENT = -2145320900
 
 
-class RetryError(Exception):
-    def __init__(self, e, *args):
-        super().__init__(*args)
-        self.real_e = e
-
-
-def retryable(f):
-    @wraps(f)
-    def wrapper(*args, **kwargs):
-        last_e = None
-
-        for i in range(max(args[0].max_retry_count, 0) + 1):
-            try:
-                if i > 0:
-                    time.sleep(max(args[0].retry_delay, 0))
-                return f(*args, **kwargs)
-            except RetryError as e:
-                last_e = e
-
-        raise AcadComError('CAD is busy now.') from last_e.real_e
-
-    return wrapper
-
-
 class ComAcad:
-    def __init__(self, progid: str, retry_delay=0.1, max_retry_count=20):
-        self._acad = com.Dispatch(progid)
+    """
+    The AutoCAD application over COM.
+
+    It may be driven by any thread, not only the one creating it: the
+    application object is registered in the global interface table, and
+    other threads call it through proxies of their own, with COM initialized
+    as STA for them if it was not yet.
+    """
+
+    def __init__(self, progid: str, retry_delay=None, max_retry_count=None,
+                 new_instance=False,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """
+        Initialization.
+
+        :param progid: ProgID of the AutoCAD application.
+        :param retry_delay: with max_retry_count, retry rejected calls by
+                            FixedRetryPolicy instead of the default
+                            AdaptiveRetryPolicy.
+        :param max_retry_count: see retry_delay.
+        :param new_instance: always launch a new AutoCAD process, instead of
+                             attaching to the running one if any.
+        :param retry_policy: policy to retry calls rejected by a busy
+                             AutoCAD, overriding retry_delay/max_retry_count.
+        """
+        if new_instance:
+            self._bind(com.DispatchEx(progid))
+        else:
+            self._bind(com.Dispatch(progid))
+
+        self._init_retry(retry_delay, max_retry_count, retry_policy)
+
+    @classmethod
+    def from_app(cls, app, retry_delay=None, max_retry_count=None,
+                 retry_policy: Optional[RetryPolicy] = None) -> 'ComAcad':
+        """Wrap an already dispatched AutoCAD application object."""
+        self = cls.__new__(cls)
+        self._bind(app)
+        self._init_retry(retry_delay, max_retry_count, retry_policy)
+        return self
+
+    def __del__(self):
+        if getattr(self, '_cookie', None) is not None:
+            with suppress(Exception):
+                _git().RevokeInterfaceFromGlobal(self._cookie)
+
+    def _bind(self, app):
+        self._owner = threading.get_ident()
+        self._owned = app
+        self._proxies = threading.local()
+
+        # Objects which are not of COM, e.g. fakes of tests, are shared as is.
+        oleobj = getattr(app, '_oleobj_', None)
+        self._cookie = None if oleobj is None else \
+            _git().RegisterInterfaceInGlobal(oleobj, pythoncom.IID_IDispatch)
 
-        self.retry_delay = retry_delay
-        self.max_retry_count = max_retry_count
+    @property
+    def _acad(self):
+        """The application object, or its proxy for the current thread."""
+        if self._cookie is None or threading.get_ident() == self._owner:
+            return self._owned
+
+        proxy = getattr(self._proxies, 'app', None)
+        if proxy is None:
+            with suppress(pythoncom.com_error):  # already in another mode
+                pythoncom.CoInitialize()
+            proxy = self._proxies.app = com.Dispatch(
+                _git().GetInterfaceFromGlobal(
+                    self._cookie, pythoncom.IID_IDispatch))
+        return proxy
+
+    def _init_retry(self, retry_delay, max_retry_count, retry_policy):
+        if retry_policy is None:
+            if retry_delay is None and max_retry_count is None:
+                retry_policy = AdaptiveRetryPolicy()
+            else:
+                retry_policy = FixedRetryPolicy(
+                    0.1 if retry_delay is None else retry_delay,
+                    20 if max_retry_count is None else max_retry_count)
+
+        self.retry_policy = retry_policy
+        self.retry_stats = RetryStats()
 
     @property
     def app(self):
         return self._acad
 
+    def is_alive(self) -> bool:
+        """Whether the AutoCAD process still answers COM calls, even busy."""
+        try:
+            _ = self._acad.Name
+        except pythoncom.com_error as com_err:
+            return com_err.hresult == RPC_E_CALL_REJECTED
+        except Exception:
+            return False
+        return True
+
+    def quit(self):
+        """Quit the AutoCAD process, discarding changes of its documents."""
+        with suppress(Exception):
+            for doc in list(self._acad.Documents):
+                doc.Close(False)
+        with suppress(Exception):
+            self._acad.Quit()
+
     @retryable
     def show(self):
         try:
@@ -110,6 +188,10 @@ class ComAcad:
         cmd = self.buildcmd('SACAD_DOCOP', skey)
         self.sendcmd(cmd)
 
+    def serve(self, skey: str, idle_timeout: float):
+        cmd = self.buildcmd('SACAD_SERVE', skey, str(idle_timeout))
+        self.sendcmd(cmd)
+
     @staticmethod
     def buildcmd(*args):
         argstr = '" "'.join(args)
@@ -134,3 +216,9 @@ class ComAcad:
 
     def get_real(self, prompt='Please input a real number: '):
         return self._acad.ActiveDocument.Utility.GetReal(prompt)
+
+
+def _git():
+    return pythoncom.CoCreateInstance(
+        pythoncom.CLSID_StdGlobalInterfaceTable, None,
+        pythoncom.CLSCTX_INPROC_SERVER, pythoncom.IID_IGlobalInterfaceTable)
@@ -15,5 +15,24 @@ __all__ = []
 
 dll_location = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dll')
 
+# Results of environment discovery (AutoCAD installations, DLL folders) are
+# cached in this file, None to disable the file cache.
+env_cache_file = os.path.join(
+    os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'),
+    'sacad', 'env_cache.json')
+
 connection_timeout_seconds = 10
+# Seconds to wait for the connection of an already loaded SacadMgd, before
+# loading it by NETLOAD, when opening a session with netload=None.
+connection_probe_timeout_seconds = 1
 request_timeout_seconds = 10
+# Bytes of each chunk of a request sent in pieces, e.g. entities inserted
+# lazily.
+stream_chunk_bytes = 64 * 1024
+
+# Seconds of inactivity after which the serving loop started by SACAD_SERVE
+# returns control to AutoCAD.
+serve_idle_timeout_seconds = 30
+# Safety margin applied on the Python side before reusing a serving loop, so
+# that requests are never sent to a loop which may have just timed out.
+serve_expiry_margin_seconds = 1
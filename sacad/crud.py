@@ -9,30 +9,61 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
+import asyncio
+import dataclasses
+import itertools
+
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import IntEnum
 from functools import cached_property
-from typing import List, Dict, Iterable, Optional, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    List,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+    cast,
+)
 
 from sacad.acdb import (
+    BlockTableRecord,
     Database,
     DBObject,
+    Entity,
     ObjectId,
     Group,
     MODEL_SPACE,
 )
 from sacad.acge import Vector3d
-from sacad.error import AcadTcpError
-from sacad.jsonify import Jsonify
+from sacad.aggregate import Aggregate, GroupKey
+from sacad.cache import TableCache
+from sacad.error import AcadTcpError, QueryError
+from sacad.filters import EntityFilter, of_type
+from sacad.jsonify import Fragment, Jsonify, Stream
+from sacad.projection import Projection
 from sacad.result import (
     Result,
+    Status,
     DBInsertResult,
     DBSelectResult,
+    DBUpdateResult,
     DBDeleteResult,
+    DBCompoundResult,
 )
-from sacad.session import Session
+from sacad.tracking import ChangeTracker
 from sacad.util import csharp_polymorphic_type
 
+if TYPE_CHECKING:
+    from sacad.batch import EntityBatch
+    from sacad.session import Session
+
 __all__ = [
     'ZoomMode',
     'SelectMode',
@@ -42,8 +73,13 @@ __all__ = [
     'DBInsertQuery',
     'DBSelect',
     'DBSelectQuery',
+    'DBUpdate',
+    'DBUpdateQuery',
     'DBDelete',
     'DBDeleteQuery',
+    'DBCompound',
+    'DBCompoundQuery',
+    'split_insert_query',
 ]
 
 
@@ -58,6 +94,14 @@ class SelectMode(IntEnum):
     GET_USER_SELECTION = 1
     TEST_ENTITIES = 2
     GET_GROUPS = 3
+    # Entities of model space selected by DBSelectQuery.region, see
+    # sacad.region.
+    WINDOW = 4
+    CROSSING = 5
+    FENCE = 6
+    # Entities of model space aggregated into DBSelectResult.rows, see
+    # sacad.aggregate.
+    AGGREGATE = 7
 
 
 class TableFlags(IntEnum):
@@ -70,6 +114,15 @@ class TableFlags(IntEnum):
     BLOCKS = 0x40
 
 
+# Symbol tables compared with the ones cached by DBInsert with upsert.
+_DIFF_TABLES = [
+    (TableFlags.TEXT_STYLE, 'text_style_table'),
+    (TableFlags.LINETYPE, 'linetype_table'),
+    (TableFlags.LAYER, 'layer_table'),
+    (TableFlags.DIM_STYLE, 'dim_style_table'),
+]
+
+
 @dataclass
 class DBQuery(Jsonify):
     database: Database = field(default_factory=Database)
@@ -83,6 +136,15 @@ class DBInsertQuery(DBQuery):
     zoom_mode: Optional[ZoomMode] = None
     zoom_factor: Optional[float] = None
 
+    # Report the indices of model space entities which failed to be inserted,
+    # in DBInsertResult.failed_entities.
+    report_failed_entities: Optional[bool] = None
+
+    # Entities of model space to be appended to groups already existing in
+    # the drawing, by group name, e.g. the groups inserted by an earlier
+    # chunk of split_insert_query.
+    grouping: Optional[Dict[str, List[ObjectId]]] = None
+
 
 @dataclass
 class DBSelectQuery(DBQuery):
@@ -104,14 +166,74 @@ class DBSelectQuery(DBQuery):
     # Observed by SelectMode.GET_USER_SELECTION.
     select_by_prompt: Optional[bool] = None
 
+    # Corners of a rectangle, or vertices of a polygon for SelectMode.WINDOW
+    # and SelectMode.CROSSING, or points of a polyline for SelectMode.FENCE.
+    region: Optional[List[Vector3d]] = None
+
+    # Entities of model space (TableFlags.MODEL_SPACE), of the user selection,
+    # of groups and of regions are selected only if they pass the filter,
+    # which is built by the functions of sacad.filters.
+    filter: Optional[EntityFilter] = None
+
+    # Observed by SelectMode.AGGREGATE, entities are grouped by the values of
+    # the keys, and aggregated by the functions into a row of each group.
+    group_by: Optional[List[GroupKey]] = None
+    aggregates: Optional[List[Aggregate]] = None
+
+    # Entities selected into model space are sent back with only the fields
+    # of the projection, which is built by the functions of sacad.projection.
+    projection: Optional[Projection] = None
+
+    # Entities selected into model space are sent back in pages of at most
+    # this number, by all modes except SelectMode.TEST_ENTITIES. Use
+    # DBSelect.pages rather than setting these fields.
+    page_size: Optional[int] = None
+
+    # Continuation token of the previous page, None for the first page.
+    cursor: Optional[str] = None
+
+    # Versions of symbol tables cached by the client, by names of fields of
+    # Database. Symbol tables of the same versions are not sent back by
+    # SelectMode.GET_TABLES. Use the cache of DBSelect rather than this.
+    table_versions: Optional[Dict[str, str]] = None
+
+
+@dataclass
+class DBUpdateQuery(DBQuery):
+    # Entities of model space (of database) are patches, each of which is
+    # applied to the entity of its id, with only the fields not None.
+
+    # Fields of values not None are assigned to all entities of model space
+    # passing the filter, or to all of them if there is no filter. Only the
+    # number of them is sent back.
+    filter: Optional[EntityFilter] = None
+    values: Optional[Entity] = None
+
 
 @dataclass
 class DBDeleteQuery(DBQuery):
     delete_group_entities: Optional[bool] = None
 
+    # Ids of entities to be deleted, the same as entities (with ids) of the
+    # block table of database, but much smaller to send.
+    entity_ids: Optional[List[ObjectId]] = None
+
+    # Entities of model space passing the filter, and in the region by mode
+    # (SelectMode.WINDOW if None, CROSSING or FENCE), are deleted. Nothing is
+    # deleted by them if both filter and region are None.
+    filter: Optional[EntityFilter] = None
+    mode: Optional[SelectMode] = None
+    region: Optional[List[Vector3d]] = None
+
+
+@dataclass
+class DBCompoundQuery(DBQuery):
+    # Executed in order, within one request and one document lock.
+    queries: List[DBQuery] = field(default_factory=list)
+
 
 class DBOperator:
-    def __init__(self, session: Session, query: DBQuery):
+    def __init__(self, session: 'Session', query: DBQuery):
         self._session = session
         self._query = query
 
@@ -127,8 +249,10 @@ class DBOperator:
         self._session.cancel_request()
 
     def submit(self) -> Result:
+        return self._send(self._query.serialize())
+
+    def _send(self, request: Union[str, Iterable[str]]) -> Result:
         try:
-            request = self._query.serialize()
             if not self._session.is_alive():
                 self._session.open()
             return Jsonify.deserialize(self._session.db_operation(request))
@@ -138,8 +262,16 @@ class DBOperator:
 
 
 class DBInsert(DBOperator):
-    def __init__(self, session: Session, query: DBInsertQuery):
+    def __init__(self, session: 'Session', query: DBInsertQuery,
+                 cache: Optional[TableCache] = None):
+        """
+        :param cache: with DBInsertQuery.upsert, records of layers, linetypes,
+                      text styles and dim styles are compared with the tables
+                      of the cache, which are refreshed first, and only the
+                      ones missing or different are sent.
+        """
         super().__init__(session, query)
+        self._cache = cache
 
     @cached_property
     def model_space(self) -> 'ListInsertProxy':
@@ -166,13 +298,122 @@ class DBInsert(DBOperator):
     def text_style_table(self) -> 'DictInsertProxy':
         return DictInsertProxy(self._query.database.text_style_table)
 
-    def submit(self) -> DBInsertResult:
-        return cast(DBInsertResult, super().submit())
+    def submit(self, chunk_size: Optional[int] = None) -> DBInsertResult:
+        """
+        Submit the transaction.
+
+        :param chunk_size: split the transaction into chunks of about this
+                           number of records and entities, which are executed
+                           one after another, so that a huge transaction does
+                           not lock the document for too long. The next chunk
+                           is serialized while the current one is executed.
+                           Note that ZoomMode.ADDED only covers the entities
+                           of the last chunk then.
+        """
+        if self._cache is None or not self._query.upsert:
+            return self._submit(chunk_size)
+
+        db = self._query.database
+        declared = {name: getattr(db, name) for _, name in _DIFF_TABLES}
+        num_unchanged = self._drop_unchanged()
+        try:
+            result = self._submit(chunk_size)
+        finally:
+            for name, table in declared.items():
+                setattr(db, name, table)
+        result.num_unchanged = num_unchanged
+        return result
+
+    def _drop_unchanged(self) -> int:
+        """
+        Replace the symbol tables of the query with ones without the records
+        same as the tables of AutoCAD, after the cache is refreshed.
+        """
+        db = self._query.database
+        flags = 0
+        for flag, name in _DIFF_TABLES:
+            if getattr(db, name):
+                flags |= flag
+        if not flags:
+            return 0
+
+        refreshed = DBSelect(self._session, DBSelectQuery(
+            mode=SelectMode.GET_TABLES, table_flags=flags),
+            cache=self._cache).submit()
+        if refreshed.status == Status.FAILURE:
+            return 0
+
+        num_unchanged = 0
+        for _, name in _DIFF_TABLES:
+            table = getattr(db, name)
+            changed = {k: r for k, r in table.items()
+                       if not self._cache.is_unchanged(name, k, r)}
+            num_unchanged += len(table) - len(changed)
+            setattr(db, name, changed)
+        return num_unchanged
+
+    def _submit(self, chunk_size: Optional[int]) -> DBInsertResult:
+        lazy = any(isinstance(e, Stream)
+                   for b in self._query.database.block_table.values()
+                   if isinstance(b, BlockTableRecord) for e in b.entities)
+        if lazy:
+            if chunk_size is not None:
+                raise ValueError('Entities inserted lazily cannot be '
+                                 'submitted in chunks.')
+            return cast(DBInsertResult,
+                        self._send(self._query.serialize_iter()))
+
+        if chunk_size is None:
+            return cast(DBInsertResult, super().submit())
+
+        merged = DBInsertResult()
+        chunks = split_insert_query(self._query, chunk_size)
+        insertion_point = None
+        offset = 0
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            chunk = next(chunks)
+            request = executor.submit(chunk.serialize)
+            while chunk is not None:
+                payload = request.result()
+                next_chunk = next(chunks, None)
+
+                # The insertion point prompted by the first chunk is needed
+                # to serialize the next one.
+                prompting = chunk.prompt_insertion_point
+                if prompting:
+                    result = cast(DBInsertResult, self._send(payload))
+                    insertion_point = result.user_insertion_point
+                if next_chunk is not None:
+                    if insertion_point is not None:
+                        next_chunk.insertion_point = insertion_point
+                    request = executor.submit(next_chunk.serialize)
+                if not prompting:
+                    result = cast(DBInsertResult, self._send(payload))
+
+                _merge_insert_result(merged, result, offset)
+                if result.status == Status.UNKNOWN:
+                    # Unhandled exception, e.g. prompt cancelled by user.
+                    request.cancel()
+                    return merged
+
+                offset += Fragment.count_in(
+                    _model_space_entities(chunk.database))
+                chunk = next_chunk
+
+        merged.resolve_status()
+        return merged
 
 
 class DBSelect(DBOperator):
-    def __init__(self, session: Session, query: DBSelectQuery):
+    def __init__(self, session: 'Session', query: DBSelectQuery,
+                 cache: Optional[TableCache] = None):
+        """
+        :param cache: symbol tables cached, which are not sent back unless
+                      they have been changed.
+        """
         super().__init__(session, query)
+        self._cache = cache
 
     @cached_property
     def tested_entities(self) -> 'ListInsertProxy':
@@ -180,11 +421,156 @@ class DBSelect(DBOperator):
             self._query.database.get_block(MODEL_SPACE).entities)
 
     def submit(self) -> DBSelectResult:
-        return cast(DBSelectResult, super().submit())
+        if self._cache is None or self._query.mode != SelectMode.GET_TABLES:
+            return cast(DBSelectResult, super().submit())
+
+        query = dataclasses.replace(
+            self._query, table_versions=self._cache.versions())
+        result = cast(DBSelectResult, self._send(query.serialize()))
+        self._cache.merge(result)
+        return result
+
+    def pages(self, page_size: int) -> Iterator[DBSelectResult]:
+        """
+        Submit the transaction page by page, each of which holds at most
+        page_size entities of model space, while symbol tables, blocks and
+        groups are only selected with the first page.
+
+        Each page is selected in a transaction of its own, so the drawing may
+        be modified between pages. A page resumes right after the last entity
+        of the previous one, so entities selected behind it, e.g. appended to
+        model space, are still selected, while the ones erased are not. If
+        the last entity itself has been erased, or is selected no more, the
+        page fails, which ends the iteration.
+
+        The symbol tables of the first page go through the cache, as the ones
+        of submit do.
+        """
+        if page_size < 1:
+            raise ValueError('page_size must be positive.')
+
+        query = dataclasses.replace(
+            self._query, page_size=page_size, cursor=None)
+        cached = self._cache is not None \
+            and query.mode == SelectMode.GET_TABLES
+        if cached:
+            query.table_versions = self._cache.versions()
+
+        while True:
+            page = cast(DBSelectResult, self._send(query.serialize()))
+            if cached and query.cursor is None:
+                self._cache.merge(page)
+            yield page
+            if page.status == Status.FAILURE or page.cursor is None:
+                return
+            query.cursor = page.cursor
+
+    def iter_entities(self, page_size: int = 1000) -> Iterator[Entity]:
+        """
+        Entities of model space selected, fetched by pages.
+
+        :raise QueryError: if any page fails.
+        """
+        for page in self.pages(page_size):
+            yield from _entities_of(page)
+
+    async def aiter_entities(
+            self, page_size: int = 1000) -> AsyncIterator[Entity]:
+        """
+        The same as iter_entities, except that pages are fetched by a thread
+        of their own, so that the event loop is never blocked. The session is
+        driven by that single thread, through a COM proxy of it (see
+        ComAcad).
+        """
+        loop = asyncio.get_running_loop()
+        pages = self.pages(page_size)
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            while True:
+                page = await loop.run_in_executor(executor, next, pages, None)
+                if page is None:
+                    return
+                for entity in _entities_of(page):
+                    yield entity
+        finally:
+            executor.shutdown(wait=False)
+
+
+class DBUpdate(DBOperator):
+    def __init__(self, session: 'Session', query: DBUpdateQuery):
+        super().__init__(session, query)
+        self._tracker = ChangeTracker()
+
+    @property
+    def tracker(self) -> ChangeTracker:
+        return self._tracker
+
+    def track(self, *entities: Entity) -> 'DBUpdate':
+        """
+        Track entities selected from AutoCAD, so that the fields changed
+        afterwards are sent by submit, e.g.
+
+            op.track(*entities)
+            entities[0].color_index = 1
+            op.submit()
+        """
+        self._tracker.track(*entities)
+        return self
+
+    def patch(self, ids: Union[ObjectId, Iterable[ObjectId]],
+              entity_type: Type[Entity] = Entity, **fields) -> 'DBUpdate':
+        """
+        Patch entities of the ids with the fields, e.g. ids selected with
+        sacad.projection.ids_only, without any entity object.
+
+        :param entity_type: type of the entities, only needed for the fields
+                            not of Entity, e.g. Line for start_point.
+        """
+        ids = [ids] if isinstance(ids, int) else ids
+        self._query.database.get_block(MODEL_SPACE).entities.extend(
+            entity_type(id=eid, **fields) for eid in ids)
+        return self
+
+    def assign(self, filter: Optional[EntityFilter],
+               entity_type: Type[Entity] = Entity, **fields) -> 'DBUpdate':
+        """
+        Assign the fields to all entities passing the filter, e.g. move
+        everything on layer A to layer B, without sending any entity:
+
+            op.assign(on_layer('A'), layer='B')
+            op.assign(None, Dimension, linetype_scale=2.0)
+
+        :param entity_type: only entities of the type, and of its subclasses,
+                            are assigned.
+        """
+        if entity_type is not Entity:
+            narrowed = of_type(entity_type)
+            filter = narrowed if filter is None else filter & narrowed
+        self._query.filter = filter
+        self._query.values = entity_type(**fields)
+        return self
+
+    def submit(self) -> DBUpdateResult:
+        """
+        Submit the patches and the changes of tracked entities, which are
+        applied in one transaction. Tracked entities are taken as unchanged
+        afterwards, unless the transaction fails.
+        """
+        entities = self._query.database.get_block(MODEL_SPACE).entities
+        num_patches = len(entities)
+        entities.extend(self._tracker.patches())
+        try:
+            result = cast(DBUpdateResult, super().submit())
+        finally:
+            del entities[num_patches:]
+
+        if result.status != Status.FAILURE:
+            self._tracker.commit()
+        return result
 
 
 class DBDelete(DBOperator):
-    def __init__(self, session: Session, query: DBDeleteQuery):
+    def __init__(self, session: 'Session', query: DBDeleteQuery):
         super().__init__(session, query)
 
     def delete_group(self, name: Union[str, List[str]]):
@@ -195,10 +581,170 @@ class DBDelete(DBOperator):
                 continue
             db.group_dict[n] = Group()
 
+    def delete_entities(self, ids: Iterable[ObjectId]) -> 'DBDelete':
+        """Delete the entities of the ids, e.g. selected by ids_only."""
+        if self._query.entity_ids is None:
+            self._query.entity_ids = []
+        self._query.entity_ids.extend(ids)
+        return self
+
+    def delete_where(self, filter: Optional[EntityFilter],
+                     region: Optional[Sequence[Vector3d]] = None,
+                     mode: SelectMode = SelectMode.WINDOW) -> 'DBDelete':
+        """
+        Delete the entities of model space passing the filter, and in the
+        region if given, e.g. to clear an area before it is regenerated:
+
+            op.delete_where(on_layer('GEN-*'),
+                            [Vector3d(0, 0), Vector3d(9, 9)])
+
+        :param mode: SelectMode.WINDOW, CROSSING or FENCE for the region.
+        """
+        if filter is None and region is None:
+            raise ValueError('Filter or region expected.')
+        if region is not None and mode not in (
+                SelectMode.WINDOW, SelectMode.CROSSING, SelectMode.FENCE):
+            raise ValueError(f'{mode!r} is not a mode of regions.')
+        self._query.filter = filter
+        self._query.region = None if region is None else list(region)
+        self._query.mode = None if region is None else mode
+        return self
+
     def submit(self) -> DBDeleteResult:
         return cast(DBDeleteResult, super().submit())
 
 
+class DBCompound(DBOperator):
+    def __init__(self, session: 'Session', query: DBCompoundQuery):
+        super().__init__(session, query)
+
+    def add(self, op: Union[DBOperator, DBQuery]) -> 'DBCompound':
+        """
+        Append an operation, which is executed after the ones added before.
+
+        :param op: an operator (e.g. returned by Acad.db_insert) or a query.
+                   Only its query is taken, so submitting the operator itself
+                   later is still possible.
+        """
+        query = op.query if isinstance(op, DBOperator) else op
+        self._query.queries.append(query)
+        return self
+
+    def submit(self) -> DBCompoundResult:
+        return cast(DBCompoundResult, super().submit())
+
+
+def split_insert_query(query: DBInsertQuery,
+                       chunk_size: int) -> Iterator[DBInsertQuery]:
+    """
+    Split an insertion query into chunks, to be executed in order.
+
+    The first chunk contains all symbol tables, dictionaries and blocks, then
+    model space entities are spread over the chunks. The later chunks refer to
+    the groups created by the first one by name (DBInsertQuery.grouping), so
+    that every record is inserted (or updated) only once. Only the first chunk
+    prompts for the insertion point, and only the last one zooms.
+
+    :param chunk_size: number of records (counting entities of blocks) and
+                       entities of each chunk, except that the first chunk may
+                       be bigger because of blocks.
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive.')
+
+    db = query.database
+    model_space = db.block_table.get(MODEL_SPACE)
+    entities = model_space.entities if model_space is not None else []
+    blocks = {k: v for k, v in db.block_table.items() if k != MODEL_SPACE}
+
+    head_size = sum(_block_size(b) for b in blocks.values()) + sum(
+        len(t) for t in (db.dim_style_table, db.layer_table,
+                         db.linetype_table, db.text_style_table,
+                         db.m_leader_style_dict, db.group_dict))
+
+    # Fragments of several entities are never split.
+    bounds = [0]
+    size, limit = 0, max(chunk_size - head_size, 0)
+    for i, entity in enumerate(entities):
+        n = Fragment.count_in([entity])
+        if size + n > limit and (size > 0 or len(bounds) == 1 and head_size):
+            bounds.append(i)
+            size, limit = 0, chunk_size
+        size += n
+    bounds.append(len(entities))
+
+    options: Dict[str, Any] = {'zoom_mode': None, 'zoom_factor': None}
+    for i, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        if i + 1 == len(bounds) - 1:
+            options = {}
+
+        chunk_db = Database()
+        if model_space is not None:
+            chunk_db.block_table[MODEL_SPACE] = dataclasses.replace(
+                model_space, entities=entities[start:end])
+
+        if i == 0:
+            chunk_db.block_table.update(blocks)
+            chunk_db.dim_style_table = db.dim_style_table
+            chunk_db.layer_table = db.layer_table
+            chunk_db.linetype_table = db.linetype_table
+            chunk_db.text_style_table = db.text_style_table
+            chunk_db.m_leader_style_dict = db.m_leader_style_dict
+            chunk_db.group_dict = db.group_dict
+        else:
+            # Groups are already created by the first chunk.
+            ids = set()
+            for e in entities[start:end]:
+                if isinstance(e, Fragment):
+                    ids.update(e.ids)
+                elif e.id is not None:
+                    ids.add(e.id)
+            grouping: Dict[str, List[ObjectId]] = {}
+            for name, eids in itertools.chain(
+                    ((g.name, g.entity_ids) for g in db.group_dict.values()),
+                    (query.grouping or {}).items()):
+                refs = [eid for eid in eids or [] if eid in ids]
+                if refs:
+                    grouping.setdefault(name, []).extend(refs)
+            options['grouping'] = grouping or None
+            options['prompt_insertion_point'] = None
+
+        yield dataclasses.replace(query, database=chunk_db, **options)
+
+
+def _model_space_entities(db: Database) -> List[DBObject]:
+    block = db.block_table.get(MODEL_SPACE)
+    return block.entities if block is not None else []
+
+
+def _entities_of(page: DBSelectResult) -> List[Entity]:
+    if page.status == Status.FAILURE:
+        raise QueryError(page.message)
+    return _model_space_entities(page.db) if page.db is not None else []
+
+
+def _block_size(block: Union[BlockTableRecord, Fragment]) -> int:
+    if isinstance(block, Fragment):
+        return block.count
+    return Fragment.count_in(block.entities) + 1
+
+
+def _merge_insert_result(merged: DBInsertResult, result: DBInsertResult,
+                         offset: int):
+    merged.num_inserted += result.num_inserted
+    merged.num_updated += result.num_updated
+    merged.num_failure += result.num_failure
+    merged.status = result.status
+    merged.message = merged.message or result.message
+
+    if result.user_insertion_point is not None:
+        merged.user_insertion_point = result.user_insertion_point
+
+    if result.failed_entities is not None:
+        merged.failed_entities = (merged.failed_entities or []) + [
+            i + offset for i in result.failed_entities]
+
+
 class ListInsertProxy:
     def __init__(self, objects: List[DBObject]):
         self._lst = objects
@@ -211,8 +757,31 @@ class ListInsertProxy:
         self.insert(dbobj)
         return dbobj.id
 
-    def insert_many(self, dbobjs: Iterable[DBObject]):
-        self._lst.extend(dbobjs)
+    def insert_many(self, dbobjs: Iterable[DBObject], lazy=False):
+        """
+        Insert objects, or fragments of them.
+
+        :param lazy: keep the iterable (e.g. a generator) as is, whose objects
+                     are then drawn only while DBInsert.submit is sending the
+                     request, a chunk at a time, instead of all of them being
+                     held in memory before. The iterable is consumed by the
+                     submission, which cannot be split into chunks then.
+        """
+        if lazy:
+            self._lst.append(Stream(dbobjs))
+        else:
+            self._lst.extend(dbobjs)
+
+    def insert_fragment(self, fragment: Fragment):
+        """Insert objects already serialized, e.g. by FragmentPool."""
+        self._lst.append(fragment)
+
+    def insert_batch(self, batch: 'EntityBatch', fragment_size=10000):
+        """
+        Insert the entities of a columnar batch, serialized directly from its
+        columns into fragments of at most fragment_size entities.
+        """
+        self._lst.extend(batch.to_fragments(fragment_size))
 
 
 class DictInsertProxy:
@@ -231,6 +800,12 @@ class DictInsertProxy:
         for o in dbobjs:
             self.insert(o)
 
+    def insert_fragment(self, fragment: Fragment):
+        """Insert an object already serialized, e.g. by FragmentPool."""
+        if fragment.count != 1 or len(fragment.names) != 1:
+            raise ValueError('Fragment of exactly one named object expected.')
+        self._dic[fragment.names[0]] = fragment
+
 
 # Syntactic sugar of @decorator may somehow break the code completion of IDE
 # (e.g. PyCharm) on @dataclass.
@@ -239,5 +814,9 @@ DBInsertQuery = csharp_polymorphic_type("SacadMgd.DbInsertQuery, SacadMgd")(
     DBInsertQuery)
 DBSelectQuery = csharp_polymorphic_type("SacadMgd.DbSelectQuery, SacadMgd")(
     DBSelectQuery)
+DBUpdateQuery = csharp_polymorphic_type("SacadMgd.DbUpdateQuery, SacadMgd")(
+    DBUpdateQuery)
 DBDeleteQuery = csharp_polymorphic_type("SacadMgd.DbDeleteQuery, SacadMgd")(
     DBDeleteQuery)
+DBCompoundQuery = csharp_polymorphic_type(
+    "SacadMgd.DbCompoundQuery, SacadMgd")(DBCompoundQuery)
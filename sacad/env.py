@@ -9,12 +9,13 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
+import json
 import os
-import winreg
+import threading
 
 from sacad import config
 
-from typing import List, Optional
+from typing import Any, List, Optional
 
 __all__ = [
     'available_acad',
@@ -58,20 +59,19 @@ ACAD_VERSION_NAME_MAP = {
 }
 
 
-def available_acad() -> List[str]:
-    versions = []
+ACAD_REGKEY = r'SOFTWARE\Autodesk\AutoCAD'
 
-    try:
-        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
-                            r'SOFTWARE\Autodesk\AutoCAD') as regkey:
-            while True:
-                versions.append(winreg.EnumKey(regkey, len(versions)))
-    except OSError as e:
-        if e.winerror != 259:  # ERROR_NO_MORE_ITEMS
-            raise e
 
-    return [ACAD_VERSION_NAME_MAP[k] for k in ACAD_VERSION_NAME_MAP if
-            k in versions]
+def available_acad() -> List[str]:
+    stamp = _registry_stamp()
+    names = _cache.get('available_acad', stamp)
+    if names is None:
+        versions = _registry_versions()
+        names = [ACAD_VERSION_NAME_MAP[k] for k in ACAD_VERSION_NAME_MAP if
+                 k in versions]
+        _cache.put('available_acad', stamp, names)
+
+    return names
 
 
 def is_implemented(name: str) -> bool:
@@ -90,8 +90,113 @@ def find_dll(name: str) -> Optional[str]:
         return
 
     startidx = acad_names_desc.index(name)
-    dllfiles = os.listdir(dllfolder)
+    dllfiles = _dll_dirs(dllfolder)
 
     for i in range(startidx, len(acad_names_desc)):
         if acad_names_desc[i] in dllfiles:
             return os.path.join(dllfolder, acad_names_desc[i], 'SacadMgd.dll')
+
+
+def _registry_versions() -> List[str]:
+    import winreg
+
+    versions = []
+
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, ACAD_REGKEY) as regkey:
+            while True:
+                versions.append(winreg.EnumKey(regkey, len(versions)))
+    except OSError as e:
+        if e.winerror != 259:  # ERROR_NO_MORE_ITEMS
+            raise e
+
+    return versions
+
+
+def _registry_stamp() -> Optional[int]:
+    import winreg
+
+    # Adding or removing a subkey updates the last write time of its parent.
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, ACAD_REGKEY) as regkey:
+            return winreg.QueryInfoKey(regkey)[2]
+    except OSError:
+        return None
+
+
+def _dll_dirs(dllfolder: str) -> List[str]:
+    try:
+        stamp = [dllfolder, os.stat(dllfolder).st_mtime_ns]
+    except OSError:
+        stamp = None
+
+    dirs = _cache.get('dll_dirs', stamp)
+    if dirs is None:
+        dirs = os.listdir(dllfolder)
+        _cache.put('dll_dirs', stamp, dirs)
+
+    return dirs
+
+
+class _EnvCache:
+    """
+    Results of environment discovery, kept in memory and in the file
+    config.env_cache_file. A result is reused only while the stamp of what
+    it was discovered from (e.g. modification time) is unchanged.
+    """
+
+    def __init__(self):
+        self._entries: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str, stamp) -> Optional[Any]:
+        if stamp is None:
+            return None
+
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is None or entry.get('stamp') != stamp:
+                return None
+            return entry.get('value')
+
+    def put(self, key: str, stamp, value):
+        if stamp is None:
+            return
+
+        with self._lock:
+            self._load()[key] = {'stamp': stamp, 'value': value}
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._save()
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            self._entries = {}
+            path = config.env_cache_file
+            if path:
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        self._entries = json.load(f)
+                except (OSError, ValueError):
+                    pass
+        return self._entries
+
+    def _save(self):
+        path = config.env_cache_file
+        if not path:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f'{path}.{os.getpid()}.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+
+_cache = _EnvCache()
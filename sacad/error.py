@@ -12,6 +12,7 @@
 __all__ = [
     'Error',
     'JsonifyError',
+    'QueryError',
     'SessionError',
     'AcadNotFoundError',
     'AcadNotSupportedError',
@@ -29,6 +30,10 @@ class JsonifyError(Error):
     pass
 
 
+class QueryError(Error):
+    pass
+
+
 class SessionError(Error):
     pass
 
@@ -0,0 +1,245 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""
+Filters of entities, evaluated by SacadMgd before entities are serialized.
+
+Filters are built by the functions of this module, and combined by `&`, `|`
+and `~`, e.g. `of_type(Line, Polyline) & on_layer('WALL*')`. The method
+match of a filter is the reference of the semantics of SacadMgd, so that
+filters can be tested without AutoCAD.
+
+Patterns of names and texts are wildcards, where `*` matches any sequence of
+characters, and `?` matches any single character.
+"""
+
+import functools
+import re
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Pattern, Type, Union
+
+from sacad.acdb import Database, DBText, Entity, MText
+from sacad.jsonify import Jsonify
+from sacad.util import csharp_polymorphic_type
+
+__all__ = [
+    'EntityFilter',
+    'AllOf',
+    'AnyOf',
+    'Not',
+    'TypeIn',
+    'LayerIn',
+    'LinetypeIn',
+    'ColorIn',
+    'TextLike',
+    'InGroups',
+    'of_type',
+    'on_layer',
+    'with_linetype',
+    'with_color',
+    'text_like',
+    'in_group',
+]
+
+# Properties of entities which are not specified, as AutoCAD defaults them.
+DEFAULT_LAYER = '0'
+DEFAULT_LINETYPE = 'ByLayer'
+DEFAULT_COLOR_INDEX = 256  # ByLayer
+
+
+@dataclass
+class EntityFilter(Jsonify):
+    def __and__(self, other: 'EntityFilter') -> 'EntityFilter':
+        return AllOf(filters=_operands(AllOf, self) + _operands(AllOf, other))
+
+    def __or__(self, other: 'EntityFilter') -> 'EntityFilter':
+        return AnyOf(filters=_operands(AnyOf, self) + _operands(AnyOf, other))
+
+    def __invert__(self) -> 'EntityFilter':
+        return Not(filter=self)
+
+    def match(self, entity: Entity, db: Optional[Database] = None) -> bool:
+        """
+        Whether the entity passes the filter, the same as SacadMgd decides.
+
+        :param db: the database of the entity, for the filters of groups.
+        """
+        raise NotImplementedError
+
+
+@dataclass
+class AllOf(EntityFilter):
+    filters: List[EntityFilter] = field(default_factory=list)
+
+    def match(self, entity: Entity, db: Optional[Database] = None) -> bool:
+        return all(f.match(entity, db) for f in self.filters)
+
+
+@dataclass
+class AnyOf(EntityFilter):
+    filters: List[EntityFilter] = field(default_factory=list)
+
+    def match(self, entity: Entity, db: Optional[Database] = None) -> bool:
+        return any(f.match(entity, db) for f in self.filters)
+
+
+@dataclass
+class Not(EntityFilter):
+    filter: Optional[EntityFilter] = None
+
+    def match(self, entity: Entity, db: Optional[Database] = None) -> bool:
+        return self.filter is not None and not self.filter.match(entity, db)
+
+
+@dataclass
+class TypeIn(EntityFilter):
+    # Full names of Python types, e.g. 'sacad.acdb.Line'.
+    types: List[str] = field(default_factory=list)
+
+    def match(self, entity: Entity, db: Optional[Database] = None) -> bool:
+        return entity._jsonify_classname() in self.types
+
+
+@dataclass
+class LayerIn(EntityFilter):
+    # Case-insensitive wildcards, like names of layers.
+    patterns: List[str] = field(default_factory=list)
+
+    def match(self, entity: Entity, db: Optional[Database] = None) -> bool:
+        return _match_any(self.patterns, entity.layer or DEFAULT_LAYER)
+
+
+@dataclass
+class LinetypeIn(EntityFilter):
+    # Case-insensitive wildcards, like names of linetypes.
+    patterns: List[str] = field(default_factory=list)
+
+    def match(self, entity: Entity, db: Optional[Database] = None) -> bool:
+        return _match_any(self.patterns,
+                          entity.linetype or DEFAULT_LINETYPE)
+
+
+@dataclass
+class ColorIn(EntityFilter):
+    # ACI colors, including 0 (ByBlock) and 256 (ByLayer).
+    color_indices: List[int] = field(default_factory=list)
+
+    def match(self, entity: Entity, db: Optional[Database] = None) -> bool:
+        return _color_index(entity) in self.color_indices
+
+
+@dataclass
+class TextLike(EntityFilter):
+    # Matched against texts of DBText and contents of MText, others never
+    # pass the filter.
+    pattern: Optional[str] = None
+    ignore_case: Optional[bool] = None
+
+    def match(self, entity: Entity, db: Optional[Database] = None) -> bool:
+        if isinstance(entity, DBText):
+            text = entity.text_string
+        elif isinstance(entity, MText):
+            text = entity.contents
+        else:
+            return False
+        return text is not None and self.pattern is not None \
+            and _wildcard(self.pattern, bool(self.ignore_case)).match(
+                text) is not None
+
+
+@dataclass
+class InGroups(EntityFilter):
+    # Entities belonging to any of the groups.
+    group_names: List[str] = field(default_factory=list)
+
+    def match(self, entity: Entity, db: Optional[Database] = None) -> bool:
+        if db is None or entity.id is None:
+            return False
+        return any(entity.id in (db.group_dict[name].entity_ids or [])
+                   for name in self.group_names if name in db.group_dict)
+
+
+def of_type(*types: Type[Entity]) -> TypeIn:
+    """Entities of any of the types, including their subclasses."""
+    names = []
+    for t in types:
+        for c in _subclasses(t):
+            if c._jsonify_classname() not in names:
+                names.append(c._jsonify_classname())
+    return TypeIn(types=names)
+
+
+def on_layer(*patterns: str) -> LayerIn:
+    return LayerIn(patterns=list(patterns))
+
+
+def with_linetype(*patterns: str) -> LinetypeIn:
+    return LinetypeIn(patterns=list(patterns))
+
+
+def with_color(*color_indices: int) -> ColorIn:
+    return ColorIn(color_indices=list(color_indices))
+
+
+def text_like(pattern: str, ignore_case=False) -> TextLike:
+    return TextLike(pattern=pattern, ignore_case=ignore_case or None)
+
+
+def in_group(*names: str) -> InGroups:
+    return InGroups(group_names=list(names))
+
+
+def _operands(cls: Type[Union[AllOf, AnyOf]],
+              f: EntityFilter) -> List[EntityFilter]:
+    return list(f.filters) if type(f) is cls else [f]
+
+
+def _subclasses(cls: type) -> List[type]:
+    result = [cls]
+    for sub in cls.__subclasses__():
+        result.extend(_subclasses(sub))
+    return result
+
+
+def _color_index(entity: Entity) -> int:
+    if entity.color_index is not None:
+        return entity.color_index
+    if entity.color is not None and entity.color.color_index is not None:
+        return entity.color.color_index
+    return DEFAULT_COLOR_INDEX
+
+
+def _match_any(patterns: List[str], name: str) -> bool:
+    return any(_wildcard(p, True).match(name) is not None for p in patterns)
+
+
+@functools.lru_cache(maxsize=256)
+def _wildcard(pattern: str, ignore_case: bool) -> Pattern:
+    regex = ''.join('.*' if c == '*' else '.' if c == '?' else re.escape(c)
+                    for c in pattern)
+    return re.compile(regex + r'\Z',
+                      re.DOTALL | (re.IGNORECASE if ignore_case else 0))
+
+
+# Syntactic sugar of @decorator may somehow break the code completion of IDE
+# (e.g. PyCharm) on @dataclass.
+
+AllOf = csharp_polymorphic_type("SacadMgd.AllOf, SacadMgd")(AllOf)
+AnyOf = csharp_polymorphic_type("SacadMgd.AnyOf, SacadMgd")(AnyOf)
+Not = csharp_polymorphic_type("SacadMgd.Not, SacadMgd")(Not)
+TypeIn = csharp_polymorphic_type("SacadMgd.TypeIn, SacadMgd")(TypeIn)
+LayerIn = csharp_polymorphic_type("SacadMgd.LayerIn, SacadMgd")(LayerIn)
+LinetypeIn = csharp_polymorphic_type("SacadMgd.LinetypeIn, SacadMgd")(
+    LinetypeIn)
+ColorIn = csharp_polymorphic_type("SacadMgd.ColorIn, SacadMgd")(ColorIn)
+TextLike = csharp_polymorphic_type("SacadMgd.TextLike, SacadMgd")(TextLike)
+InGroups = csharp_polymorphic_type("SacadMgd.InGroups, SacadMgd")(InGroups)
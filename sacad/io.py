@@ -14,10 +14,11 @@ import asyncio
 import sacad.config as config
 
 from asyncio import Future, StreamReader, StreamWriter
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from queue import SimpleQueue
 from threading import Thread
-from typing import Callable, Optional
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
 
 from sacad.error import AcadTcpError
 
@@ -28,6 +29,8 @@ class Requester:
     def __init__(self):
         self._loop = asyncio.new_event_loop()
         self._thread = Thread(target=self._loop.run_forever)
+        # Draws the pieces of chunked requests, off the event loop.
+        self._producer = ThreadPoolExecutor(max_workers=1)
 
         self._reader: Optional[StreamReader] = None
         self._writer: Optional[StreamWriter] = None
@@ -35,11 +38,16 @@ class Requester:
         self._thread.start()
 
     def open(self, host: str, port: int,
-             on_listening: Optional[Callable] = None):
+             on_listening: Optional[Callable] = None,
+             timeout: Optional[float] = None):
+        if timeout is None:
+            timeout = config.connection_timeout_seconds
+
         chan = SimpleQueue()
 
-        self._loop.call_later(config.connection_timeout_seconds,
-                              lambda: Requester._stop_listening(chan))
+        self._loop.call_soon_threadsafe(
+            self._loop.call_later, timeout,
+            lambda: Requester._stop_listening(chan))
 
         try:
             server = asyncio.run_coroutine_threadsafe(
@@ -68,9 +76,22 @@ class Requester:
     def close(self):
         asyncio.run_coroutine_threadsafe(self._stop(), self._loop)
         self._thread.join()
+        self._producer.shutdown(wait=False)
         self._reader = self._writer = None
 
-    def request(self, msg: str, encoding='utf-8') -> Future:
+    def request(self, msg: Union[str, Iterable[str]],
+                encoding='utf-8') -> Future:
+        """
+        Send a request, and get its response by the returned future.
+
+        :param msg: the request, or pieces of it, e.g. by serialize_iter,
+                    which are drawn while being sent, in the chunked framing
+                    `*\\n<length>\\n<chunk>...0\\n`. They are drawn on a
+                    worker thread, a chunk at a time, so that the event loop
+                    keeps serving other requests meanwhile. Errors raised by
+                    drawing them are raised as AcadTcpError too, since the
+                    peer has got a part of the request.
+        """
         if self.is_disconnected():
             raise AcadTcpError
 
@@ -84,11 +105,14 @@ class Requester:
         return not self._writer or self._writer.is_closing()
 
     async def _request(self, msg, encoding='utf-8'):
-        request = msg.encode(encoding)
-
         try:
-            self._writer.writelines([f'{len(request)}\n'.encode(), request])
-            await self._writer.drain()
+            if isinstance(msg, str):
+                request = msg.encode(encoding)
+                self._writer.writelines(
+                    [f'{len(request)}\n'.encode(), request])
+                await self._writer.drain()
+            else:
+                await self._write_chunked(msg, encoding)
 
             # TODO request timeout
 
@@ -100,6 +124,31 @@ class Requester:
 
         return response.decode(encoding)
 
+    async def _write_chunked(self, pieces: Iterable[str], encoding: str):
+        self._writer.write(b'*\n')
+
+        it, done = iter(pieces), False
+        while not done:
+            data, done = await self._loop.run_in_executor(
+                self._producer, Requester._next_chunk, it, encoding)
+            self._writer.write(data)
+            await self._writer.drain()
+
+    @staticmethod
+    def _next_chunk(it: Iterator[str], encoding: str) -> Tuple[bytes, bool]:
+        # Returns the next framed chunk, and whether it ends the request.
+        chunk, size = [], 0
+        for piece in it:
+            data = piece.encode(encoding)
+            chunk.append(data)
+            size += len(data)
+            if size >= config.stream_chunk_bytes:
+                return b''.join([f'{size}\n'.encode(), *chunk]), False
+
+        if size > 0:
+            chunk.insert(0, f'{size}\n'.encode())
+        return b''.join([*chunk, b'0\n']), True
+
     @staticmethod
     def _stop_listening(chan: SimpleQueue):
         chan.put((None, None))
@@ -11,13 +11,15 @@
 
 import importlib
 import json
+import re
+import uuid
 
 from enum import IntEnum
-from typing import Any, Dict, Set, TypeVar, Union
+from typing import Any, Dict, Iterable, Iterator, List, Set, TypeVar, Union
 
 from sacad.error import JsonifyError
 
-__all__ = ['Jsonify']
+__all__ = ['Jsonify', 'Fragment', 'Stream']
 
 T = TypeVar('T', bound='Jsonify')
 CLASS_KEY = '__cls__'
@@ -52,8 +54,11 @@ class Jsonify:
             return value._jsonify_to_dict()
         elif isinstance(value, dict):
             return self._jsonify_traverse_dict(value)
+        elif isinstance(value, (Fragment, Stream)):
+            return value
         elif isinstance(value, (list, tuple, set)):
-            return [self._jsonify_traverse(key, e) for e in value]
+            return [self._jsonify_traverse(key, e) for e in value
+                    if not isinstance(e, Fragment) or e.count > 0]
         elif isinstance(value, IntEnum):
             return value
         elif hasattr(value, '__dict__'):
@@ -66,7 +71,9 @@ class Jsonify:
         if clsname in Jsonify._jsonify_registry:
             return
 
-        importlib.import_module('.'.join(clsname.split('.')[:-1]))
+        modname, _, name = clsname.rpartition('.')
+        # Accessing the class defines it, if the module does so lazily.
+        getattr(importlib.import_module(modname), name, None)
 
     @staticmethod
     def _jsonify_from_jsonobj(obj):
@@ -108,7 +115,19 @@ class Jsonify:
         else:
             json_dict = self._jsonify_to_dict()
 
-        return json.dumps(json_dict, **kwargs)
+        return _dumps(json_dict, **kwargs)
+
+    def serialize_iter(self, chunk_size=1000) -> Iterator[str]:
+        """
+        Serialize into pieces of text, which joined together are the same as
+        the text of serialize. Objects of streams are drawn from their
+        iterables only while the pieces are being consumed, chunk_size objects
+        at a time, so that they never exist all at once.
+        """
+        splicer = _Splicer()
+        text = json.dumps(self._jsonify_to_dict(),
+                          default=splicer.placeholder)
+        return splicer.splice_iter(text, chunk_size)
 
     @classmethod
     def deserialize(cls: T, json_data: Union[str, bytes, bytearray]) -> T:
@@ -130,3 +149,166 @@ class Jsonify:
             if isinstance(obj, Jsonify):
                 return obj._jsonify_to_dict()
             return super().default(obj)
+
+
+class Fragment:
+    """
+    Objects already serialized, e.g. by worker processes. A fragment can be
+    put into a list (e.g. entities of a block) in place of the objects, or
+    into a dict (e.g. block table) in place of a single object, and its text
+    is spliced into the payload of the container without being encoded again.
+    """
+
+    __slots__ = ('text', 'count', 'ids', 'names')
+
+    def __init__(self, text: str, count: int, ids: List[int] = None,
+                 names: List[str] = None):
+        """
+        Initialization.
+
+        :param text: the JSON texts of the objects, separated by commas.
+        :param count: number of the objects.
+        :param ids: ids of the objects, if any, so that groups can still
+                    refer to them.
+        :param names: names of the objects, if any.
+        """
+        self.text = text
+        self.count = count
+        self.ids = ids or []
+        self.names = names or []
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(count={self.count})'
+
+    @classmethod
+    def of(cls, objects: Iterable[Jsonify], **kwargs) -> 'Fragment':
+        """Serialize objects into a fragment."""
+        objects = list(objects)
+        text = _dumps([o._jsonify_to_dict() for o in objects], **kwargs)
+        return cls(text[1:-1], len(objects),
+                   ids=[o.id for o in objects
+                        if getattr(o, 'id', None) is not None],
+                   names=[o.name for o in objects
+                          if getattr(o, 'name', None) is not None])
+
+    @staticmethod
+    def count_in(objects: Iterable) -> int:
+        """
+        Number of objects, counting the ones inside fragments, and the ones
+        drawn so far from streams.
+        """
+        return sum(o.count if isinstance(o, (Fragment, Stream)) else 1
+                   for o in objects)
+
+
+class Stream:
+    """
+    Objects drawn lazily from an iterable, e.g. a generator. A stream can be
+    put into a list in place of the objects, which are serialized only while
+    the payload is being sent, and only once.
+    """
+
+    __slots__ = ('objects', 'count')
+
+    def __init__(self, objects: Iterable):
+        """
+        Initialization.
+
+        :param objects: Jsonify objects or fragments.
+        """
+        self.objects = objects
+        self.count = 0  # number of objects drawn so far.
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(count={self.count})'
+
+    def chunks(self, chunk_size: int) -> Iterator[str]:
+        """Serialize the objects, chunk_size of them into each text."""
+        if self.objects is None:
+            raise JsonifyError('Stream cannot be serialized twice.')
+        objects, self.objects = iter(self.objects), None
+
+        while True:
+            chunk = []
+            for o in objects:
+                if isinstance(o, Fragment):
+                    if o.count > 0:
+                        chunk.append(o)
+                        self.count += o.count
+                else:
+                    chunk.append(o._jsonify_to_dict())
+                    self.count += 1
+                if len(chunk) >= chunk_size:
+                    break
+            if not chunk:
+                return
+            yield _dumps(chunk)[1:-1]
+
+
+class _Splicer:
+    """Put fragments into a JSON text, in place of placeholders."""
+
+    def __init__(self):
+        self.nonce = uuid.uuid4().hex
+        self.fragments: List[Union[Fragment, Stream]] = []
+
+    def placeholder(self, obj):
+        if not isinstance(obj, (Fragment, Stream)):
+            raise TypeError(f'Object of type {obj.__class__.__name__} '
+                            f'is not JSON serializable')
+
+        self.fragments.append(obj)
+        return f'{self.nonce}:{len(self.fragments) - 1}'
+
+    def splice(self, text: str) -> str:
+        if not self.fragments:
+            return text
+        if any(isinstance(f, Stream) for f in self.fragments):
+            return ''.join(self.splice_iter(text))
+
+        return re.sub(f'"{self.nonce}:(\\d+)"',
+                      lambda m: self.fragments[int(m.group(1))].text, text)
+
+    def splice_iter(self, text: str, chunk_size=1000) -> Iterator[str]:
+        """
+        Splice lazily, yielding the text between placeholders as is, and
+        streams chunk by chunk.
+        """
+        parts = re.split(f'"{self.nonce}:(\\d+)"', text)
+        # Whether the list of the next stream already has elements, which
+        # is unknown for a stream before it is drawn.
+        pending_comma = False
+        for i, part in enumerate(parts):
+            if i % 2 == 0:
+                if pending_comma is None and part.startswith(', '):
+                    part = part[2:]
+                pending_comma = part.endswith(', ')
+                if pending_comma:
+                    part = part[:-2]
+                if part:
+                    yield part
+                continue
+
+            fragment = self.fragments[int(part)]
+            if isinstance(fragment, Fragment):
+                if pending_comma:
+                    yield ', '
+                yield fragment.text
+                pending_comma = False
+                continue
+
+            empty = True
+            for chunk in fragment.chunks(chunk_size):
+                yield ', ' + chunk if pending_comma or not empty else chunk
+                empty = False
+            if empty:
+                # Drop the comma of either side, but not both.
+                pending_comma = None if not pending_comma else True
+            else:
+                pending_comma = False
+
+
+def _dumps(obj, **kwargs) -> str:
+    splicer = _Splicer()
+    return splicer.splice(json.dumps(obj, default=splicer.placeholder,
+                                     **kwargs))
@@ -0,0 +1,796 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""A stand-in of AutoCAD and SacadMgd, running in this process."""
+
+import base64
+import dataclasses
+import hashlib
+import itertools
+import select
+import socket
+import threading
+import time
+import uuid
+
+from queue import Empty, SimpleQueue
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from sacad.acdb import (
+    BlockTableRecord,
+    Database,
+    DimStyleTableRecord,
+    Entity,
+    LayerTableRecord,
+    LinetypeTableRecord,
+    MODEL_SPACE,
+    TextStyleTableRecord,
+)
+from sacad.acge import Vector3d
+from sacad.aggregate import Aggregate, aggregate
+from sacad.crud import (
+    DBCompoundQuery,
+    DBDeleteQuery,
+    DBInsertQuery,
+    DBQuery,
+    DBSelectQuery,
+    DBUpdateQuery,
+    SelectMode,
+    TableFlags,
+)
+from sacad.error import AcadComError
+from sacad.jsonify import Jsonify
+from sacad.result import (
+    DBCompoundResult,
+    DBDeleteResult,
+    DBInsertResult,
+    DBSelectResult,
+    DBUpdateResult,
+    Result,
+    Status,
+)
+from sacad.region import extents_of, in_crossing, in_fence, in_window
+from sacad.retry import (
+    AdaptiveRetryPolicy,
+    RetryError,
+    RetryPolicy,
+    RetryStats,
+    retryable,
+)
+from sacad.session import Session
+
+__all__ = [
+    'LoopbackAcad',
+    'LoopbackComAcad',
+    'LoopbackPeer',
+    'LoopbackSession',
+]
+
+_SYMBOL_TABLES = [
+    'text_style_table',
+    'linetype_table',
+    'layer_table',
+    'dim_style_table',
+    'm_leader_style_dict',
+]
+
+_TABLE_FLAGS = [
+    (TableFlags.TEXT_STYLE, 'text_style_table'),
+    (TableFlags.LINETYPE, 'linetype_table'),
+    (TableFlags.LAYER, 'layer_table'),
+    (TableFlags.DIM_STYLE, 'dim_style_table'),
+    (TableFlags.M_LEADER_STYLE, 'm_leader_style_dict'),
+]
+
+
+class LoopbackAcad:
+    """
+    The drawing of a stand-in AutoCAD, and the executor of queries against
+    it, shared by every connection to it.
+
+    Queries are executed the same way as SacadMgd does, as far as a drawing
+    without geometry allows: records are inserted (or updated by upsert) by
+    name, entities are given object ids, groups are maintained, and an entity
+    on a layer which does not exist fails to be inserted. Insertion points are
+    recorded but not applied, and nothing is zoomed.
+
+    Faults can be injected to exercise the client stack: a latency before
+    each response, commands rejected by a busy AutoCAD, and requests whose
+    connection is dropped without any response, before or after they are
+    executed.
+    """
+
+    def __init__(self, latency=0.0):
+        """
+        Initialization.
+
+        :param latency: seconds to wait before each response.
+        """
+        self._lock = threading.RLock()
+        self._ids = itertools.count(0x10000)
+        self._busy_commands = 0
+        self._dropped_requests = 0
+        self._dropped_responses = 0
+
+        self.database = _new_database(self._ids)
+        self._document = uuid.uuid4().hex[:8]
+        self.latency = latency
+
+        # Ids of the entities selected before SelectMode.GET_USER_SELECTION,
+        # nothing is selected if None.
+        self.selection: Optional[List[int]] = None
+
+        # Seconds spent executing requests, including their (de)serialization.
+        self.execute_seconds = 0.0
+
+        # Stand-in processes launched by sessions of new_instance, which have
+        # been neither quit nor crashed.
+        self.live_instances = 0
+
+    def reject_commands(self, count=1):
+        """Reject the next count commands as if AutoCAD was busy."""
+        with self._lock:
+            self._busy_commands += count
+
+    def drop_requests(self, count=1):
+        """Close the connection instead of answering the next count ones."""
+        with self._lock:
+            self._dropped_requests += count
+
+    def drop_responses(self, count=1):
+        """
+        Close the connection instead of answering the next count requests of
+        database operations, after executing them.
+        """
+        with self._lock:
+            self._dropped_responses += count
+
+    @property
+    def model_space(self) -> List[Entity]:
+        return self.database.get_block(MODEL_SPACE).entities
+
+    def execute(self, request: str) -> str:
+        """Execute a serialized DBQuery, the same way as SACAD_DBOP does."""
+        start_at = time.perf_counter()
+        try:
+            result = self.execute_query(Jsonify.deserialize(request))
+        except Exception as e:
+            result = Result(message=f'Unhandled exception: {e}')
+        response = result.serialize()
+
+        with self._lock:
+            self.execute_seconds += time.perf_counter() - start_at
+        return response
+
+    def execute_query(self, query: DBQuery) -> Result:
+        with self._lock:
+            if isinstance(query, DBInsertQuery):
+                return self._insert(query)
+            elif isinstance(query, DBSelectQuery):
+                return self._select(query)
+            elif isinstance(query, DBUpdateQuery):
+                return self._update(query)
+            elif isinstance(query, DBDeleteQuery):
+                return self._delete(query)
+            elif isinstance(query, DBCompoundQuery):
+                return self._compound(query)
+            raise TypeError(f'Unknown query {type(query).__name__}.')
+
+    def _take_busy_command(self) -> bool:
+        with self._lock:
+            if self._busy_commands <= 0:
+                return False
+            self._busy_commands -= 1
+            return True
+
+    def _take_dropped_request(self) -> bool:
+        with self._lock:
+            if self._dropped_requests <= 0:
+                return False
+            self._dropped_requests -= 1
+            return True
+
+    def _take_dropped_response(self) -> bool:
+        with self._lock:
+            if self._dropped_responses <= 0:
+                return False
+            self._dropped_responses -= 1
+            return True
+
+    def _insert(self, query: DBInsertQuery) -> DBInsertResult:
+        result = DBInsertResult()
+        src = query.database
+
+        for name in _SYMBOL_TABLES:
+            table = getattr(self.database, name)
+            for key, record in getattr(src, name).items():
+                if key in table and not query.upsert:
+                    continue
+                result.num_updated += key in table
+                result.num_inserted += key not in table
+                record.id = table[key].id if key in table else self._new_id()
+                table[key] = record
+
+        groups = {}
+        for key, group in src.group_dict.items():
+            old = self.database.group_dict.get(key)
+            if old is None:
+                group.id = self._new_id()
+                groups[key] = dataclasses.replace(group, entity_ids=[])
+                self.database.group_dict[key] = groups[key]
+                result.num_inserted += 1
+            else:
+                groups[key] = old
+                if query.upsert:
+                    old.selectable = group.selectable
+                    result.num_updated += 1
+
+        for key, block in src.block_table.items():
+            if key == MODEL_SPACE or not key or key[0] in '*_':
+                continue
+            if key in self.database.block_table and not query.upsert:
+                continue
+            block.id = self._new_id()
+            for entity in block.entities:
+                entity.id = self._new_id()
+            self.database.block_table[key] = block
+            result.num_inserted += 1
+
+        if query.prompt_insertion_point:
+            # Nobody picks a point, so the given one (if any) is taken.
+            result.user_insertion_point = \
+                query.insertion_point or Vector3d(0, 0, 0)
+
+        reversed_groups = {
+            eid: groups[key]
+            for key, group in src.group_dict.items()
+            for eid in group.entity_ids or []}
+        for key, eids in (query.grouping or {}).items():
+            if key in self.database.group_dict:
+                reversed_groups.update(
+                    dict.fromkeys(eids, self.database.group_dict[key]))
+
+        model_space = self.model_space
+        entities = src.block_table.get(MODEL_SPACE, BlockTableRecord()).entities
+        for i, entity in enumerate(entities):
+            if entity.layer is not None \
+                    and entity.layer not in self.database.layer_table:
+                result.num_failure += 1
+                if query.report_failed_entities:
+                    result.failed_entities = \
+                        (result.failed_entities or []) + [i]
+                continue
+
+            group = reversed_groups.get(entity.id)
+            entity.id = self._new_id()
+            model_space.append(entity)
+            if group is not None:
+                group.entity_ids.append(entity.id)
+            result.num_inserted += 1
+
+        result.resolve_status()
+        return result
+
+    def _select(self, query: DBSelectQuery) -> DBSelectResult:
+        result = DBSelectResult(db=Database())
+
+        if query.mode == SelectMode.GET_TABLES:
+            result.table_versions = self._get_tables(query, result.db)
+        elif query.mode == SelectMode.GET_USER_SELECTION:
+            if self.selection is None:
+                result.status = Status.FAILURE
+                result.message = 'None of entities is selected.'
+                return result
+            selected = set(self.selection)
+            result.db.get_block(MODEL_SPACE).entities.extend(
+                e for e in self._filter(query, self.model_space)
+                if e.id in selected)
+        elif query.mode == SelectMode.TEST_ENTITIES:
+            block = query.database.block_table.get(MODEL_SPACE)
+            if block is not None and block.entities:
+                result.db.get_block(MODEL_SPACE).entities.extend(
+                    block.entities)
+        elif query.mode == SelectMode.GET_GROUPS:
+            self._get_groups(query, result.db)
+        elif query.mode in _REGION_TESTS:
+            test = _REGION_TESTS[query.mode]
+            for e in self._filter(query, self.model_space):
+                extents = extents_of(e)
+                if extents is not None and test(extents, query.region):
+                    result.db.get_block(MODEL_SPACE).entities.append(e)
+        elif query.mode == SelectMode.AGGREGATE:
+            result.rows = aggregate(
+                self._filter(query, self.model_space), query.group_by or [],
+                query.aggregates or [Aggregate.COUNT])
+        else:
+            raise ValueError(f'Unknown select mode {query.mode}.')
+
+        if query.page_size is not None \
+                and query.mode != SelectMode.TEST_ENTITIES:
+            self._paginate(query, result)
+            if result.status == Status.FAILURE:
+                return result
+
+        if query.projection is not None:
+            block = result.db.block_table.get(MODEL_SPACE)
+            if block is not None:
+                block.entities = [query.projection.apply(e)
+                                  for e in block.entities]
+
+        result.status = Status.SUCCESS
+        return result
+
+    @staticmethod
+    def _paginate(query: DBSelectQuery, result: DBSelectResult):
+        if query.mode == SelectMode.GET_USER_SELECTION \
+                and query.explode_blocks:
+            result.status = Status.FAILURE
+            result.message = 'Exploded entities cannot be paged.'
+            return
+
+        block = result.db.block_table.get(MODEL_SPACE)
+        page = _page(block.entities if block is not None else [],
+                     query.page_size, query.cursor)
+        if page is None:
+            result.status = Status.FAILURE
+            result.message = 'The cursor is invalid or stale.'
+            return
+
+        if block is not None:
+            block.entities = page[0]
+        result.cursor = page[1]
+
+        # Symbol tables, blocks and groups are selected with the first page.
+        if query.cursor is not None:
+            result.db = Database(block_table={} if block is None
+                                 else {MODEL_SPACE: block})
+            result.table_versions = None
+
+    def _get_tables(self, query: DBSelectQuery,
+                    db: Database) -> Optional[Dict[str, str]]:
+        flags = query.table_flags or 0
+        versions = {}
+
+        if flags & TableFlags.MODEL_SPACE:
+            db.block_table[MODEL_SPACE] = BlockTableRecord(
+                name=MODEL_SPACE,
+                entities=list(self._filter(query, self.model_space)))
+
+        for flag, name in _TABLE_FLAGS:
+            if flags & flag:
+                versions[name] = self._table_version(name)
+                if versions[name] != (query.table_versions or {}).get(name):
+                    getattr(db, name).update(getattr(self.database, name))
+
+        # Like SacadMgd, an empty list of block names selects nothing.
+        if flags & TableFlags.BLOCKS and query.block_names:
+            for name in query.block_names:
+                block = self.database.block_table.get(name)
+                if block is not None and name[0] not in '*_':
+                    db.block_table[name] = block
+
+        return versions or None
+
+    def _table_version(self, name: str) -> str:
+        # The loopback has no events of AutoCAD to count changes of tables
+        # by, so a digest of the records is taken as the version instead.
+        digest = hashlib.sha1()
+        for _, record in sorted(getattr(self.database, name).items()):
+            digest.update(record.serialize().encode())
+        return f'{self._document}:{digest.hexdigest()[:16]}'
+
+    def _get_groups(self, query: DBSelectQuery, db: Database):
+        groups = [self.database.group_dict[name]
+                  for name in query.group_names or []
+                  if name in self.database.group_dict]
+
+        ids = {eid for g in groups for eid in g.entity_ids}
+        db.get_block(MODEL_SPACE).entities.extend(
+            e for e in self._filter(query, self.model_space) if e.id in ids)
+        for group in groups:
+            db.group_dict[group.name] = group
+
+    def _filter(self,
+                query: Union[DBSelectQuery, DBUpdateQuery, DBDeleteQuery],
+                entities: Iterable[Entity]) -> Iterator[Entity]:
+        if query.filter is None:
+            return iter(entities)
+        return (e for e in entities if query.filter.match(e, self.database))
+
+    def _update(self, query: DBUpdateQuery) -> DBUpdateResult:
+        result = DBUpdateResult()
+        entities = {e.id: e for e in self.model_space}
+
+        patches = query.database.block_table.get(MODEL_SPACE,
+                                                 BlockTableRecord()).entities
+        for patch in patches:
+            entity = entities.get(patch.id)
+            if entity is None or not isinstance(entity, type(patch)) \
+                    or not self._known_layer(patch):
+                result.num_failure += 1
+                continue
+            _assign(entity, patch)
+            result.num_updated += 1
+
+        if query.values is not None:
+            if self._known_layer(query.values):
+                for entity in self._filter(query, self.model_space):
+                    if isinstance(entity, type(query.values)):
+                        _assign(entity, query.values)
+                        result.num_updated += 1
+            else:
+                result.num_failure += 1
+
+        result.resolve_status()
+        return result
+
+    def _known_layer(self, entity: Entity) -> bool:
+        return entity.layer is None \
+            or entity.layer in self.database.layer_table
+
+    def _delete(self, query: DBDeleteQuery) -> DBDeleteResult:
+        result = DBDeleteResult()
+
+        ids = {e.id for block in query.database.block_table.values()
+               for e in block.entities if e.id is not None}
+        ids.update(query.entity_ids or [])
+        if query.filter is not None or query.region is not None:
+            test = _REGION_TESTS[query.mode or SelectMode.WINDOW] \
+                if query.region is not None else None
+            for e in self._filter(query, self.model_space):
+                extents = extents_of(e) if test is not None else None
+                if test is None or extents is not None \
+                        and test(extents, query.region):
+                    ids.add(e.id)
+        for key in query.database.group_dict:
+            group = self.database.group_dict.get(key)
+            if group is None:
+                continue
+            if query.delete_group_entities:
+                ids.update(group.entity_ids)
+            del self.database.group_dict[key]
+            result.num_deleted += 1
+
+        model_space = self.model_space
+        kept = [e for e in model_space if e.id not in ids]
+        result.num_deleted += len(model_space) - len(kept)
+        model_space[:] = kept
+        for group in self.database.group_dict.values():
+            group.entity_ids = [i for i in group.entity_ids if i not in ids]
+
+        result.status = Status.SUCCESS
+        return result
+
+    def _compound(self, query: DBCompoundQuery) -> DBCompoundResult:
+        result = DBCompoundResult()
+        for sub in query.queries:
+            try:
+                result.results.append(self.execute_query(sub))
+            except Exception as e:
+                result.results.append(
+                    Result(message=f'Unhandled exception: {e}'))
+
+        statuses = [r.status for r in result.results]
+        if all(s == Status.SUCCESS for s in statuses):
+            result.status = Status.SUCCESS
+        elif any(s in (Status.SUCCESS, Status.WARNING) for s in statuses):
+            result.status = Status.WARNING
+        else:
+            result.status = Status.FAILURE
+        return result
+
+    def _new_id(self) -> int:
+        return next(self._ids)
+
+
+class LoopbackPeer(threading.Thread):
+    """
+    Plays the role of SacadMgd on one connection: connects to the listener
+    of Requester, then answers the requests announced by the commands of
+    LoopbackComAcad, with the same framing as SacadMgd.
+
+    The thread ends when the connection is closed by either side.
+    """
+
+    def __init__(self, acad: LoopbackAcad, host: str, port: int):
+        super().__init__(daemon=True)
+        self.acad = acad
+        self.commands = SimpleQueue()
+        self._sock = socket.create_connection((host, port))
+        self._file = self._sock.makefile('rb')
+
+    def run(self):
+        try:
+            while True:
+                try:
+                    cmd = self.commands.get(timeout=0.1)
+                except Empty:
+                    if self._is_closed():
+                        break
+                    continue
+                if cmd is None:
+                    break
+                self._execute(*cmd)
+        except (EOFError, OSError):
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def _execute(self, name: str, arg):
+        if name == 'ping':
+            request = self._recv()
+            self._send('pong' if request == 'ping' else 'error')
+        elif name == 'dbop':
+            self._send_result(self.acad.execute(self._recv()))
+        elif name == 'docop':
+            self._recv()
+            self._send(Result().serialize())
+        elif name == 'serve':
+            self._serve(arg)
+
+    def _serve(self, idle_timeout: float):
+        self._sock.settimeout(idle_timeout)
+        try:
+            while True:
+                try:
+                    request = self._recv()
+                except socket.timeout:
+                    break
+
+                op, _, payload = request.partition('\n')
+                if op == 'stop':
+                    self._send('stop')
+                    break
+                elif op == 'ping':
+                    self._send('pong')
+                elif op == 'dbop':
+                    self._send_result(self.acad.execute(payload))
+                elif op == 'docop':
+                    self._send(Result().serialize())
+                else:
+                    break
+        finally:
+            self._sock.settimeout(None)
+
+    def _recv(self) -> str:
+        num_bytes = self._file.readline()
+        if not num_bytes:
+            raise EOFError
+        if num_bytes.strip() == b'*':
+            # Chunked framing, of a request sent in pieces.
+            chunks = []
+            while (num_bytes := self._file.readline()) and int(num_bytes):
+                chunks.append(self._file.read(int(num_bytes)))
+            if not num_bytes:
+                raise EOFError
+            request = b''.join(chunks).decode()
+        else:
+            request = self._file.read(int(num_bytes)).decode()
+
+        if self.acad._take_dropped_request():
+            raise EOFError
+        if self.acad.latency > 0:
+            time.sleep(self.acad.latency)
+        return request
+
+    def _send(self, msg: str):
+        data = msg.encode()
+        self._sock.sendall(f'{len(data)}\n'.encode() + data)
+
+    def _send_result(self, msg: str):
+        if self.acad._take_dropped_response():
+            raise EOFError
+        self._send(msg)
+
+    def _is_closed(self) -> bool:
+        # Requests are sent before their commands, so pending data is not
+        # the end of the connection.
+        readable, _, _ = select.select([self._sock], [], [], 0)
+        return bool(readable) \
+            and not self._sock.recv(1, socket.MSG_PEEK)
+
+
+class LoopbackComAcad:
+    """
+    The counterpart of ComAcad for LoopbackAcad, where every command is
+    handed over to the LoopbackPeer of the connection instead of AutoCAD.
+    """
+
+    def __init__(self, acad: LoopbackAcad,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 new_instance=False):
+        """
+        Initialization.
+
+        :param new_instance: count this as a new process launched, in
+                             LoopbackAcad.live_instances, until it is quit.
+        """
+        self.acad = acad
+        self.peer: Optional[LoopbackPeer] = None
+        self.commands: List[str] = []
+
+        self.retry_policy = retry_policy or AdaptiveRetryPolicy()
+        self.retry_stats = RetryStats()
+
+        self._launched = new_instance
+        self._alive = True
+        if new_instance:
+            with acad._lock:
+                acad.live_instances += 1
+
+    def is_alive(self) -> bool:
+        return self._alive
+
+    def quit(self):
+        self.crash()
+
+    def crash(self):
+        """End the process as if it crashed, without any notice."""
+        with self.acad._lock:
+            if self._alive and self._launched:
+                self.acad.live_instances -= 1
+            self._alive = False
+        if self.peer is not None:
+            self.peer.commands.put(None)
+            self.peer.join()
+
+    def show(self):
+        pass
+
+    def activate(self):
+        pass
+
+    def netload(self, path: str):
+        self.sendcmd(self.buildcmd('NETLOAD', path))
+
+    def connect(self, host: str, skey: str):
+        self.sendcmd(self.buildcmd('SACAD_CONNECT', host, skey))
+
+    def ping(self, skey: str):
+        self.sendcmd(self.buildcmd('SACAD_PING', skey))
+
+    def dbop(self, skey: str):
+        self.sendcmd(self.buildcmd('SACAD_DBOP', skey))
+
+    def docop(self, skey: str):
+        self.sendcmd(self.buildcmd('SACAD_DOCOP', skey))
+
+    def serve(self, skey: str, idle_timeout: float):
+        self.sendcmd(self.buildcmd('SACAD_SERVE', skey, str(idle_timeout)))
+
+    @staticmethod
+    def buildcmd(*args):
+        return list(args)
+
+    @retryable
+    def sendcmd(self, cmd):
+        if not self._alive:
+            raise AcadComError('The stand-in AutoCAD has quit.')
+        if self.acad._take_busy_command():
+            raise RetryError(None)
+
+        name, *args = cmd
+        self.commands.append(name)
+        if name == 'SACAD_CONNECT':
+            host, port = args[0].rsplit(':', 1)
+            self.peer = LoopbackPeer(self.acad, host, int(port))
+            self.peer.start()
+        elif name == 'SACAD_SERVE':
+            self.peer.commands.put(('serve', float(args[1])))
+        elif name.startswith('SACAD_'):
+            self.peer.commands.put((name[6:].lower(), None))
+
+
+class LoopbackSession(Session):
+    """
+    A session of LoopbackAcad, which drives the whole client stack (Session,
+    Requester, DBOperator...) over a real TCP connection, without AutoCAD.
+    """
+
+    def __init__(self, acad: Optional[LoopbackAcad] = None,
+                 host='127.0.0.1', port=0,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 new_instance=False):
+        """
+        Initialization.
+
+        :param acad: the stand-in AutoCAD, a new one by default.
+        :param host: hostname of the TCP listener.
+        :param port: port of the TCP listener, a free one by default.
+        :param retry_policy: policy to retry commands rejected as busy.
+        :param new_instance: every stand-in COM object created by open counts
+                             as a new process, see LoopbackAcad.live_instances.
+        """
+        self.acad = acad or LoopbackAcad()
+        super().__init__('LOOPBACK', host, port or _free_port(host),
+                         new_instance=new_instance, retry_policy=retry_policy)
+
+    def close(self):
+        com = self.com_acad
+        super().close()
+        if com is not None and com.peer is not None:
+            com.peer.join()
+
+    def _precheck(self):
+        pass
+
+    def _find_dll(self) -> str:
+        return 'SacadMgd.dll'
+
+    def _new_com(self) -> LoopbackComAcad:
+        return LoopbackComAcad(self.acad, self._retry_policy,
+                               new_instance=self._new_instance)
+
+
+def _new_database(ids: Iterator[int]) -> Database:
+    # The records which every new drawing has.
+    db = Database()
+    db.get_block(MODEL_SPACE).id = next(ids)
+    db.layer_table['0'] = LayerTableRecord(id=next(ids), name='0')
+    for name in ('ByBlock', 'ByLayer', 'Continuous'):
+        db.linetype_table[name] = LinetypeTableRecord(id=next(ids), name=name)
+    db.text_style_table['Standard'] = TextStyleTableRecord(
+        id=next(ids), name='Standard')
+    db.dim_style_table['Standard'] = DimStyleTableRecord(
+        id=next(ids), name='Standard')
+    return db
+
+
+_REGION_TESTS = {
+    SelectMode.WINDOW: in_window,
+    SelectMode.CROSSING: in_crossing,
+    SelectMode.FENCE: in_fence,
+}
+
+
+def _assign(entity: Entity, values: Entity):
+    """Assign fields of values not None to the entity, except id."""
+    for f in dataclasses.fields(values):
+        value = getattr(values, f.name)
+        if f.name == 'id' or value is None:
+            continue
+        if f.name == 'matrix':
+            entity.transform_by(value)
+        else:
+            setattr(entity, f.name, value)
+
+
+def _page(entities: List[Entity], page_size: int, cursor: Optional[str]) \
+        -> Optional[Tuple[List[Entity], Optional[str]]]:
+    """
+    The page of entities after the cursor, and the cursor of the next page,
+    or None if the cursor is invalid or stale, the same as SacadMgd does.
+    """
+    start = 0
+    if cursor is not None:
+        try:
+            after = int(base64.b64decode(cursor, validate=True))
+        except ValueError:
+            return None
+        start = next((i + 1 for i, e in enumerate(entities)
+                      if e.id == after), None)
+        if start is None:
+            return None
+
+    page = entities[start:start + page_size]
+    if len(entities) > start + page_size:
+        return page, base64.b64encode(str(page[-1].id).encode()).decode()
+    return page, None
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
@@ -0,0 +1,99 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Build and serialize objects with several processes."""
+
+import itertools
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+from sacad.jsonify import Fragment, Jsonify
+
+__all__ = [
+    'FragmentPool',
+]
+
+Builder = Callable[..., Union[Jsonify, Iterable[Jsonify]]]
+
+
+class FragmentPool:
+    """
+    Build objects and serialize them into fragments in worker processes, to
+    spread the construction of a huge payload over several CPU cores.
+
+    Fragments are inserted with insert_fragment of DBInsert.model_space,
+    DBInsert.block_table, etc., then spliced into the payload as they are.
+
+    Builders are called in worker processes, so they must be picklable, e.g.
+    functions defined at the top level of a module.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialization.
+
+        :param max_workers: number of worker processes, defaults to the
+                            number of processors.
+        """
+        self._executor = ProcessPoolExecutor(max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def submit(self, builder: Builder, *args, **kwargs) -> Future:
+        """
+        Schedule builder(*args, **kwargs), which returns an object or a list
+        of objects, in a worker process.
+
+        :return: a future resolved with the fragment of the built objects.
+        """
+        return self._executor.submit(_build, builder, args, kwargs)
+
+    def map(self, builder: Builder, *iterables) -> Iterator[Fragment]:
+        """
+        Like the builtin map, but builder is called in worker processes.
+
+        :return: fragments of the objects returned by each call, in order.
+        """
+        return self._executor.map(_build_mapped, itertools.repeat(builder),
+                                  *iterables)
+
+    def serialize(self, objects: Iterable[Jsonify],
+                  batch_size=1000) -> Iterator[Fragment]:
+        """
+        Serialize existing objects in worker processes.
+
+        Objects are sent to workers by pickle, which is much faster than
+        serializing them into JSON in this process.
+
+        :return: one fragment for each batch of objects, in order.
+        """
+        it = iter(objects)
+        batches = iter(lambda: list(itertools.islice(it, batch_size)), [])
+        return self._executor.map(Fragment.of, batches)
+
+    def close(self):
+        self._executor.shutdown()
+
+
+def _build(builder: Builder, args: tuple, kwargs: dict) -> Fragment:
+    objects = builder(*args, **kwargs)
+    if isinstance(objects, Jsonify):
+        objects = [objects]
+    return Fragment.of(objects)
+
+
+def _build_mapped(builder: Builder, *args) -> Fragment:
+    return _build(builder, args, {})
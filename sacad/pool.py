@@ -0,0 +1,282 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""A pool of sessions, each driving its own AutoCAD process."""
+
+import threading
+import time
+
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional, Tuple
+
+from sacad.constant import ACAD_LATEST
+from sacad.crud import DBOperator, DBQuery, DBSelectQuery
+from sacad.error import AcadConnectionError, SessionError
+from sacad.result import Result
+from sacad.session import Session
+
+__all__ = [
+    'SessionPool',
+    'SessionStats',
+]
+
+# (future, job, args, kwargs, idempotent)
+Job = Tuple[Future, Callable, tuple, dict, bool]
+
+
+@dataclass
+class SessionStats:
+    index: int
+    port: int
+    jobs_done: int = 0
+    jobs_failed: int = 0
+    jobs_stolen: int = 0
+    restarts: int = 0
+    queued: int = 0
+    busy_seconds: float = 0.0
+    alive_seconds: float = 0.0
+
+    @property
+    def utilisation(self) -> float:
+        if self.alive_seconds <= 0:
+            return 0.0
+        return min(self.busy_seconds / self.alive_seconds, 1.0)
+
+
+class SessionPool:
+    """
+    Schedule jobs over several sessions, to draw with several AutoCAD
+    processes in parallel since each AutoCAD process is single-threaded.
+
+    Every session is served by its own worker thread and job queue. A new job
+    is put into the shortest queue, and a worker whose queue is empty steals
+    the most recently queued job from the longest queue of the others.
+
+    A session failing to open is restarted, i.e. reset and reopened, before
+    the job runs. A job failing with AcadConnectionError causes its session to
+    be restarted too, but since AutoCAD may have executed the request before
+    the connection broke, the job is retried once with the restarted session
+    only if it is submitted as idempotent, e.g. selections. Otherwise the
+    error is raised, and the session is reopened by the next job.
+    """
+
+    def __init__(self, size: int, acad_name=ACAD_LATEST, host='127.0.0.1',
+                 base_port=48652, netload=True, sta=True,
+                 session_factory: Optional[Callable[..., Session]] = None):
+        """
+        Initialization.
+
+        :param size: number of sessions, i.e. AutoCAD processes.
+        :param acad_name: version identifier defined in constant.py.
+        :param host: hostname of TCP listeners.
+        :param base_port: port of the first session's TCP listener, the i-th
+                          session uses base_port + i.
+        :param netload: passed to Session.open when (re)opening sessions.
+        :param sta: initialize COM as single-thread apartment (STA) in each
+                    worker thread, which is required by real sessions.
+        :param session_factory: called with (acad_name, host, port) to create
+                                sessions, defaults to a Session launching a
+                                new AutoCAD process.
+        """
+        if size < 1:
+            raise ValueError('The pool needs at least one session.')
+
+        factory = session_factory or _new_instance_session
+
+        self._netload = netload
+        self._sta = sta
+        self._sessions = [factory(acad_name, host, base_port + i)
+                          for i in range(size)]
+        self._queues: List[Deque[Job]] = [deque() for _ in range(size)]
+        self._stats = [SessionStats(index=i, port=base_port + i)
+                       for i in range(size)]
+        self._started_at = [time.perf_counter()] * size
+        self._busy: List[bool] = [False] * size
+
+        self._cond = threading.Condition()
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._work, args=(i,), daemon=True)
+            for i in range(size)]
+
+        for worker in self._workers:
+            worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def submit(self, job: Callable, *args, idempotent=False,
+               **kwargs) -> Future:
+        """
+        Schedule job(session, *args, **kwargs) on one of the sessions.
+
+        :param idempotent: the job may run again after a broken connection,
+                           having maybe taken effect already.
+        :return: a future resolved with the return value of the job.
+        """
+        fut = Future()
+        with self._cond:
+            if self._closed:
+                raise SessionError('Cannot submit to a closed pool.')
+
+            index = min(range(len(self._queues)),
+                        key=lambda i: len(self._queues[i]) + self._busy[i])
+            self._queues[index].append(
+                (fut, job, args, kwargs, idempotent))
+            self._cond.notify_all()
+
+        return fut
+
+    def submit_query(self, query: DBQuery) -> Future:
+        """
+        Schedule the submission of a query on one of the sessions.
+
+        Only selections are retried after a broken connection.
+
+        :return: a future resolved with the Result of the query.
+        """
+        return self.submit(_submit_query, query,
+                           idempotent=isinstance(query, DBSelectQuery))
+
+    def map_queries(self, queries) -> List[Result]:
+        futures = [self.submit_query(q) for q in queries]
+        return [f.result() for f in futures]
+
+    def stats(self) -> List[SessionStats]:
+        """Get a snapshot of the statistics of each session."""
+        now = time.perf_counter()
+        with self._cond:
+            snapshot = []
+            for i, stats in enumerate(self._stats):
+                stats.queued = len(self._queues[i])
+                stats.alive_seconds = now - self._started_at[i]
+                snapshot.append(SessionStats(**stats.__dict__))
+            return snapshot
+
+    def close(self):
+        """
+        Wait for all queued jobs to finish, then close every session.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+
+        for worker in self._workers:
+            worker.join()
+
+    @property
+    def sessions(self) -> List[Session]:
+        return list(self._sessions)
+
+    def _work(self, index: int):
+        if self._sta:
+            import pythoncom
+            pythoncom.CoInitialize()
+
+        session = self._sessions[index]
+        try:
+            with self._cond:
+                self._started_at[index] = time.perf_counter()
+
+            while (job := self._next_job(index)) is not None:
+                self._run(index, session, job)
+        finally:
+            try:
+                session.close()
+            finally:
+                if self._sta:
+                    import pythoncom
+                    pythoncom.CoUninitialize()
+
+    def _next_job(self, index: int) -> Optional[Job]:
+        with self._cond:
+            while True:
+                if self._queues[index]:
+                    job = self._queues[index].popleft()
+                    self._busy[index] = True
+                    return job
+
+                victim = max(range(len(self._queues)),
+                             key=lambda i: len(self._queues[i]))
+                if self._queues[victim]:
+                    job = self._queues[victim].pop()
+                    self._stats[index].jobs_stolen += 1
+                    self._busy[index] = True
+                    return job
+
+                if self._closed:
+                    return None
+
+                self._cond.wait()
+
+    def _run(self, index: int, session: Session, job: Job):
+        fut, func, args, kwargs, idempotent = job
+        if not fut.set_running_or_notify_cancel():
+            self._done(index, 0.0, None)
+            return
+
+        start_at = time.perf_counter()
+        try:
+            try:
+                self._ensure_open(index, session)
+            except AcadConnectionError:
+                self._restart(index, session)
+
+            try:
+                result = func(session, *args, **kwargs)
+            except AcadConnectionError:
+                if not idempotent:
+                    session.reset()
+                    raise
+                self._restart(index, session)
+                result = func(session, *args, **kwargs)
+        except BaseException as e:
+            self._done(index, time.perf_counter() - start_at, False)
+            fut.set_exception(e)
+        else:
+            self._done(index, time.perf_counter() - start_at, True)
+            fut.set_result(result)
+
+    def _done(self, index: int, elapsed: float, succeeded: Optional[bool]):
+        with self._cond:
+            self._busy[index] = False
+            stats = self._stats[index]
+            stats.busy_seconds += elapsed
+            if succeeded is True:
+                stats.jobs_done += 1
+            elif succeeded is False:
+                stats.jobs_failed += 1
+
+    def _ensure_open(self, index: int, session: Session):
+        if session.com_acad is None:
+            session.open(netload=self._netload)
+
+    def _restart(self, index: int, session: Session):
+        with self._cond:
+            self._stats[index].restarts += 1
+
+        session.reset()
+        session.open(netload=self._netload)
+
+
+def _new_instance_session(acad_name: str, host: str, port: int) -> Session:
+    return Session(acad_name, host, port, new_instance=True)
+
+
+def _submit_query(session: Session, query: DBQuery) -> Result:
+    return DBOperator(session, query).submit()
@@ -0,0 +1,91 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""
+Projections of selected entities, so that SacadMgd serializes only the
+fields requested, e.g. `project('layer')` for ids, types and layers. Fields
+not projected are left out of the response, and decoded as their defaults.
+The method apply of a projection is the reference of the semantics of
+SacadMgd, so that projections can be tested without AutoCAD.
+
+The id of an entity, and its type, are always kept.
+"""
+
+import dataclasses
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set, Type
+
+from sacad.acdb import Entity
+from sacad.filters import of_type
+from sacad.jsonify import Jsonify
+
+__all__ = [
+    'Projection',
+    'project',
+    'ids_only',
+]
+
+
+@dataclass
+class Projection(Jsonify):
+    # Fields kept for entities of any type, or None to keep all fields.
+    fields: Optional[List[str]] = None
+
+    # Fields kept for entities of particular types, instead of fields, by
+    # full names of Python types, e.g. 'sacad.acdb.Line'.
+    type_fields: Optional[Dict[str, List[str]]] = None
+
+    # Nothing kept except ids and types.
+    ids_only: Optional[bool] = None
+
+    def fields_of(self, entity: Entity) -> Optional[Set[str]]:
+        """Names of the fields kept for the entity, or None for all."""
+        if self.ids_only:
+            return set()
+        if self.type_fields:
+            names = self.type_fields.get(entity._jsonify_classname())
+            if names is not None:
+                return set(names)
+        return None if self.fields is None else set(self.fields)
+
+    def apply(self, entity: Entity) -> Entity:
+        """The entity as it is decoded, after SacadMgd projects it."""
+        names = self.fields_of(entity)
+        if names is None:
+            return entity
+        return type(entity)(**{
+            f.name: getattr(entity, f.name)
+            for f in dataclasses.fields(entity)
+            if f.name == 'id' or f.name in names})
+
+
+def project(*fields: str,
+            types: Optional[Dict[Type[Entity], Sequence[str]]] = None) \
+        -> Projection:
+    """
+    Keep the fields of all entities, and the fields of entities of types
+    instead, including their subclasses, e.g.
+    `project('layer', types={Line: ['layer', 'start_point', 'end_point']})`.
+
+    If only types is given, entities of other types keep all fields.
+    """
+    type_fields = {}
+    for t, names in (types or {}).items():
+        for name in of_type(t).types:
+            type_fields[name] = list(names)
+    return Projection(fields=list(fields) if fields or not types else None,
+                      type_fields=type_fields or None)
+
+
+def ids_only() -> Projection:
+    """Keep nothing but ids and types of entities."""
+    return Projection(ids_only=True)
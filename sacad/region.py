@@ -0,0 +1,184 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""
+Selection of entities by regions, i.e. SelectMode.WINDOW, CROSSING and
+FENCE, which SacadMgd evaluates against the geometric extents of entities,
+projected onto the XY plane of WCS. These functions are the reference of the
+semantics of SacadMgd, so that selections can be tested without AutoCAD.
+
+A region of window or crossing is a rectangle given by two opposite corners,
+or a polygon given by three or more vertices. A region of fence is a
+polyline given by two or more points. Boundaries of regions are inclusive.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from sacad.acdb import (
+    Arc,
+    BlockReference,
+    Circle,
+    DBText,
+    Entity,
+    Extents3d,
+    Line,
+    MText,
+    Polyline,
+)
+from sacad.acge import Vector3d
+
+__all__ = [
+    'in_window',
+    'in_crossing',
+    'in_fence',
+    'extents_of',
+]
+
+_Point = Tuple[float, float]
+_Box = Tuple[float, float, float, float]  # min x, min y, max x, max y
+
+
+def in_window(extents: Extents3d, region: Sequence[Vector3d]) -> bool:
+    """Whether the extents are entirely inside the region."""
+    box, polygon = _box(extents), _polygon(region)
+    return all(_point_in_polygon(c, polygon) for c in _corners(box)) \
+        and not any(box[0] < x < box[2] and box[1] < y < box[3]
+                    for x, y in polygon) \
+        and not any(_segments_cross(a, b, c, d)
+                    for a, b in _edges(polygon, True)
+                    for c, d in _edges(_corners(box), True))
+
+
+def in_crossing(extents: Extents3d, region: Sequence[Vector3d]) -> bool:
+    """Whether the extents are inside the region, or cross its boundary."""
+    box, polygon = _box(extents), _polygon(region)
+    return any(_point_in_polygon(c, polygon) for c in _corners(box)) \
+        or any(_point_in_box(p, box) for p in polygon) \
+        or any(_segments_touch(a, b, c, d)
+               for a, b in _edges(polygon, True)
+               for c, d in _edges(_corners(box), True))
+
+
+def in_fence(extents: Extents3d, region: Sequence[Vector3d]) -> bool:
+    """Whether any segment of the fence touches the extents."""
+    box = _box(extents)
+    points = [(p.x, p.y) for p in region]
+    if len(points) < 2:
+        raise ValueError('Fence of at least 2 points expected.')
+    return any(_point_in_box(p, box) for p in points) \
+        or any(_segments_touch(a, b, c, d)
+               for a, b in _edges(points, False)
+               for c, d in _edges(_corners(box), True))
+
+
+def extents_of(entity: Entity) -> Optional[Extents3d]:
+    """
+    The geometric extents computed by AutoCAD, or an estimation of them for
+    the entities which are drawn most often. Widths, bulges and arcs are
+    ignored, except that arcs take the extents of their circles.
+    """
+    if entity.geometric_extents is not None:
+        return entity.geometric_extents
+
+    if isinstance(entity, Line):
+        points = [entity.start_point, entity.end_point]
+    elif isinstance(entity, (Arc, Circle)):
+        if entity.center is None or entity.radius is None:
+            return None
+        r = Vector3d(entity.radius, entity.radius)
+        points = [entity.center - r, entity.center + r]
+    elif isinstance(entity, Polyline):
+        points = [v.point for v in entity.vertices or []]
+    elif isinstance(entity, (DBText, BlockReference)):
+        points = [entity.position]
+    elif isinstance(entity, MText):
+        points = [entity.location]
+    else:
+        return None
+
+    points = [p for p in points if p is not None]
+    if not points:
+        return None
+    zs = [p.z if len(p) > 2 else 0.0 for p in points]
+    return Extents3d(
+        min_point=Vector3d(min(p.x for p in points), min(p.y for p in points),
+                           min(zs)),
+        max_point=Vector3d(max(p.x for p in points), max(p.y for p in points),
+                           max(zs)))
+
+
+def _box(extents: Extents3d) -> _Box:
+    lo, hi = extents.min_point, extents.max_point
+    return min(lo.x, hi.x), min(lo.y, hi.y), max(lo.x, hi.x), max(lo.y, hi.y)
+
+
+def _corners(box: _Box) -> List[_Point]:
+    x0, y0, x1, y1 = box
+    return [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+
+
+def _polygon(region: Sequence[Vector3d]) -> List[_Point]:
+    points = [(p.x, p.y) for p in region]
+    if len(points) == 2:
+        (x0, y0), (x1, y1) = points
+        return _corners((min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)))
+    if len(points) < 3:
+        raise ValueError('Rectangle of 2 corners, or polygon of at least 3 '
+                         'vertices expected.')
+    return points
+
+
+def _edges(points: List[_Point], closed: bool):
+    n = len(points)
+    return [(points[i], points[(i + 1) % n])
+            for i in range(n if closed else n - 1)]
+
+
+def _point_in_box(p: _Point, box: _Box) -> bool:
+    return box[0] <= p[0] <= box[2] and box[1] <= p[1] <= box[3]
+
+
+def _point_in_polygon(p: _Point, polygon: List[_Point]) -> bool:
+    inside = False
+    for a, b in _edges(polygon, True):
+        if _orientation(a, b, p) == 0 and _within(a, b, p):
+            return True
+        if (a[1] > p[1]) != (b[1] > p[1]) and \
+                p[0] < (b[0] - a[0]) * (p[1] - a[1]) / (b[1] - a[1]) + a[0]:
+            inside = not inside
+    return inside
+
+
+def _orientation(a: _Point, b: _Point, c: _Point) -> int:
+    cross = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+    return (cross > 0) - (cross < 0)
+
+
+def _within(a: _Point, b: _Point, p: _Point) -> bool:
+    """Whether p, on the line of a and b, is on the segment of them."""
+    return min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) \
+        and min(a[1], b[1]) <= p[1] <= max(a[1], b[1])
+
+
+def _segments_cross(a: _Point, b: _Point, c: _Point, d: _Point) -> bool:
+    """Whether the segments cross each other at a point inside both."""
+    return _orientation(a, b, c) * _orientation(a, b, d) < 0 \
+        and _orientation(c, d, a) * _orientation(c, d, b) < 0
+
+
+def _segments_touch(a: _Point, b: _Point, c: _Point, d: _Point) -> bool:
+    """Whether the segments have any point in common."""
+    o1, o2 = _orientation(a, b, c), _orientation(a, b, d)
+    o3, o4 = _orientation(c, d, a), _orientation(c, d, b)
+    if o1 * o2 < 0 and o3 * o4 < 0:
+        return True
+    return o1 == 0 and _within(a, b, c) or o2 == 0 and _within(a, b, d) \
+        or o3 == 0 and _within(c, d, a) or o4 == 0 and _within(c, d, b)
@@ -9,11 +9,12 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import IntEnum
-from typing import Optional
+from typing import Dict, List, Optional
 
 from sacad.acdb import Database
+from sacad.aggregate import AggregateRow
 from sacad.acge import Vector3d
 from sacad.jsonify import Jsonify
 
@@ -22,7 +23,9 @@ __all__ = [
     'Status',
     'DBInsertResult',
     'DBSelectResult',
+    'DBUpdateResult',
     'DBDeleteResult',
+    'DBCompoundResult',
 ]
 
 
@@ -45,14 +48,63 @@ class DBInsertResult(Result):
     num_updated: int = 0
     num_failure: int = 0
 
+    # Records of symbol tables not sent by DBInsert, as they are the same as
+    # the ones of AutoCAD.
+    num_unchanged: int = 0
+
     user_insertion_point: Optional[Vector3d] = None
 
+    # Indices of model space entities which failed to be inserted, only
+    # reported if DBInsertQuery.report_failed_entities is True.
+    failed_entities: Optional[List[int]] = None
+
+    def resolve_status(self):
+        """Set status from the numbers, the same way as SacadMgd does."""
+        if self.num_inserted + self.num_updated > 0:
+            self.status = Status.WARNING if self.num_failure > 0 \
+                else Status.SUCCESS
+        else:
+            self.status = Status.FAILURE if self.num_failure > 0 \
+                else Status.SUCCESS
+
 
 @dataclass
 class DBSelectResult(Result):
     db: Optional[Database] = None
 
+    # Continuation token of the next page, or None if this page is the last
+    # one, only reported if DBSelectQuery.page_size is specified.
+    cursor: Optional[str] = None
+
+    # Reported by SelectMode.AGGREGATE.
+    rows: Optional[List[AggregateRow]] = None
+
+    # Versions of the symbol tables selected by SelectMode.GET_TABLES, by
+    # names of fields of Database, e.g. 'layer_table'.
+    table_versions: Optional[Dict[str, str]] = None
+
+
+@dataclass
+class DBUpdateResult(Result):
+    num_updated: int = 0
+    num_failure: int = 0
+
+    def resolve_status(self):
+        """Set status from the numbers, the same way as SacadMgd does."""
+        if self.num_updated > 0:
+            self.status = Status.WARNING if self.num_failure > 0 \
+                else Status.SUCCESS
+        else:
+            self.status = Status.FAILURE if self.num_failure > 0 \
+                else Status.SUCCESS
+
 
 @dataclass
 class DBDeleteResult(Result):
     num_deleted: int = 0
+
+
+@dataclass
+class DBCompoundResult(Result):
+    # One result for each query of DBCompoundQuery, in the same order.
+    results: List[Result] = field(default_factory=list)
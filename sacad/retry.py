@@ -0,0 +1,176 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Policies to retry calls rejected by a busy AutoCAD."""
+
+import random
+import time
+
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Iterator, Optional
+
+from sacad.error import AcadComError
+
+__all__ = [
+    'RetryError',
+    'RetryStats',
+    'RetryPolicy',
+    'FixedRetryPolicy',
+    'AdaptiveRetryPolicy',
+    'retryable',
+]
+
+
+class RetryError(Exception):
+    def __init__(self, e, *args):
+        super().__init__(*args)
+        self.real_e = e
+
+
+@dataclass
+class RetryStats:
+    calls: int = 0
+    rejected_attempts: int = 0
+    retries: int = 0
+    failures: int = 0
+    wait_seconds: float = 0.0
+
+    def reset(self):
+        self.calls = self.rejected_attempts = self.retries = 0
+        self.failures = 0
+        self.wait_seconds = 0.0
+
+
+class RetryPolicy:
+    """
+    Decides how long to wait before each retry of a rejected call.
+    """
+
+    def __init__(self, sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        self.sleep = sleep
+        self.clock = clock
+
+    def delays(self, started_at: Optional[float] = None) -> Iterator[float]:
+        """
+        Yield the delay before each retry of one call, the call fails when
+        the iteration stops.
+
+        :param started_at: clock() of the first attempt of the call, now by
+                           default.
+        """
+        raise NotImplementedError
+
+
+class FixedRetryPolicy(RetryPolicy):
+    """Wait the same delay before each retry, up to a number of retries."""
+
+    def __init__(self, delay=0.1, max_count=20, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.max_count = max_count
+
+    def delays(self, started_at: Optional[float] = None) -> Iterator[float]:
+        for _ in range(max(self.max_count, 0)):
+            yield max(self.delay, 0)
+
+
+class AdaptiveRetryPolicy(RetryPolicy):
+    """
+    Retry quickly a few times at first, since AutoCAD is often busy only for
+    a moment, then back off exponentially with jitter until the time budget
+    of the call is spent.
+    """
+
+    def __init__(self, fast_count=3, fast_delay=0.005, initial_delay=0.02,
+                 factor=2.0, max_delay=0.5, jitter=0.5, budget=10.0,
+                 rng: Optional[random.Random] = None, **kwargs):
+        """
+        Initialization.
+
+        :param fast_count: number of retries after fast_delay.
+        :param fast_delay: delay of the first retries.
+        :param initial_delay: delay of the first retry after the fast ones,
+                              multiplied by factor for each retry then.
+        :param factor: growth factor of the delay.
+        :param max_delay: upper bound of the delay, before jitter.
+        :param jitter: fraction of the delay which is randomized, e.g. with
+                       0.5 the actual delay is between 50% and 100% of it.
+        :param budget: seconds since the first attempt after which the call
+                       is no longer retried.
+        :param rng: random number generator used for jitter.
+        """
+        super().__init__(**kwargs)
+        self.fast_count = fast_count
+        self.fast_delay = fast_delay
+        self.initial_delay = initial_delay
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.budget = budget
+        self.rng = rng or random.Random()
+
+    def delays(self, started_at: Optional[float] = None) -> Iterator[float]:
+        if started_at is None:
+            started_at = self.clock()
+        deadline = started_at + self.budget
+
+        for _ in range(self.fast_count):
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                return
+            yield min(self.fast_delay, remaining)
+
+        delay = self.initial_delay
+        while True:
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                return
+            yield min(delay * (1 - self.jitter * self.rng.random()), remaining)
+            delay = min(delay * self.factor, self.max_delay)
+
+
+def retryable(f):
+    """
+    Retry the decorated method while it raises RetryError, according to
+    retry_policy of the object, whose retry_stats is updated meanwhile.
+    """
+
+    @wraps(f)
+    def wrapper(self, *args, **kwargs):
+        policy: RetryPolicy = self.retry_policy
+        stats: RetryStats = self.retry_stats
+        stats.calls += 1
+        started_at = policy.clock()
+
+        try:
+            return f(self, *args, **kwargs)
+        except RetryError as e:
+            stats.rejected_attempts += 1
+            last_e = e
+
+        for delay in policy.delays(started_at):
+            if delay > 0:
+                start_at = policy.clock()
+                policy.sleep(delay)
+                stats.wait_seconds += policy.clock() - start_at
+            stats.retries += 1
+            try:
+                return f(self, *args, **kwargs)
+            except RetryError as e:
+                stats.rejected_attempts += 1
+                last_e = e
+
+        stats.failures += 1
+        raise AcadComError('CAD is busy now.') from last_e.real_e
+
+    return wrapper
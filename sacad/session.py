@@ -10,68 +10,155 @@
 # See the Mulan PSL v2 for more details.
 
 import threading
+import time
 import uuid
 from asyncio import Future
-from typing import Callable, Optional
+from itertools import chain
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Union
 
-from sacad import env
-from sacad.com import ComAcad
+from sacad import config, env
 from sacad.constant import ACAD_LATEST
 from sacad.error import (
     AcadConnectionError,
     AcadNotFoundError,
     AcadNotSupportedError,
+    AcadTcpError,
     SessionError,
 )
 from sacad.io import Requester
+from sacad.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from sacad.com import ComAcad
 
 __all__ = ['Session']
 
 
 class Session:
-    def __init__(self, acad_name: str, host: str, port: int):
+    def __init__(self, acad_name: str, host: str, port: int,
+                 new_instance=False,
+                 retry_policy: Optional[RetryPolicy] = None):
         self._name = acad_name
         self._host = host
         self._port = port
         self._skey = str(uuid.uuid1())
+        self._new_instance = new_instance
+        self._retry_policy = retry_policy
 
         self._req = Requester()
-        self._com: Optional[ComAcad] = None
+        self._com: Optional['ComAcad'] = None
+
+        # The AutoCAD process launched by this session (new_instance), kept
+        # across reset, so that reopening reattaches to it instead of
+        # launching another one.
+        self._launched: Optional['ComAcad'] = None
 
         self._fut: Optional[Future] = None
         self._fut_lock = threading.Lock()
 
+        self._serve_timeout: Optional[float] = None
+        self._serve_deadline = 0.0
+
         self._precheck()
 
-    def open(self, netload=True):
-        self._com = ComAcad(env.acad_progid(self._name))
+    def open(self, netload: Optional[bool] = True):
+        """
+        Connect to AutoCAD.
+
+        :param netload: True to load SacadMgd by NETLOAD before connecting.
+                        None to try connecting to an already loaded SacadMgd
+                        first, and load it only if it does not connect within
+                        config.connection_probe_timeout_seconds. If SacadMgd
+                        is not loaded, AutoCAD echoes "Unknown command" for
+                        the probe, and opening takes that timeout longer.
+        """
+        # Reopened without reset, e.g. by DBOperator after a broken connection.
+        self._release_com()
+        self._com = self._reuse_launched() or self._new_com()
         self._com.show()
 
+        if netload is None:
+            try:
+                self._connect(config.connection_probe_timeout_seconds)
+            except AcadTcpError:
+                netload = True
+            else:
+                self._ensure_connection()
+                return
+
         if netload:
-            dllpath = env.find_dll(self._name)
+            dllpath = self._find_dll()
             if not dllpath:
                 raise AcadNotSupportedError(
                     f'SacadMgd.dll for AutoCAD {self._name} is not found.')
             self._com.netload(dllpath)
 
-        self._req.open(self._host, self._port,
-                       on_listening=lambda: self._com.connect(
-                           f'{self._host}:{self._port}', self._skey))
-
+        self._connect()
         self._ensure_connection()
 
     def reset(self):
+        self._serve_timeout = None
         self._req.reset()
-        self._com = None
+        self._release_com()
 
     def close(self):
+        self.stop_serving()
         self._req.close()
         self._com = None
 
+    def start_serving(self, idle_timeout: Optional[float] = None):
+        """
+        Make AutoCAD enter a serving loop, which keeps processing requests
+        from the connection without any further command invocation, until
+        stop_serving is called or the loop is idle for idle_timeout seconds.
+
+        idle_timeout must be longer than config.serve_expiry_margin_seconds,
+        otherwise the loop would always be taken as expired, and every request
+        would send SACAD_SERVE again while the previous loop may still run.
+        """
+        if idle_timeout is None:
+            idle_timeout = config.serve_idle_timeout_seconds
+        if idle_timeout <= config.serve_expiry_margin_seconds:
+            raise ValueError(
+                f'idle_timeout must be longer than '
+                f'{config.serve_expiry_margin_seconds} seconds, the '
+                f'config.serve_expiry_margin_seconds.')
+
+        self._serve_timeout = idle_timeout
+        self._serve_deadline = 0.0
+
+        try:
+            self._ensure_connection()
+        except Exception:
+            self._serve_timeout = None
+            raise
+
+    def stop_serving(self):
+        if not self.is_serving():
+            self._serve_timeout = None
+            return
+
+        try:
+            self._request(_serve_frame('stop'), _do_nothing)
+        except AcadConnectionError:
+            pass
+        finally:
+            self._serve_timeout = None
+
+    def is_serving(self) -> bool:
+        return self._serve_timeout is not None \
+            and self._com is not None \
+            and time.monotonic() < self._serve_deadline
+
     def is_alive(self) -> bool:
         if not self._com:
             return False
 
+        # A running serving loop proves the connection recently, checking it
+        # again would double the round trips of every request.
+        if self.is_serving():
+            return True
+
         try:
             self._ensure_connection()
         except AcadConnectionError:
@@ -79,10 +166,14 @@ class Session:
 
         return True
 
-    def db_operation(self, opcmd: str):
+    def db_operation(self, opcmd: Union[str, Iterable[str]]):
+        if self._serve_timeout is not None:
+            return self._serve_request(_serve_frame('dbop', opcmd))
         return self._request(opcmd, self._com.dbop)
 
-    def doc_operation(self, opcmd: str):
+    def doc_operation(self, opcmd: Union[str, Iterable[str]]):
+        if self._serve_timeout is not None:
+            return self._serve_request(_serve_frame('docop', opcmd))
         return self._request(opcmd, self._com.docop)
 
     def cancel_request(self):
@@ -103,6 +194,34 @@ class Session:
     def com_acad(self):
         return self._com
 
+    def _new_com(self) -> 'ComAcad':
+        # Imported here so that pywin32 is not required until connecting.
+        from sacad.com import ComAcad
+        return ComAcad(env.acad_progid(self._name),
+                       new_instance=self._new_instance,
+                       retry_policy=self._retry_policy)
+
+    def _release_com(self):
+        if self._new_instance and self._com is not None:
+            self._launched = self._com
+        self._com = None
+
+    def _reuse_launched(self) -> Optional['ComAcad']:
+        """
+        The AutoCAD launched before reset, if it still answers COM calls.
+        Otherwise, it is quit, so that restarts never leak AutoCAD processes.
+        """
+        com, self._launched = self._launched, None
+        if com is None:
+            return None
+        if com.is_alive():
+            return com
+        com.quit()
+        return None
+
+    def _find_dll(self) -> Optional[str]:
+        return env.find_dll(self._name)
+
     def _precheck(self):
         acad_names = env.available_acad()
         if not acad_names:
@@ -120,7 +239,7 @@ class Session:
             raise AcadNotFoundError(
                 f'AutoCAD {self._name} is not found in the registry.')
 
-    def _request(self, msg: str, cmd: Callable):
+    def _request(self, msg: Union[str, Iterable[str]], cmd: Callable):
         try:
             with self._fut_lock:
                 if self._fut is not None:
@@ -133,6 +252,47 @@ class Session:
             with self._fut_lock:
                 self._fut = None
 
+    def _serve_request(self, frame: Union[str, Iterable[str]]):
+        # The first request after (re-)entering serving mode carries the
+        # SACAD_SERVE command, others are simply picked up by the loop.
+        if self.is_serving():
+            cmd = _do_nothing
+        else:
+            cmd = self._serve_cmd
+
+        try:
+            response = self._request(frame, cmd)
+        except AcadConnectionError:
+            self._serve_deadline = 0.0
+            raise
+
+        self._serve_deadline = time.monotonic() + max(
+            self._serve_timeout - config.serve_expiry_margin_seconds, 0)
+        return response
+
+    def _serve_cmd(self, skey: str):
+        self._com.serve(skey, self._serve_timeout)
+
+    def _connect(self, timeout: Optional[float] = None):
+        self._req.open(self._host, self._port,
+                       on_listening=lambda: self._com.connect(
+                           f'{self._host}:{self._port}', self._skey),
+                       timeout=timeout)
+
     def _ensure_connection(self):
-        pong = self._request('ping', self._com.ping)
+        if self._serve_timeout is not None:
+            pong = self._serve_request(_serve_frame('ping', 'ping'))
+        else:
+            pong = self._request('ping', self._com.ping)
         assert pong == 'pong'
+
+
+def _serve_frame(op: str, payload: Union[str, Iterable[str]] = ''
+                 ) -> Union[str, Iterable[str]]:
+    if not isinstance(payload, str):
+        return chain([f'{op}\n'], payload)
+    return f'{op}\n{payload}'
+
+
+def _do_nothing(_skey: str):
+    pass
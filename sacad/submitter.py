@@ -0,0 +1,360 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Submit insertions in background, coalescing small ones."""
+
+import dataclasses
+import itertools
+import threading
+import time
+
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sacad.acdb import Database, Group, MODEL_SPACE, ObjectId
+from sacad.crud import DBInsert, DBInsertQuery
+from sacad.error import SessionError
+from sacad.jsonify import Fragment
+from sacad.result import DBInsertResult, Status
+from sacad.session import Session
+
+__all__ = [
+    'BackgroundSubmitter',
+]
+
+# (future, query, number of model space entities, enqueued at)
+Pending = Tuple[Future, DBInsertQuery, int, float]
+
+_TABLES = [
+    'dim_style_table',
+    'layer_table',
+    'linetype_table',
+    'text_style_table',
+    'm_leader_style_dict',
+]
+
+
+class BackgroundSubmitter:
+    """
+    Submit insertion transactions without blocking the caller.
+
+    Transactions queued for the same session are coalesced into one
+    DBInsertQuery, so a burst of small insertions costs a single round trip.
+    Like Nagle's algorithm, a transaction waits at most `linger` seconds for
+    others to join it, and a coalesced query stops growing once it holds
+    `max_entities` entities of model space.
+
+    Transactions are coalesced only with the next ones of the same session
+    having the same options, and whose tables do not define a record of the
+    same name differently. Transactions prompting for the insertion point are
+    always submitted alone. The order of transactions within a session is
+    preserved.
+
+    The future of each transaction is resolved with its share of the result
+    of the coalesced query. The numbers of entities are exact, while the
+    numbers of other records (symbols, blocks, groups...) are reported to the
+    first transaction bringing such records.
+
+    Each session is driven by a worker thread of its own, through a COM
+    proxy of that thread (see ComAcad), whether the session was opened by
+    the caller or is left to be opened by the worker.
+    """
+
+    def __init__(self, max_entities=1000, linger=0.005, sta=True):
+        """
+        Initialization.
+
+        :param max_entities: model space entities above which a coalesced
+                             query is submitted without waiting any more.
+        :param linger: seconds a transaction may wait for others to join it.
+        :param sta: initialize COM as single-thread apartment (STA) in each
+                    worker thread, which is required by real sessions.
+        """
+        self._max_entities = max_entities
+        self._linger = linger
+        self._sta = sta
+
+        self._cond = threading.Condition()
+        self._lanes: Dict[Session, '_Lane'] = {}
+        self._flushing = 0
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def submit(self, op: DBInsert) -> Future:
+        """
+        Queue an insertion transaction.
+
+        The transaction must not be modified after being queued.
+
+        :return: a future resolved with the DBInsertResult of the transaction.
+        """
+        query = op.query
+        num_entities = Fragment.count_in(_model_space_entities(query.database))
+
+        fut = Future()
+        with self._cond:
+            if self._closed:
+                raise SessionError('Cannot submit to a closed submitter.')
+
+            lane = self._lanes.get(op._session)
+            if lane is None:
+                lane = _Lane(self, op._session)
+                self._lanes[op._session] = lane
+                lane.thread.start()
+
+            lane.queue.append((fut, query, num_entities, time.monotonic()))
+            lane.num_entities += num_entities
+            self._cond.notify_all()
+
+        return fut
+
+    def flush(self):
+        """
+        Submit queued transactions without lingering, and wait for all of
+        them to be done.
+        """
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                self._cond.wait_for(lambda: all(
+                    not lane.queue and not lane.busy
+                    for lane in self._lanes.values()))
+            finally:
+                self._flushing -= 1
+
+    def close(self):
+        """
+        Submit queued transactions, then stop the worker threads.
+
+        Sessions are left open.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            lanes = list(self._lanes.values())
+
+        for lane in lanes:
+            lane.thread.join()
+
+    def _next_batch(self, lane: '_Lane') -> Optional[List[Pending]]:
+        with self._cond:
+            while True:
+                if lane.queue:
+                    deadline = lane.queue[0][3] + self._linger
+                    now = time.monotonic()
+                    if (self._closed or self._flushing or now >= deadline
+                            or lane.num_entities >= self._max_entities):
+                        batch = self._coalescible(lane.queue)
+                        for pending in batch:
+                            lane.queue.popleft()
+                            lane.num_entities -= pending[2]
+                        lane.busy = True
+                        return batch
+                    self._cond.wait(deadline - now)
+                elif self._closed:
+                    return None
+                else:
+                    self._cond.wait()
+
+    def _coalescible(self, queue: Deque[Pending]) -> List[Pending]:
+        """Get the leading transactions of the queue which can be coalesced."""
+        first = queue[0]
+        batch = [first]
+        num_entities = first[2]
+        if first[1].prompt_insertion_point:
+            return batch
+
+        options = _options(first[1])
+        tables = _Tables(first[1].database)
+        for pending in itertools.islice(queue, 1, None):
+            _, query, n, _ = pending
+            if (num_entities + n > self._max_entities
+                    or _options(query) != options
+                    or not tables.merge(query.database)):
+                break
+            batch.append(pending)
+            num_entities += n
+
+        return batch
+
+    def _done(self, lane: '_Lane'):
+        with self._cond:
+            lane.busy = False
+            self._cond.notify_all()
+
+
+class _Lane:
+    def __init__(self, submitter: BackgroundSubmitter, session: Session):
+        self.submitter = submitter
+        self.session = session
+        self.queue: Deque[Pending] = deque()
+        self.num_entities = 0
+        self.busy = False
+        self.thread = threading.Thread(target=self._work, daemon=True)
+
+    def _work(self):
+        if self.submitter._sta:
+            import pythoncom
+            pythoncom.CoInitialize()
+
+        try:
+            while (batch := self.submitter._next_batch(self)) is not None:
+                try:
+                    self._submit(batch)
+                finally:
+                    self.submitter._done(self)
+        finally:
+            if self.submitter._sta:
+                import pythoncom
+                pythoncom.CoUninitialize()
+
+    def _submit(self, batch: List[Pending]):
+        batch = [p for p in batch if p[0].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        queries = [p[1] for p in batch]
+        try:
+            query = _coalesce(queries)
+            result = DBInsert(self.session, query).submit()
+            shares = _split(result, queries)
+        except BaseException as e:
+            for fut, *_ in batch:
+                fut.set_exception(e)
+            return
+
+        for (fut, *_), share in zip(batch, shares):
+            fut.set_result(share)
+
+
+class _Tables:
+    """Records of the tables of coalesced transactions, by name."""
+
+    def __init__(self, db: Database):
+        self._records = {t: dict(getattr(db, t)) for t in _TABLES}
+        self._records['block_table'] = _blocks(db)
+        self._groups = dict(db.group_dict)
+
+    def merge(self, db: Database) -> bool:
+        """Merge records of db, unless any of them conflicts."""
+        tables = {t: getattr(db, t) for t in _TABLES}
+        tables['block_table'] = _blocks(db)
+
+        for name, table in tables.items():
+            records = self._records[name]
+            if any(k in records and records[k] != v for k, v in table.items()):
+                return False
+        if any(k in self._groups and not _same_group(self._groups[k], v)
+               for k, v in db.group_dict.items()):
+            return False
+
+        for name, table in tables.items():
+            self._records[name].update(table)
+        for k, v in db.group_dict.items():
+            self._groups.setdefault(k, v)
+        return True
+
+
+def _options(query: DBInsertQuery) -> tuple:
+    return tuple(getattr(query, f.name) for f in dataclasses.fields(query)
+                 if f.name not in ('database', 'grouping'))
+
+
+def _blocks(db: Database) -> dict:
+    return {k: v for k, v in db.block_table.items() if k != MODEL_SPACE}
+
+
+def _model_space_entities(db: Database) -> list:
+    block = db.block_table.get(MODEL_SPACE)
+    return block.entities if block is not None else []
+
+
+def _same_group(a: Group, b: Group) -> bool:
+    # Groups of the same name are merged by joining their entities.
+    return a.name == b.name and a.selectable == b.selectable
+
+
+def _coalesce(queries: List[DBInsertQuery]) -> DBInsertQuery:
+    if len(queries) == 1:
+        return dataclasses.replace(queries[0], report_failed_entities=True)
+
+    db = Database()
+    entities = db.get_block(MODEL_SPACE).entities
+    grouping: Dict[str, List[ObjectId]] = {}
+    for query in queries:
+        src = query.database
+        for t in _TABLES:
+            getattr(db, t).update(getattr(src, t))
+        db.block_table.update(_blocks(src))
+        entities.extend(_model_space_entities(src))
+
+        for name, group in src.group_dict.items():
+            merged = db.group_dict.get(name)
+            if merged is None:
+                db.group_dict[name] = dataclasses.replace(
+                    group, entity_ids=list(group.entity_ids or []))
+            else:
+                merged.entity_ids.extend(group.entity_ids or [])
+        for name, eids in (query.grouping or {}).items():
+            grouping.setdefault(name, []).extend(eids)
+
+    return dataclasses.replace(queries[0], database=db,
+                               grouping=grouping or None,
+                               report_failed_entities=True)
+
+
+def _split(result: DBInsertResult,
+           queries: List[DBInsertQuery]) -> List[DBInsertResult]:
+    if result.status == Status.UNKNOWN:
+        # The whole query failed, rather than some of the entities.
+        return [dataclasses.replace(result) for _ in queries]
+
+    failed = sorted(result.failed_entities or [])
+    shares = []
+    start = 0
+    for query in queries:
+        end = start + Fragment.count_in(_model_space_entities(query.database))
+        share_failed = [i - start for i in failed if start <= i < end]
+        shares.append(DBInsertResult(
+            num_inserted=end - start - len(share_failed),
+            num_failure=len(share_failed),
+            user_insertion_point=result.user_insertion_point,
+            failed_entities=share_failed or None))
+        start = end
+
+    # Records other than entities cannot be told apart.
+    owner = next((s for s, q in zip(shares, queries)
+                  if _has_records(q.database)), shares[0])
+    owner.num_inserted += result.num_inserted - sum(
+        s.num_inserted for s in shares)
+    owner.num_updated += result.num_updated
+    owner.num_failure += result.num_failure - sum(
+        s.num_failure for s in shares)
+
+    for share in shares:
+        share.message = result.message
+        share.resolve_status()
+
+    return shares
+
+
+def _has_records(db: Database) -> bool:
+    return bool(_blocks(db) or db.group_dict
+                or any(getattr(db, t) for t in _TABLES))
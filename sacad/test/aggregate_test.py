@@ -0,0 +1,94 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.aggregate`."""
+
+import math
+import unittest
+
+from sacad.acdb import Arc, Circle, DBText, Line, MText, Polyline, Vertex
+from sacad.acge import Vector3d
+from sacad.aggregate import Aggregate, AggregateRow, GroupKey, aggregate
+from sacad.jsonify import Jsonify
+from sacad.result import DBSelectResult
+
+
+class AggregateTestCase(unittest.TestCase):
+    def test_group_by(self):
+        entities = [Line(layer='A'), Circle(layer='A'), Line(layer='B'),
+                    Line(), DBText(text_style_name='T'), MText()]
+
+        rows = aggregate(entities, [GroupKey.LAYER])
+        self.assertEqual([(r.key, r.count) for r in rows],
+                         [(['A'], 2), (['B'], 1), (['0'], 3)])
+        self.assertIsNone(rows[0].length)
+
+        rows = aggregate(entities, [GroupKey.TYPE, GroupKey.TEXT_STYLE])
+        self.assertEqual([r.key for r in rows], [
+            ['sacad.acdb.Line', None], ['sacad.acdb.Circle', None],
+            ['sacad.acdb.DBText', 'T'], ['sacad.acdb.MText', 'Standard']])
+
+        rows = aggregate(entities)
+        self.assertEqual([(r.key, r.count) for r in rows], [([], 6)])
+        self.assertEqual(aggregate([]), [])
+
+    def test_length(self):
+        polyline = Polyline.new(Vertex.new(0, 0), Vertex.new(3, 0),
+                                Vertex.new(3, 4))
+        entities = [
+            Line.new(0, 0, 3, 4),
+            Circle.new(0, 0, 1),
+            Arc.new(0, 0, 2, 0, math.pi / 2),
+            polyline,
+            # A half circle of radius 1.
+            Polyline.new(Vertex.new(0, 0, bulge=1), Vertex.new(2, 0)),
+            DBText(),
+        ]
+        row, = aggregate(entities, aggregates=[Aggregate.LENGTH])
+        self.assertAlmostEqual(row.length, 5 + 2 * math.pi + math.pi + 7
+                               + math.pi)
+        self.assertIsNone(row.count)
+
+        polyline.closed = True
+        row, = aggregate([polyline], aggregates=[Aggregate.LENGTH])
+        self.assertAlmostEqual(row.length, 12)
+
+    def test_area(self):
+        entities = [
+            Line.new(0, 0, 3, 4),
+            Circle.new(0, 0, 1),
+            Arc.new(0, 0, 1, 0, math.pi),
+            # Areas of polylines are computed as if they are closed.
+            Polyline.new(Vertex.new(0, 0), Vertex.new(2, 0),
+                         Vertex.new(2, 2), Vertex.new(0, 2)),
+            Polyline.new(Vertex.new(0, 0, bulge=1), Vertex.new(2, 0, bulge=1),
+                         closed=True),
+            Circle(area=10.0),
+        ]
+        row, = aggregate(entities, aggregates=[Aggregate.AREA])
+        self.assertAlmostEqual(row.area, math.pi + math.pi / 2 + 4 + math.pi
+                               + 10)
+
+    def test_extents(self):
+        row, = aggregate([Line.new(0, 0, 1, 5), Circle.new(10, 0, 2),
+                          DBText()], aggregates=[Aggregate.EXTENTS])
+        self.assertEqual(row.extents.min_point, Vector3d(0, -2, 0))
+        self.assertEqual(row.extents.max_point, Vector3d(12, 5, 0))
+        row, = aggregate([DBText()], aggregates=[Aggregate.EXTENTS])
+        self.assertIsNone(row.extents)
+
+    def test_serialization(self):
+        result = DBSelectResult(rows=aggregate(
+            [Line(layer='A', color_index=1)],
+            [GroupKey.LAYER, GroupKey.COLOR_INDEX],
+            [Aggregate.COUNT, Aggregate.EXTENTS]))
+        decoded = Jsonify.deserialize(result.serialize())
+        self.assertEqual(decoded.rows, [AggregateRow(key=['A', 1], count=1)])
@@ -0,0 +1,148 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.batch`."""
+
+import json
+import unittest
+
+import numpy as np
+
+from sacad.accm import Color
+from sacad.acdb import (
+    Circle,
+    DBText,
+    Line,
+    LineWeight,
+    MODEL_SPACE,
+    Polyline,
+    Vertex,
+)
+from sacad.batch import CircleBatch, LineBatch, PolylineBatch, TextBatch
+from sacad.crud import DBInsert, DBInsertQuery, split_insert_query
+from sacad.jsonify import Jsonify
+
+
+def _expand(batch):
+    return Jsonify.deserialize(f'[{batch.to_fragment().text}]')
+
+
+class BatchTestCase(unittest.TestCase):
+    def test_line(self):
+        batch = LineBatch(np.array([[0, 0], [1, 1]]), [[2, 2, 1], [3, 3, 1]],
+                          layer=['A', 'B%'], color=Color.rgb(1, 2, 3),
+                          line_weight=LineWeight.BY_LAYER)
+        self.assertEqual(_expand(batch), [
+            Line.new_xyz(0, 0, 0, 2, 2, 1, layer='A', color=Color.rgb(1, 2, 3),
+                         line_weight=LineWeight.BY_LAYER),
+            Line.new_xyz(1, 1, 0, 3, 3, 1, layer='B%',
+                         color=Color.rgb(1, 2, 3),
+                         line_weight=LineWeight.BY_LAYER),
+        ])
+
+    def test_circle(self):
+        self.assertEqual(_expand(CircleBatch([[0, 0], [1, 2]], 5)),
+                         [Circle.new(0, 0, 5.0), Circle.new(1, 2, 5.0)])
+        self.assertEqual(
+            _expand(CircleBatch([[0, 0], [1, 2]], np.array([1, 2]),
+                                color_index=np.array([1, 2]))),
+            [Circle.new(0, 0, 1.0, color_index=1),
+             Circle.new(1, 2, 2.0, color_index=2)])
+
+    def test_polyline(self):
+        batch = PolylineBatch([0, 2, 2, 5],
+                              [[0, 0], [1, 0], [0, 1], [1, 1], [2, 2]],
+                              bulge=[1, 0, 0, 0, 0.5], widths=np.ones((5, 2)),
+                              closed=[True, False, True])
+        vertex = Vertex.new
+        kw = dict(start_width=1.0, end_width=1.0)
+        self.assertEqual(_expand(batch), [
+            Polyline.new(vertex(0, 0, bulge=1.0, **kw),
+                         vertex(1, 0, bulge=0.0, **kw), closed=True),
+            Polyline.new(closed=False),
+            Polyline.new(vertex(0, 1, bulge=0.0, **kw),
+                         vertex(1, 1, bulge=0.0, **kw),
+                         vertex(2, 2, bulge=0.5, **kw), closed=True),
+        ])
+
+        with self.assertRaises(ValueError):
+            PolylineBatch([0, 3], [[0, 0], [1, 1]])
+
+    def test_text(self):
+        batch = TextBatch([[0, 0], [1, 1]], ['a"b', '%s'], height=2.5,
+                          text_style_name='Standard')
+        self.assertEqual(_expand(batch), [
+            DBText.new(0, 0, 'a"b', height=2.5, text_style_name='Standard'),
+            DBText.new(1, 1, '%s', height=2.5, text_style_name='Standard'),
+        ])
+
+    def test_non_finite(self):
+        inf, nan = float('inf'), float('nan')
+        lines = LineBatch([[inf, 0], [nan, 1]], [[2, -inf, 1], [3, 3, nan]])
+        polylines = PolylineBatch([0, 2], [[inf, 0], [1, nan]],
+                                  bulge=[-inf, 0], widths=[[nan, 1], [1, 1]])
+        entities = [
+            Line.new_xyz(inf, 0, 0, 2, -inf, 1),
+            Line.new_xyz(nan, 1, 0, 3, 3, nan),
+            Polyline.new(
+                Vertex.new(inf, 0, bulge=-inf, start_width=nan,
+                           end_width=1.0),
+                Vertex.new(1, nan, bulge=0.0, start_width=1.0,
+                           end_width=1.0)),
+        ]
+
+        text = f'[{lines.to_fragment().text}, ' \
+               f'{polylines.to_fragment().text}]'
+        self.assertEqual(json.loads(text),
+                         [json.loads(e.serialize()) for e in entities])
+
+    def test_invalid(self):
+        with self.assertRaises(TypeError):
+            LineBatch([[0, 0]], [[1, 1]], radius=1)
+        with self.assertRaises(ValueError):
+            LineBatch([[0, 0]], [[1, 1]], layer=['A', 'B'])
+
+    def test_shared_point(self):
+        self.assertEqual(
+            _expand(LineBatch([0, 0], [[1, 1], [2, 2], [3, 3], [4, 4]])),
+            [Line.new(0, 0, i, i) for i in range(1, 5)])
+        self.assertEqual(_expand(TextBatch([1, 2], ['a', 'b'])),
+                         [DBText.new(1, 2, 'a'), DBText.new(1, 2, 'b')])
+        self.assertEqual(_expand(CircleBatch([1, 2], 5)),
+                         [Circle.new(1, 2, 5.0)])
+
+    def test_size_mismatch(self):
+        with self.assertRaises(ValueError):
+            LineBatch([[0, 0], [1, 1]], [[1, 1], [2, 2], [3, 3]])
+        with self.assertRaises(ValueError):
+            TextBatch([[0, 0], [1, 1]], ['a'])
+        with self.assertRaises(ValueError):
+            TextBatch([0, 0], ['a', 'b'], height=[1, 2, 3])
+
+    def test_insert_batch(self):
+        n = 25
+        op = DBInsert(None, DBInsertQuery())
+        op.model_space.insert(Line())
+        op.model_space.insert_batch(
+            CircleBatch(np.zeros((n, 2)), 1), fragment_size=10)
+        entities = op.query.database.get_block(MODEL_SPACE).entities
+        self.assertEqual([getattr(e, 'count', 1) for e in entities],
+                         [1, 10, 10, 5])
+
+        payload = json.loads(op.query.serialize())
+        model_space = payload['__mbr__']['database']['__mbr__'][
+            'block_table'][MODEL_SPACE]['__mbr__']['entities']
+        self.assertEqual(len(model_space), n + 1)
+
+        chunks = split_insert_query(op.query, 11)
+        self.assertEqual(
+            [len(Jsonify.deserialize(c.serialize()).database.get_block(
+                MODEL_SPACE).entities) for c in chunks], [11, 10, 5])
@@ -0,0 +1,85 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.cache`."""
+
+import unittest
+
+from sacad.accm import Color
+from sacad.acdb import Database, LayerTableRecord, LinetypeTableRecord
+from sacad.cache import TableCache, content_hash
+from sacad.result import DBSelectResult, Status
+
+
+class TableCacheTestCase(unittest.TestCase):
+    def test_merge(self):
+        cache = TableCache()
+        layers = {'A': LayerTableRecord(name='A')}
+        cache.merge(DBSelectResult(
+            status=Status.SUCCESS, db=Database(layer_table=layers),
+            table_versions={'layer_table': 'd:1'}))
+        self.assertEqual(cache.versions(), {'layer_table': 'd:1'})
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        # The table is not sent back if it is of the version cached.
+        result = DBSelectResult(status=Status.SUCCESS, db=Database(),
+                                table_versions={'layer_table': 'd:1'})
+        cache.merge(result)
+        self.assertEqual(result.db.layer_table, layers)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # Changing tables of results never changes the cache.
+        result.db.layer_table['B'] = LayerTableRecord(name='B')
+        self.assertEqual(cache.get('layer_table'), layers)
+
+        cache.merge(DBSelectResult(
+            status=Status.SUCCESS, db=Database(),
+            table_versions={'layer_table': 'd:2'}))
+        self.assertEqual(cache.get('layer_table'), {})
+        self.assertIsNone(cache.get('dim_style_table'))
+
+    def test_failure(self):
+        cache = TableCache()
+        cache.merge(DBSelectResult(status=Status.FAILURE, db=Database(),
+                                   table_versions={'layer_table': 'd:1'}))
+        self.assertEqual(len(cache), 0)
+
+    def test_content_hash(self):
+        a = LayerTableRecord(id=1, name='A', is_off=False)
+        self.assertEqual(content_hash(a),
+                         content_hash(LayerTableRecord(id=2, name='A',
+                                                       is_off=False)))
+        self.assertNotEqual(content_hash(a),
+                            content_hash(LayerTableRecord(name='A')))
+        self.assertEqual(content_hash(a, ['name']),
+                         content_hash(LayerTableRecord(name='A')))
+
+    def test_is_unchanged(self):
+        cache = TableCache()
+        cache.merge(DBSelectResult(
+            status=Status.SUCCESS,
+            db=Database(layer_table={'A': LayerTableRecord(
+                id=1, name='A', color=Color.index(1), is_off=False)}),
+            table_versions={'layer_table': 'd:1'}))
+
+        # Only the fields specified are compared.
+        self.assertTrue(cache.is_unchanged(
+            'layer_table', 'A',
+            LayerTableRecord(name='A', color=Color.index(1))))
+        self.assertFalse(cache.is_unchanged(
+            'layer_table', 'A',
+            LayerTableRecord(name='A', color=Color.index(2))))
+        self.assertFalse(cache.is_unchanged(
+            'layer_table', 'A', LayerTableRecord(name='A', is_off=True)))
+        self.assertFalse(cache.is_unchanged(
+            'layer_table', 'B', LayerTableRecord(name='B')))
+        self.assertFalse(cache.is_unchanged(
+            'linetype_table', 'A', LinetypeTableRecord(name='A')))
@@ -0,0 +1,174 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.crud`."""
+
+import json
+import unittest
+
+from sacad.acdb import (
+    BlockTableRecord,
+    Group,
+    LayerTableRecord,
+    Line,
+    MODEL_SPACE,
+)
+from sacad.acge import Vector3d
+from sacad.crud import (
+    DBCompound,
+    DBCompoundQuery,
+    DBDelete,
+    DBDeleteQuery,
+    DBInsert,
+    DBInsertQuery,
+    DBSelectQuery,
+    SelectMode,
+    ZoomMode,
+    split_insert_query,
+)
+from sacad.jsonify import Fragment, Jsonify
+from sacad.result import (
+    DBCompoundResult,
+    DBDeleteResult,
+    DBInsertResult,
+    Status,
+)
+
+
+class DBCompoundTestCase(unittest.TestCase):
+    def test_serialize(self):
+        delete = DBDelete(None, DBDeleteQuery(delete_group_entities=True))
+        delete.delete_group('X')
+        insert = DBInsert(None, DBInsertQuery())
+        insert.model_space.insert(Line.new(0, 0, 1, 1))
+
+        compound = DBCompound(None, DBCompoundQuery())
+        compound.add(delete).add(insert).add(
+            DBSelectQuery(mode=SelectMode.GET_GROUPS, group_names=['X']))
+
+        request = json.loads(compound.query.serialize())
+        types = [q['__mbr__']['$type'] for q in request['__mbr__']['queries']]
+        self.assertEqual(request['__mbr__']['$type'],
+                         'SacadMgd.DbCompoundQuery, SacadMgd')
+        self.assertEqual(types, ['SacadMgd.DbDeleteQuery, SacadMgd',
+                                 'SacadMgd.DbInsertQuery, SacadMgd',
+                                 'SacadMgd.DbSelectQuery, SacadMgd'])
+
+    def test_deserialize_result(self):
+        result = Jsonify.deserialize(DBCompoundResult(
+            status=Status.SUCCESS,
+            results=[DBDeleteResult(status=Status.SUCCESS, num_deleted=2),
+                     DBInsertResult(status=Status.SUCCESS, num_inserted=1)],
+        ).serialize())
+
+        self.assertIsInstance(result, DBCompoundResult)
+        self.assertEqual([type(r) for r in result.results],
+                         [DBDeleteResult, DBInsertResult])
+        self.assertEqual(result.results[0].num_deleted, 2)
+
+
+class _Session:
+    """Fails to insert entities on the layer named "bad"."""
+
+    def __init__(self):
+        self.queries = []
+
+    def is_alive(self):
+        return True
+
+    def db_operation(self, msg):
+        query = Jsonify.deserialize(msg)
+        self.queries.append(query)
+
+        entities = query.database.get_block(MODEL_SPACE).entities
+        failed = [i for i, e in enumerate(entities) if e.layer == 'bad']
+        result = DBInsertResult(
+            num_inserted=len(entities) - len(failed)
+            + len(query.database.layer_table),
+            num_failure=len(failed),
+            failed_entities=failed if query.report_failed_entities else None)
+        if query.prompt_insertion_point:
+            result.user_insertion_point = Vector3d(1, 2, 0)
+        result.resolve_status()
+        return result.serialize()
+
+
+class ChunkTestCase(unittest.TestCase):
+    def new_insert(self, num_entities, **kwargs):
+        insert = DBInsert(_Session(), DBInsertQuery(**kwargs))
+        insert.layer_table.insert(LayerTableRecord(name='L'))
+        insert.block_table.insert(BlockTableRecord(
+            name='B', entities=[Line(), Line()]))
+        insert.model_space.insert_many(Line() for _ in range(num_entities))
+        return insert
+
+    def test_split(self):
+        insert = self.new_insert(10, zoom_mode=ZoomMode.ADDED)
+        chunks = list(split_insert_query(insert.query, 4))
+
+        self.assertEqual([len(c.database.get_block(MODEL_SPACE).entities)
+                          for c in chunks], [0, 4, 4, 2])
+        self.assertEqual(list(chunks[0].database.layer_table), ['L'])
+        self.assertEqual(list(chunks[0].database.block_table),
+                         [MODEL_SPACE, 'B'])
+        self.assertFalse(any(c.database.layer_table for c in chunks[1:]))
+        self.assertEqual([c.zoom_mode for c in chunks],
+                         [None, None, None, ZoomMode.ADDED])
+
+    def test_split_groups(self):
+        insert = self.new_insert(0)
+        ids = [insert.model_space.insert_and_ref(Line()) for _ in range(4)]
+        insert.query.database.group_dict['G'] = Group(
+            name='G', entity_ids=ids[1:3])
+        chunks = list(split_insert_query(insert.query, 7))
+
+        self.assertEqual(chunks[0].database.group_dict['G'].entity_ids,
+                         ids[1:3])
+        self.assertEqual(chunks[1].database.group_dict, {})
+        self.assertEqual(chunks[1].grouping, {'G': ids[2:3]})
+        self.assertEqual(insert.query.database.group_dict['G'].entity_ids,
+                         ids[1:3])
+
+    def test_submit_chunks(self):
+        insert = self.new_insert(10, report_failed_entities=True)
+        insert.model_space.insert(Line(layer='bad'))
+        result = insert.submit(chunk_size=4)
+
+        self.assertEqual(len(insert._session.queries), 4)
+        self.assertEqual(result.num_inserted, 11)
+        self.assertEqual(result.num_failure, 1)
+        self.assertEqual(result.failed_entities, [10])
+        self.assertEqual(result.status, Status.WARNING)
+
+    def test_prompt_once(self):
+        insert = self.new_insert(10, prompt_insertion_point=True)
+        result = insert.submit(chunk_size=4)
+
+        queries = insert._session.queries
+        self.assertEqual([bool(q.prompt_insertion_point) for q in queries],
+                         [True, False, False, False])
+        self.assertTrue(all(q.insertion_point == Vector3d(1, 2, 0)
+                            for q in queries[1:]))
+        self.assertEqual(result.user_insertion_point, Vector3d(1, 2, 0))
+
+    def test_split_fragments(self):
+        insert = self.new_insert(0)
+        insert.model_space.insert_fragment(Fragment.of(
+            [Line(id=i) for i in range(5)]))
+        insert.model_space.insert_many(Line(id=i) for i in range(5, 8))
+        insert.query.database.group_dict['G'] = Group(
+            name='G', entity_ids=[4, 5])
+        chunks = list(split_insert_query(insert.query, 4))
+
+        self.assertEqual([Fragment.count_in(c.database.get_block(
+            MODEL_SPACE).entities) for c in chunks], [0, 5, 3])
+        self.assertEqual([c.grouping for c in chunks],
+                         [None, {'G': [4]}, {'G': [5]}])
@@ -0,0 +1,83 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.env`."""
+
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from sacad import config, env
+
+
+class EnvCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dlldir = os.path.join(self.tmpdir.name, 'dll')
+        os.makedirs(os.path.join(self.dlldir, '2021'))
+
+        patcher = mock.patch.multiple(
+            config, dll_location=self.dlldir,
+            env_cache_file=os.path.join(self.tmpdir.name, 'cache', 'env.json'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        env._cache = env._EnvCache()
+        self.addCleanup(setattr, env, '_cache', env._EnvCache())
+
+        self.stamp = 1
+        self.versions = ['R23.1', 'R24.0']
+        self.num_enums = 0
+        for name, func in (('_registry_stamp', lambda: self.stamp),
+                           ('_registry_versions', self.enum_versions)):
+            patcher = mock.patch.object(env, name, func)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def enum_versions(self):
+        self.num_enums += 1
+        return self.versions
+
+    def test_available_acad(self):
+        self.assertEqual(env.available_acad(), ['2020', '2021'])
+        self.assertEqual(env.available_acad(), ['2020', '2021'])
+        self.assertEqual(self.num_enums, 1)
+
+        self.stamp, self.versions = 2, ['R24.2']
+        self.assertEqual(env.available_acad(), ['2023'])
+        self.assertEqual(self.num_enums, 2)
+
+    def test_file_cache(self):
+        env.available_acad()
+        env._cache = env._EnvCache()
+        self.assertEqual(env.available_acad(), ['2020', '2021'])
+        self.assertEqual(self.num_enums, 1)
+
+    def test_no_stamp(self):
+        self.stamp = None
+        env.available_acad()
+        env.available_acad()
+        self.assertEqual(self.num_enums, 2)
+
+    def test_find_dll(self):
+        self.assertEqual(env.find_dll('2023'),
+                         os.path.join(self.dlldir, '2021', 'SacadMgd.dll'))
+
+        os.makedirs(os.path.join(self.dlldir, '2023'))
+        stat = os.stat(self.dlldir)
+        os.utime(self.dlldir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(env.find_dll('2023'),
+                         os.path.join(self.dlldir, '2023', 'SacadMgd.dll'))
@@ -0,0 +1,109 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.filters`."""
+
+import json
+import unittest
+
+from sacad.accm import Color
+from sacad.acdb import (
+    Circle,
+    Database,
+    DBText,
+    Dimension,
+    Group,
+    Line,
+    MText,
+    RotatedDimension,
+)
+from sacad.crud import DBSelectQuery
+from sacad.filters import (
+    AllOf,
+    AnyOf,
+    Not,
+    in_group,
+    of_type,
+    on_layer,
+    text_like,
+    with_color,
+    with_linetype,
+)
+from sacad.jsonify import Jsonify
+
+
+class FilterTestCase(unittest.TestCase):
+    def test_combination(self):
+        a, b, c = on_layer('A'), on_layer('B'), on_layer('C')
+        self.assertEqual(a & b & c, AllOf(filters=[a, b, c]))
+        self.assertEqual(a | b | c, AnyOf(filters=[a, b, c]))
+        self.assertEqual((a & b) | c, AnyOf(filters=[AllOf(filters=[a, b]),
+                                                     c]))
+        self.assertEqual(~a, Not(filter=a))
+
+        f = ~(a | b) & with_color(1)
+        self.assertTrue(f.match(Line(layer='C', color_index=1)))
+        self.assertFalse(f.match(Line(layer='B', color_index=1)))
+        self.assertFalse(f.match(Line(layer='C', color_index=2)))
+
+    def test_serialization(self):
+        query = DBSelectQuery(
+            filter=of_type(Line) & ~(on_layer('A*') | text_like('x')))
+        payload = json.loads(query.serialize())
+        all_of = payload['__mbr__']['filter']['__mbr__']
+        self.assertEqual(all_of['$type'], 'SacadMgd.AllOf, SacadMgd')
+        self.assertEqual(all_of['filters'][1]['__mbr__']['filter']['__mbr__']
+                         ['$type'], 'SacadMgd.AnyOf, SacadMgd')
+        self.assertEqual(Jsonify.deserialize(query.serialize()), query)
+
+    def test_type(self):
+        f = of_type(Circle, Dimension)
+        self.assertIn('sacad.acdb.RotatedDimension', f.types)
+        self.assertTrue(f.match(Circle()))
+        self.assertTrue(f.match(RotatedDimension()))
+        self.assertFalse(f.match(Line()))
+
+    def test_names(self):
+        f = on_layer('WALL-*', 'door?')
+        self.assertTrue(f.match(Line(layer='wall-1')))
+        self.assertTrue(f.match(Line(layer='DOOR2')))
+        self.assertFalse(f.match(Line(layer='DOOR')))
+        self.assertFalse(f.match(Line(layer='WALL')))
+        # Everything except wildcards is taken literally.
+        self.assertFalse(on_layer('A.B').match(Line(layer='AxB')))
+        # Properties not specified are the defaults of AutoCAD.
+        self.assertTrue(on_layer('0').match(Line()))
+        self.assertTrue(with_linetype('BYLAYER').match(Line()))
+        self.assertTrue(with_linetype('Dash*').match(
+            Line(linetype='DASHED')))
+
+    def test_color(self):
+        f = with_color(1, 256)
+        self.assertTrue(f.match(Line()))
+        self.assertTrue(f.match(Line(color=Color.index(1))))
+        self.assertFalse(f.match(Line(color_index=2)))
+
+    def test_text(self):
+        f = text_like('*sacad*')
+        self.assertTrue(f.match(DBText(text_string='by sacad.')))
+        self.assertTrue(f.match(MText(contents='sacad\\P')))
+        self.assertFalse(f.match(DBText(text_string='by SACAD.')))
+        self.assertTrue(text_like('*sacad*', ignore_case=True).match(
+            DBText(text_string='by SACAD.')))
+        self.assertFalse(f.match(Line()))
+        self.assertFalse(f.match(DBText()))
+
+    def test_group(self):
+        db = Database(group_dict={'G': Group(name='G', entity_ids=[1, 2])})
+        f = in_group('G', 'missing')
+        self.assertTrue(f.match(Line(id=1), db))
+        self.assertFalse(f.match(Line(id=3), db))
+        self.assertFalse(f.match(Line(id=1)))
@@ -0,0 +1,49 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for the lazy imports of `sacad`."""
+
+import importlib
+import unittest
+
+import sacad
+
+from sacad.benchmark.import_time import SCENARIOS, loaded_modules
+
+
+class LazyImportTestCase(unittest.TestCase):
+    def test_exports(self):
+        for module, names in sacad._EXPORTS.items():
+            self.assertEqual(
+                list(names),
+                importlib.import_module(f'sacad.{module}').__all__)
+
+    def test_access(self):
+        self.assertIs(sacad.Line, importlib.import_module('sacad.acdb').Line)
+        self.assertIn('Acad', dir(sacad))
+        with self.assertRaises(AttributeError):
+            getattr(sacad, 'NoSuchThing')
+
+    def test_no_heavy_modules(self):
+        for scenario in ('import sacad', 'serialize a query'):
+            self.assertEqual(loaded_modules(SCENARIOS[scenario]), [],
+                             scenario)
+        self.assertEqual(loaded_modules(SCENARIOS['import Acad']), [])
+        self.assertIn('numpy', loaded_modules(SCENARIOS['import Matrix3d']))
+
+    def test_deserialize_lazy_class(self):
+        # Matrix3d is defined only on access, which a fresh interpreter
+        # deserializing it has never made.
+        code = ('from sacad.jsonify import Jsonify\n'
+                'm = Jsonify.deserialize(\'{"__cls__": "sacad.acge.Matrix3d",'
+                ' "__mbr__": [%s]}\' % ", ".join(["1.0"] * 16))\n'
+                'assert type(m).__name__ == "Matrix3d" and m[3, 3] == 1.0')
+        self.assertIn('numpy', loaded_modules(code))
@@ -0,0 +1,123 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.jsonify`."""
+
+import json
+import unittest
+
+from sacad.acdb import BlockTableRecord, Database, DBText, Line, MODEL_SPACE
+from sacad.error import JsonifyError
+from sacad.jsonify import Fragment, Jsonify, Stream
+
+
+class FragmentTestCase(unittest.TestCase):
+    def test_splice(self):
+        lines = [Line.new(0, 0, i, i) for i in range(3)]
+        text = DBText(text_string='"x"')
+
+        expected = Database()
+        expected.get_block(MODEL_SPACE).entities.extend([text, *lines])
+        actual = Database()
+        actual.get_block(MODEL_SPACE).entities.extend(
+            [text, Fragment.of(lines[:2]), Fragment.of([]),
+             Fragment.of(lines[2:])])
+
+        self.assertEqual(json.loads(actual.serialize()),
+                         json.loads(expected.serialize()))
+
+    def test_dict_value(self):
+        block = BlockTableRecord(name='B', entities=[Line()])
+        fragment = Fragment.of([block])
+        db = Database(block_table={'B': fragment})
+
+        self.assertEqual(fragment.names, ['B'])
+        self.assertEqual(Jsonify.deserialize(db.serialize()).block_table['B'],
+                         block)
+
+    def test_placeholder_like_string(self):
+        db = Database()
+        db.get_block(MODEL_SPACE).entities.append(Fragment.of([Line()]))
+        payload = db.serialize()
+        self.assertNotIn('Fragment', payload)
+
+        # Strings of the payload are never taken for placeholders.
+        db.get_block(MODEL_SPACE).entities.append(
+            DBText(text_string='0123456789abcdef0123456789abcdef:0'))
+        entities = Jsonify.deserialize(db.serialize()).get_block(
+            MODEL_SPACE).entities
+        self.assertEqual(entities[1].text_string,
+                         '0123456789abcdef0123456789abcdef:0')
+
+    def test_ids_and_count(self):
+        fragment = Fragment.of([Line(id=1), Line(), Line(id=3)])
+        self.assertEqual(fragment.ids, [1, 3])
+        self.assertEqual(Fragment.count_in([Line(), fragment]), 4)
+
+
+class StreamTestCase(unittest.TestCase):
+    @staticmethod
+    def database(*entities) -> Database:
+        db = Database()
+        db.get_block(MODEL_SPACE).entities.extend(entities)
+        return db
+
+    def test_serialize_iter(self):
+        lines = [Line.new(0, 0, i, i) for i in range(5)]
+        text = DBText(text_string='x')
+        drawn = []
+
+        def generate():
+            for line in lines:
+                drawn.append(line)
+                yield line
+
+        db = self.database(text, Stream(generate()), Fragment.of(lines[:1]))
+        pieces = db.serialize_iter(chunk_size=2)
+        self.assertEqual(drawn, [])
+        payload = ''.join(pieces)
+        self.assertEqual(payload,
+                         self.database(text, *lines, lines[0]).serialize())
+        self.assertEqual(Fragment.count_in(
+            db.get_block(MODEL_SPACE).entities), 7)
+
+        with self.assertRaises(JsonifyError):
+            db.serialize()
+
+    def test_chunks_drawn_while_consumed(self):
+        drawn = []
+        stream = Stream(drawn.append(i) or Line() for i in range(5))
+        chunks = stream.chunks(2)
+        next(chunks)
+        self.assertEqual(drawn, [0, 1])
+        self.assertEqual(len(list(chunks)), 2)
+        self.assertEqual(stream.count, 5)
+
+    def test_empty_streams(self):
+        line = Line()
+        for entities in ([], [line], [line, line]):
+            for k in range(len(entities) + 1):
+                for streams in ([Stream([])], [Stream([]), Stream([])],
+                                [Stream([]), Stream([line])],
+                                [Stream([line]), Stream([])]):
+                    drawn = [line] * sum(len(s.objects) for s in streams)
+                    db = self.database(*entities[:k], *streams,
+                                       *entities[k:])
+                    expected = self.database(*entities[:k], *drawn,
+                                             *entities[k:])
+                    self.assertEqual(''.join(db.serialize_iter()),
+                                     expected.serialize())
+
+    def test_fragments_in_stream(self):
+        lines = [Line.new(0, 0, i, i) for i in range(3)]
+        db = self.database(Stream(
+            [Fragment.of(lines[:2]), Fragment.of([]), lines[2]]))
+        self.assertEqual(db.serialize(), self.database(*lines).serialize())
@@ -0,0 +1,488 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.loopback`."""
+
+import asyncio
+import math
+import threading
+import unittest
+
+from unittest import mock
+
+from sacad.acdb import (
+    Circle,
+    DBText,
+    Entity,
+    Group,
+    LayerTableRecord,
+    Line,
+    MODEL_SPACE,
+    Polyline,
+    Vertex,
+)
+from sacad.acge import Vector3d
+from sacad.aggregate import Aggregate, GroupKey
+from sacad.cache import TableCache
+from sacad.crud import (
+    DBDelete,
+    DBDeleteQuery,
+    DBInsert,
+    DBInsertQuery,
+    DBSelect,
+    DBSelectQuery,
+    DBUpdate,
+    DBUpdateQuery,
+    SelectMode,
+    TableFlags,
+)
+from sacad.error import AcadComError, AcadTcpError, QueryError
+from sacad.filters import in_group, of_type, on_layer
+from sacad.loopback import LoopbackAcad, LoopbackSession
+from sacad.projection import ids_only, project
+from sacad.result import Status
+from sacad.retry import FixedRetryPolicy
+
+
+class LoopbackTestCase(unittest.TestCase):
+    def setUp(self):
+        self.acad = LoopbackAcad()
+        self.session = LoopbackSession(
+            self.acad, retry_policy=FixedRetryPolicy(0, 3))
+        self.session.open()
+
+    def tearDown(self):
+        self.session.close()
+
+    def insert(self, *entities, **kwargs) -> DBInsert:
+        op = DBInsert(self.session, DBInsertQuery(**kwargs))
+        op.model_space.insert_many(entities)
+        return op
+
+    def select_model_space(self):
+        result = DBSelect(self.session, DBSelectQuery(
+            mode=SelectMode.GET_TABLES,
+            table_flags=TableFlags.MODEL_SPACE)).submit()
+        return result.db.get_block(MODEL_SPACE).entities
+
+    def test_insert_and_select(self):
+        op = self.insert(Line(), Circle(radius=2), Line(layer='missing'))
+        op.layer_table.insert(LayerTableRecord(name='L'))
+        result = op.submit()
+        self.assertEqual(result.status, Status.WARNING)
+        self.assertEqual((result.num_inserted, result.num_failure), (3, 1))
+
+        entities = self.select_model_space()
+        self.assertEqual([type(e) for e in entities], [Line, Circle])
+        self.assertEqual(entities[1].radius, 2)
+        self.assertEqual(len({e.id for e in entities}), 2)
+
+        result = DBSelect(self.session, DBSelectQuery(
+            mode=SelectMode.GET_TABLES,
+            table_flags=TableFlags.LAYER)).submit()
+        self.assertEqual(sorted(result.db.layer_table), ['0', 'L'])
+
+    def test_filter(self):
+        op = self.insert(Line(layer='L'), Circle(layer='L'), Line(),
+                         Circle())
+        op.layer_table.insert(LayerTableRecord(name='L'))
+        eid = op.model_space.insert_and_ref(Circle())
+        op.query.database.group_dict['G'] = Group(name='G', entity_ids=[eid])
+        op.submit()
+
+        def select(f, **kwargs):
+            result = DBSelect(self.session, DBSelectQuery(
+                filter=f, **kwargs)).submit()
+            return [(type(e), e.layer)
+                    for e in result.db.get_block(MODEL_SPACE).entities]
+
+        tables = {'mode': SelectMode.GET_TABLES,
+                  'table_flags': TableFlags.MODEL_SPACE}
+        self.assertEqual(select(of_type(Line) & ~on_layer('L'), **tables),
+                         [(Line, None)])
+        self.assertEqual(select(on_layer('l') | in_group('G'), **tables),
+                         [(Line, 'L'), (Circle, 'L'), (Circle, None)])
+
+        self.acad.selection = [e.id for e in self.acad.model_space[:3]]
+        self.assertEqual(select(of_type(Circle),
+                                mode=SelectMode.GET_USER_SELECTION),
+                         [(Circle, 'L')])
+        self.assertEqual(select(on_layer('L'), mode=SelectMode.GET_GROUPS,
+                                group_names=['G']), [])
+
+    def test_region(self):
+        self.insert(Line.new(0, 0, 10, 10), Circle.new(20, 20, 5),
+                    Polyline.new(Vertex.new(0, 30), Vertex.new(30, 30)),
+                    DBText.new(50, 50, 'x')).submit()
+
+        def select(mode, *xys):
+            result = DBSelect(self.session, DBSelectQuery(
+                mode=mode, region=[Vector3d(x, y) for x, y in xys])).submit()
+            return [type(e)
+                    for e in result.db.get_block(MODEL_SPACE).entities]
+
+        self.assertEqual(select(SelectMode.WINDOW, (-1, -1), (24, 24)),
+                         [Line])
+        self.assertEqual(select(SelectMode.CROSSING, (-1, -1), (24, 31)),
+                         [Line, Circle, Polyline])
+        # Extents of the line are not inside the triangle, though the line is.
+        self.assertEqual(select(SelectMode.WINDOW, (-1, -1), (60, -1),
+                                (60, 60)), [DBText])
+        self.assertEqual(select(SelectMode.FENCE, (5, 40), (25, 10)),
+                         [Circle, Polyline])
+
+    def test_projection(self):
+        op = self.insert(Line.new(0, 0, 10, 10, layer='L'),
+                         Circle.new(20, 20, 5, layer='L'))
+        op.layer_table.insert(LayerTableRecord(name='L'))
+        op.submit()
+
+        def select(projection):
+            return DBSelect(self.session, DBSelectQuery(
+                mode=SelectMode.GET_TABLES, table_flags=TableFlags.MODEL_SPACE,
+                projection=projection)).submit().db.get_block(
+                MODEL_SPACE).entities
+
+        line, circle = select(project('layer', types={Circle: ['radius']}))
+        self.assertEqual(line, Line(id=line.id, layer='L'))
+        self.assertEqual(circle, Circle(id=circle.id, radius=5))
+        self.assertEqual([type(e) for e in select(ids_only())],
+                         [Line, Circle])
+        self.assertTrue(all(e.id is not None and e.layer is None
+                            for e in select(ids_only())))
+        # What is stored is never projected.
+        self.assertEqual(self.acad.model_space[0].layer, 'L')
+
+    def test_pages(self):
+        self.insert(*[Line.new(i, 0, i, 1) for i in range(5)]).submit()
+        op = DBSelect(self.session, DBSelectQuery(
+            mode=SelectMode.GET_TABLES,
+            table_flags=TableFlags.MODEL_SPACE | TableFlags.LAYER))
+
+        pages = list(op.pages(2))
+        self.assertEqual([len(p.db.get_block(MODEL_SPACE).entities)
+                          for p in pages], [2, 2, 1])
+        self.assertEqual([p.cursor is None for p in pages],
+                         [False, False, True])
+        # Symbol tables are selected with the first page.
+        self.assertIn('0', pages[0].db.layer_table)
+        self.assertFalse(pages[1].db.layer_table)
+
+        ids = [e.id for e in self.acad.model_space]
+        self.assertEqual([e.id for e in op.iter_entities(2)], ids)
+        self.assertEqual([e.id for e in op.iter_entities(5)], ids)
+        self.assertEqual(len(list(op.pages(5))), 1)
+        self.assertIsNone(op.query.cursor)
+
+        async def collect():
+            return [e.id async for e in op.aiter_entities(3)]
+
+        # Every page is fetched by the same thread.
+        threads = set()
+        db_operation = self.session.db_operation
+        self.session.db_operation = lambda msg: (
+            threads.add(threading.get_ident()), db_operation(msg))[1]
+        self.assertEqual(asyncio.run(collect()), ids)
+        self.assertEqual(len(threads), 1)
+
+    def test_pages_modified(self):
+        self.insert(*[Line.new(i, 0, i, 1) for i in range(4)]).submit()
+        op = DBSelect(self.session, DBSelectQuery(
+            mode=SelectMode.GET_TABLES, table_flags=TableFlags.MODEL_SPACE))
+
+        entities = op.iter_entities(2)
+        first = [next(entities), next(entities)]
+        # Entities appended between pages are selected.
+        self.insert(Circle.new(0, 0, 1)).submit()
+        self.assertEqual([type(e) for e in entities], [Line, Line, Circle])
+
+        # The last entity of the page being erased, the cursor is stale.
+        pages = op.pages(2)
+        next(pages)
+        self.acad.model_space.remove(
+            next(e for e in self.acad.model_space if e.id == first[1].id))
+        page = next(pages)
+        self.assertEqual(page.status, Status.FAILURE)
+        self.assertIsNone(next(pages, None))
+        with self.assertRaises(QueryError):
+            list(DBSelect(self.session, DBSelectQuery(
+                mode=SelectMode.GET_USER_SELECTION)).iter_entities())
+
+    def test_aggregate(self):
+        op = self.insert(Line.new(0, 0, 3, 4, layer='L'),
+                         Line.new(0, 0, 0, 1), Circle.new(0, 0, 1, layer='L'))
+        op.layer_table.insert(LayerTableRecord(name='L'))
+        op.submit()
+
+        def select(**kwargs):
+            return DBSelect(self.session, DBSelectQuery(
+                mode=SelectMode.AGGREGATE, **kwargs)).submit().rows
+
+        rows = select(group_by=[GroupKey.LAYER],
+                      aggregates=[Aggregate.COUNT, Aggregate.LENGTH])
+        self.assertEqual([(r.key, r.count) for r in rows],
+                         [(['L'], 2), (['0'], 1)])
+        self.assertAlmostEqual(rows[0].length, 5 + 2 * math.pi)
+
+        rows = select(filter=of_type(Line))
+        self.assertEqual([(r.key, r.count) for r in rows], [([], 2)])
+
+    def test_groups_and_delete(self):
+        op = self.insert(Line())
+        eids = [op.model_space.insert_and_ref(Line()) for _ in range(2)]
+        op.query.database.group_dict['G'] = Group(name='G', entity_ids=eids)
+        op.submit()
+
+        result = DBSelect(self.session, DBSelectQuery(
+            mode=SelectMode.GET_GROUPS, group_names=['G'])).submit()
+        grouped = result.db.get_block(MODEL_SPACE).entities
+        self.assertEqual(len(grouped), 2)
+        self.assertEqual(result.db.group_dict['G'].entity_ids,
+                         [e.id for e in grouped])
+
+        op = DBDelete(self.session, DBDeleteQuery(delete_group_entities=True))
+        op.delete_group('G')
+        self.assertEqual(op.submit().num_deleted, 3)
+        self.assertEqual(len(self.select_model_space()), 1)
+
+    def test_chunked_groups(self):
+        op = self.insert()
+        eid = op.model_space.insert_and_ref(Line())
+        op.query.database.group_dict['G'] = Group(name='G', entity_ids=[eid])
+        op.submit()
+
+        op = self.insert(upsert=True)
+        eids = [op.model_space.insert_and_ref(Line()) for _ in range(4)]
+        op.query.database.group_dict['G'] = Group(name='G', entity_ids=eids)
+        result = op.submit(chunk_size=2)
+
+        self.assertEqual((result.num_inserted, result.num_updated), (4, 1))
+        self.assertEqual(len(self.acad.database.group_dict['G'].entity_ids),
+                         5)
+
+    def test_delete_by_id(self):
+        self.insert(Line(), Line(), Line()).submit()
+        entities = self.select_model_space()
+
+        query = DBDeleteQuery()
+        query.database.get_block(MODEL_SPACE).entities.extend(entities[:2])
+        self.assertEqual(DBDelete(self.session, query).submit().num_deleted, 2)
+        self.assertEqual([e.id for e in self.select_model_space()],
+                         [entities[2].id])
+
+    def test_delete_where(self):
+        op = self.insert(Line(layer='A', start_point=Vector3d(0, 0, 0),
+                              end_point=Vector3d(1, 1, 0)),
+                         Line(layer='A', start_point=Vector3d(5, 5, 0),
+                              end_point=Vector3d(6, 6, 0)),
+                         Circle(center=Vector3d(0, 0, 0), radius=1),
+                         Circle(center=Vector3d(9, 9, 0), radius=1))
+        op.layer_table.insert(LayerTableRecord(name='A'))
+        op.submit()
+        ids = [e.id for e in self.select_model_space()]
+
+        op = DBDelete(self.session, DBDeleteQuery())
+        op.delete_where(on_layer('A'), [Vector3d(-1, -1), Vector3d(2, 2)])
+        op.delete_entities([ids[0], ids[3]])
+        self.assertEqual(op.submit().num_deleted, 2)
+        self.assertEqual([e.id for e in self.select_model_space()],
+                         ids[1:3])
+
+        op = DBDelete(self.session, DBDeleteQuery())
+        op.delete_where(of_type(Circle))
+        self.assertEqual(op.submit().num_deleted, 1)
+        self.assertEqual([e.id for e in self.select_model_space()],
+                         [ids[1]])
+
+        with self.assertRaises(ValueError):
+            op.delete_where(None)
+
+    def test_table_cache(self):
+        cache = TableCache()
+
+        def select():
+            return DBSelect(self.session, DBSelectQuery(
+                mode=SelectMode.GET_TABLES,
+                table_flags=TableFlags.LAYER | TableFlags.TEXT_STYLE),
+                cache=cache).submit()
+
+        self.assertIn('0', select().db.layer_table)
+        result = select()
+        self.assertIn('0', result.db.layer_table)
+        self.assertIn('Standard', result.db.text_style_table)
+        self.assertEqual(cache.hits, 2)
+
+        # Tables of the versions cached are not sent back.
+        result = self.acad.execute_query(DBSelectQuery(
+            mode=SelectMode.GET_TABLES, table_flags=TableFlags.LAYER,
+            table_versions=cache.versions()))
+        self.assertEqual(result.db.layer_table, {})
+
+        op = self.insert()
+        op.layer_table.insert(LayerTableRecord(name='A'))
+        op.submit()
+        self.assertEqual(sorted(select().db.layer_table), ['0', 'A'])
+        self.assertEqual(cache.misses, 3)
+
+        # Pages go through the cache too.
+        page = next(DBSelect(self.session, DBSelectQuery(
+            mode=SelectMode.GET_TABLES, table_flags=TableFlags.LAYER),
+            cache=cache).pages(10))
+        self.assertEqual(sorted(page.db.layer_table), ['0', 'A'])
+        self.assertEqual(cache.hits, 4)
+
+    def test_diff_upsert(self):
+        cache = TableCache()
+
+        def upsert(*layers):
+            op = DBInsert(self.session, DBInsertQuery(upsert=True),
+                          cache=cache)
+            for layer in layers:
+                op.layer_table.insert(layer)
+            return op, op.submit()
+
+        _, result = upsert(LayerTableRecord(name='A', is_off=False),
+                           LayerTableRecord(name='B', is_off=False))
+        self.assertEqual((result.num_inserted, result.num_unchanged), (2, 0))
+
+        op, result = upsert(LayerTableRecord(name='A', is_off=False),
+                            LayerTableRecord(name='B', is_off=True),
+                            LayerTableRecord(name='C'))
+        self.assertEqual((result.num_inserted, result.num_updated,
+                          result.num_unchanged), (1, 1, 1))
+        # The records declared are kept.
+        self.assertEqual(sorted(op.query.database.layer_table),
+                         ['A', 'B', 'C'])
+        self.assertTrue(self.acad.database.layer_table['B'].is_off)
+
+    def test_update(self):
+        self.insert(Line(), Line(), Circle(radius=1)).submit()
+        entities = self.select_model_space()
+
+        op = DBUpdate(self.session, DBUpdateQuery())
+        op.track(*entities)
+        entities[0].end_point = Vector3d(1, 1, 0)
+        entities[2].radius = 2
+        result = op.submit()
+        self.assertEqual(result.status, Status.SUCCESS)
+        self.assertEqual(result.num_updated, 2)
+        # Nothing is changed since submitted.
+        self.assertEqual(op.submit().num_updated, 0)
+
+        op = DBUpdate(self.session, DBUpdateQuery())
+        op.patch([e.id for e in entities], Entity, color_index=3)
+        op.patch(entities[1].id, Circle, radius=1)  # Not a circle.
+        op.patch(max(e.id for e in entities) + 1, color_index=3)
+        result = op.submit()
+        self.assertEqual(result.status, Status.WARNING)
+        self.assertEqual((result.num_updated, result.num_failure), (3, 2))
+
+        line, _, circle = self.select_model_space()
+        self.assertEqual(line.end_point, Vector3d(1, 1, 0))
+        self.assertEqual(circle.radius, 2)
+        self.assertEqual(circle.color_index, 3)
+
+    def test_update_where(self):
+        op = self.insert(Line(layer='A'), Circle(layer='A'), Line())
+        op.layer_table.insert(LayerTableRecord(name='A'))
+        op.layer_table.insert(LayerTableRecord(name='B'))
+        op.submit()
+
+        result = DBUpdate(self.session, DBUpdateQuery()).assign(
+            on_layer('A'), layer='B').submit()
+        self.assertEqual((result.status, result.num_updated),
+                         (Status.SUCCESS, 2))
+        self.assertEqual(result.serialize().count('__cls__'), 1)
+
+        result = DBUpdate(self.session, DBUpdateQuery()).assign(
+            None, Line, linetype_scale=2.0).submit()
+        self.assertEqual(result.num_updated, 2)
+        self.assertEqual([e.linetype_scale for e in self.select_model_space()],
+                         [2.0, None, 2.0])
+        self.assertEqual([e.layer for e in self.select_model_space()],
+                         ['B', 'B', None])
+
+        result = DBUpdate(self.session, DBUpdateQuery()).assign(
+            on_layer('B'), layer='missing').submit()
+        self.assertEqual((result.status, result.num_failure),
+                         (Status.FAILURE, 1))
+
+    def test_lazy_insert(self):
+        drawn, threads = [], set()
+
+        def generate(n):
+            for i in range(n):
+                drawn.append(i)
+                threads.add(threading.current_thread())
+                yield Circle(radius=i + 1)
+
+        for serving in (False, True):
+            if serving:
+                self.session.start_serving(idle_timeout=10)
+            op = DBInsert(self.session, DBInsertQuery())
+            op.model_space.insert(Line())
+            op.model_space.insert_many(generate(50), lazy=True)
+            self.assertEqual(drawn, [])
+
+            # Small chunks, so that the request is sent in many of them.
+            with mock.patch('sacad.config.stream_chunk_bytes', 256):
+                result = op.submit()
+            self.assertEqual(result.num_inserted, 51)
+            self.assertEqual(len(drawn), 50)
+            drawn.clear()
+
+        radii = [e.radius for e in self.select_model_space()
+                 if isinstance(e, Circle)]
+        self.assertEqual(radii, list(range(1, 51)) * 2)
+        # Pieces are never drawn by the event loop of the requester.
+        self.assertNotIn(self.session._req._thread, threads)
+
+        op = self.insert(Line())
+        op.model_space.insert_many(generate(1), lazy=True)
+        with self.assertRaises(ValueError):
+            op.submit(chunk_size=10)
+
+    def test_serving(self):
+        self.session.start_serving(idle_timeout=10)
+        for _ in range(5):
+            self.insert(Line()).submit()
+        self.session.stop_serving()
+
+        self.assertEqual(len(self.acad.model_space), 5)
+        self.assertEqual(
+            self.session.com_acad.commands,
+            ['NETLOAD', 'SACAD_CONNECT', 'SACAD_PING', 'SACAD_SERVE'])
+
+    def test_busy(self):
+        com = self.session.com_acad
+        self.acad.reject_commands(2)
+        self.assertEqual(self.insert(Line()).submit().status, Status.SUCCESS)
+        self.assertEqual(com.retry_stats.rejected_attempts, 2)
+        self.assertEqual(com.retry_stats.retries, 2)
+
+        # Reopening the session after the failed ping fails as well.
+        self.acad.reject_commands(100)
+        with self.assertRaises(AcadComError):
+            self.insert(Line()).submit()
+        self.assertEqual(com.retry_stats.failures, 1)
+
+    def test_disconnect(self):
+        # Otherwise the dropped request would be the ping of is_alive, from
+        # which the session recovers silently.
+        self.session.start_serving(idle_timeout=10)
+        self.acad.drop_requests()
+        with self.assertRaises(AcadTcpError):
+            self.insert(Line()).submit()
+        self.assertIsNone(self.session.com_acad)
+
+        # The session is reopened by the next submission.
+        self.assertEqual(self.insert(Line()).submit().status, Status.SUCCESS)
+        self.assertEqual(len(self.acad.model_space), 1)
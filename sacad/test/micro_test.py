@@ -0,0 +1,49 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.benchmark.micro`."""
+
+import os
+import tempfile
+import unittest
+
+from sacad.benchmark import micro
+
+
+class MicroBenchmarkTestCase(unittest.TestCase):
+    def test_benchmarks_run(self):
+        for name, setup in micro.BENCHMARKS.items():
+            with self.subTest(name):
+                setup()()
+
+    def test_select(self):
+        self.assertEqual(micro.select(['Vector2d*']),
+                         ['Vector2d add/mul', 'Vector2d rotate'])
+        self.assertEqual(micro.select(), list(micro.BENCHMARKS))
+
+    def test_baseline(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'baseline.json')
+            micro.save_baseline(path, {'a': 1e-6})
+            self.assertEqual(micro.load_baseline(path), {'a': 1e-6})
+
+    def test_compare(self):
+        comparisons = micro.compare(
+            {'same': 1.0, 'slow': 1.5, 'fast': 0.5, 'new': 1.0},
+            {'same': 1.05, 'slow': 1.0, 'fast': 1.0, 'gone': 1.0})
+        self.assertEqual(
+            {c.name: c.verdict(0.1) for c in comparisons},
+            {'same': '', 'slow': 'slower', 'fast': 'faster', 'new': 'new',
+             'gone': 'missing'})
+
+        report = micro.report(comparisons).splitlines()
+        self.assertEqual(len(report), 6)
+        self.assertRegex(report[2], r'^slow +1\.00 s +1\.50 s +1\.50  slower$')
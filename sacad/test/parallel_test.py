@@ -0,0 +1,64 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.parallel`."""
+
+import json
+import unittest
+
+from sacad.acdb import BlockTableRecord, Line, MODEL_SPACE
+from sacad.crud import DBInsert, DBInsertQuery
+from sacad.parallel import FragmentPool
+
+
+def _lines(start, stop):
+    return [Line.new(0, 0, i, i) for i in range(start, stop)]
+
+
+def _block(name):
+    return BlockTableRecord(name=name, entities=_lines(0, 2))
+
+
+class FragmentPoolTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = FragmentPool(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_same_payload(self):
+        expected = DBInsert(None, DBInsertQuery())
+        expected.block_table.insert(_block('B'))
+        expected.model_space.insert_many(_lines(0, 100))
+
+        actual = DBInsert(None, DBInsertQuery())
+        actual.block_table.insert_fragment(
+            self.pool.submit(_block, 'B').result())
+        for fragment in self.pool.map(_lines, [0, 30, 60, 90],
+                                      [30, 60, 90, 100]):
+            actual.model_space.insert_fragment(fragment)
+
+        self.assertEqual(json.loads(actual.query.serialize()),
+                         json.loads(expected.query.serialize()))
+
+    def test_serialize(self):
+        fragments = list(self.pool.serialize(_lines(0, 25), batch_size=10))
+        self.assertEqual([f.count for f in fragments], [10, 10, 5])
+
+        insert = DBInsert(None, DBInsertQuery())
+        for fragment in fragments:
+            insert.model_space.insert_fragment(fragment)
+        query = json.loads(insert.query.serialize())
+        entities = query['__mbr__']['database']['__mbr__']['block_table'][
+            MODEL_SPACE]['__mbr__']['entities']
+        self.assertEqual(len(entities), 25)
@@ -0,0 +1,180 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.pool`."""
+
+import threading
+import time
+import unittest
+
+from sacad.acdb import Line, MODEL_SPACE
+from sacad.crud import (
+    DBInsertQuery,
+    DBSelectQuery,
+    SelectMode,
+    TableFlags,
+)
+from sacad.error import AcadTcpError, SessionError
+from sacad.loopback import LoopbackAcad, LoopbackSession
+from sacad.pool import SessionPool
+from sacad.result import Status
+
+
+class _Session:
+    def __init__(self, acad_name, host, port):
+        self.port = port
+        self.com_acad = None
+        self.opened = 0
+        self.broken = False
+
+    def open(self, netload=True):
+        self.opened += 1
+        self.com_acad = object()
+        self.broken = False
+
+    def reset(self):
+        self.com_acad = None
+
+    def close(self):
+        self.com_acad = None
+
+
+def _sleep_and_tell_port(session, seconds):
+    time.sleep(seconds)
+    return session.port
+
+
+def _fail_once(session):
+    if not session.broken and session.opened == 1:
+        session.broken = True
+        raise AcadTcpError
+    return session.opened
+
+
+class SessionPoolTestCase(unittest.TestCase):
+    def new_pool(self, size):
+        return SessionPool(size, base_port=50000, sta=False,
+                           session_factory=_Session)
+
+    def test_distinct_ports(self):
+        with self.new_pool(3) as pool:
+            ports = [s.port for s in pool.sessions]
+        self.assertEqual(ports, [50000, 50001, 50002])
+
+    def test_spread_over_sessions(self):
+        with self.new_pool(3) as pool:
+            futures = [pool.submit(_sleep_and_tell_port, 0.02)
+                       for _ in range(12)]
+            ports = {f.result() for f in futures}
+            stats = pool.stats()
+
+        self.assertEqual(ports, {50000, 50001, 50002})
+        self.assertEqual(sum(s.jobs_done for s in stats), 12)
+        self.assertTrue(all(0 < s.utilisation <= 1 for s in stats))
+
+    def test_work_stealing(self):
+        with self.new_pool(2) as pool:
+            gate = threading.Event()
+            blocked = pool.submit(lambda session: gate.wait(5))
+            futures = [pool.submit(_sleep_and_tell_port, 0.01)
+                       for _ in range(10)]
+            for f in futures:
+                f.result(timeout=5)
+            gate.set()
+            blocked.result()
+            stats = pool.stats()
+
+        self.assertGreater(sum(s.jobs_stolen for s in stats), 0)
+        self.assertEqual(sum(s.jobs_done for s in stats), 11)
+
+    def test_restart_on_connection_error(self):
+        with self.new_pool(1) as pool:
+            self.assertEqual(
+                pool.submit(_fail_once, idempotent=True).result(), 2)
+            stats = pool.stats()
+
+        self.assertEqual(stats[0].restarts, 1)
+        self.assertEqual(stats[0].jobs_done, 1)
+
+    def test_no_replay_by_default(self):
+        with self.new_pool(1) as pool:
+            with self.assertRaises(AcadTcpError):
+                pool.submit(_fail_once).result()
+            # The session is reopened by the next job.
+            self.assertEqual(pool.submit(_fail_once).result(), 2)
+            stats = pool.stats()
+
+        self.assertEqual((stats[0].jobs_failed, stats[0].jobs_done), (1, 1))
+
+    def test_job_exception(self):
+        with self.new_pool(1) as pool:
+            fut = pool.submit(lambda session: 1 / 0)
+            with self.assertRaises(ZeroDivisionError):
+                fut.result()
+            self.assertEqual(pool.stats()[0].jobs_failed, 1)
+
+    def test_submit_after_close(self):
+        pool = self.new_pool(1)
+        pool.close()
+        with self.assertRaises(SessionError):
+            pool.submit(_sleep_and_tell_port, 0)
+
+
+class LoopbackPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.acad = LoopbackAcad()
+        self.pool = SessionPool(
+            1, netload=False, sta=False,
+            session_factory=lambda *_: LoopbackSession(
+                self.acad, new_instance=True))
+
+    def tearDown(self):
+        self.pool.close()
+
+    def select(self):
+        result = self.pool.submit_query(DBSelectQuery(
+            mode=SelectMode.GET_TABLES,
+            table_flags=TableFlags.MODEL_SPACE)).result(timeout=5)
+        self.assertEqual(result.status, Status.SUCCESS)
+
+    def test_restart_reattaches_instance(self):
+        self.select()
+        for _ in range(3):
+            self.acad.drop_requests()
+            self.select()
+
+        com = self.pool.sessions[0].com_acad
+        self.assertEqual(self.acad.live_instances, 1)
+        self.assertEqual(com.commands.count('SACAD_CONNECT'), 4)
+
+    def test_crashed_instance_replaced(self):
+        self.select()
+        crashed = self.pool.sessions[0].com_acad
+        crashed.crash()
+        self.select()
+
+        self.assertIsNot(self.pool.sessions[0].com_acad, crashed)
+        self.assertEqual(self.acad.live_instances, 1)
+
+    def test_no_replay_after_execution(self):
+        self.select()
+        query = DBInsertQuery()
+        query.database.get_block(MODEL_SPACE).entities.append(Line())
+
+        self.acad.drop_responses()
+        with self.assertRaises(AcadTcpError):
+            self.pool.submit_query(query).result(timeout=5)
+        self.assertEqual(len(self.acad.model_space), 1)
+
+        # Selections are replayed, and the session is usable again.
+        self.acad.drop_responses()
+        self.select()
+        self.assertEqual(self.pool.stats()[0].restarts, 1)
@@ -0,0 +1,65 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.projection`."""
+
+import json
+import unittest
+
+from sacad.acdb import Circle, Dimension, Line, Polyline, RotatedDimension
+from sacad.crud import DBSelectQuery
+from sacad.jsonify import Jsonify
+from sacad.projection import Projection, ids_only, project
+
+
+class ProjectionTestCase(unittest.TestCase):
+    def test_fields(self):
+        line = Line.new(0, 0, 1, 1, id=1, layer='L', color_index=1)
+        self.assertEqual(project('layer').apply(line), Line(id=1, layer='L'))
+        self.assertEqual(ids_only().apply(line), Line(id=1))
+        self.assertIs(Projection().apply(line), line)
+        # Fields unknown to a type are ignored.
+        self.assertEqual(project('radius').apply(line), Line(id=1))
+
+    def test_types(self):
+        p = project('layer', types={Line: ['start_point'],
+                                    Dimension: ['measurement']})
+        self.assertIn('sacad.acdb.RotatedDimension', p.type_fields)
+
+        line = Line.new(0, 0, 1, 1, id=1, layer='L')
+        self.assertEqual(p.apply(line),
+                         Line(id=1, start_point=line.start_point))
+        self.assertEqual(p.apply(Circle.new(0, 0, 1, id=2, layer='L')),
+                         Circle(id=2, layer='L'))
+        self.assertEqual(
+            p.apply(RotatedDimension(id=3, measurement=1.0, layer='L')),
+            RotatedDimension(id=3, measurement=1.0))
+
+        # Other types keep all fields, if no fields given.
+        circle = Circle.new(0, 0, 1, id=2)
+        self.assertIs(project(types={Line: []}).apply(circle), circle)
+
+    def test_decoded(self):
+        polyline = Polyline(id=1, layer='L', closed=True)
+        projected = ids_only().apply(polyline)
+        # The same as decoded from what SacadMgd sends.
+        self.assertEqual(Jsonify.deserialize(projected.serialize()),
+                         projected)
+
+    def test_serialization(self):
+        query = DBSelectQuery(projection=project('layer', types={
+            Line: ['layer', 'start_point']}))
+        payload = json.loads(query.serialize())
+        projection = payload['__mbr__']['projection']['__mbr__']
+        self.assertEqual(projection['fields'], ['layer'])
+        self.assertEqual(projection['type_fields']['sacad.acdb.Line'],
+                         ['layer', 'start_point'])
+        self.assertEqual(Jsonify.deserialize(query.serialize()), query)
@@ -0,0 +1,70 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.region`."""
+
+import unittest
+
+from sacad.acdb import Extents3d
+from sacad.acge import Vector3d
+from sacad.region import in_crossing, in_fence, in_window
+
+
+def box(x0, y0, x1, y1) -> Extents3d:
+    return Extents3d(Vector3d(x0, y0), Vector3d(x1, y1))
+
+
+def points(*xys):
+    return [Vector3d(x, y) for x, y in xys]
+
+
+class RegionTestCase(unittest.TestCase):
+    def test_rectangle(self):
+        rect = points((10, 10), (0, 0))
+        for extents, window, crossing in [
+            (box(1, 1, 2, 2), True, True),
+            (box(0, 0, 10, 10), True, True),     # boundary is inclusive
+            (box(5, 5, 15, 6), False, True),
+            (box(-5, -5, 15, 15), False, True),  # window inside extents
+            (box(10, 11, 12, 12), False, False),
+            (box(3, 3, 3, 3), True, True),       # a point
+        ]:
+            self.assertEqual(in_window(extents, rect), window, extents)
+            self.assertEqual(in_crossing(extents, rect), crossing, extents)
+
+    def test_concave_polygon(self):
+        # A "U" whose notch is x in (4, 6), y > 2.
+        u = points((0, 0), (10, 0), (10, 10), (6, 10), (6, 2), (4, 2),
+                   (4, 10), (0, 10))
+        for extents, window, crossing in [
+            (box(1, 1, 3, 9), True, True),
+            (box(1, 1, 9, 1.5), True, True),
+            (box(1, 1, 9, 3), False, True),     # across the notch
+            (box(4.5, 3, 5.5, 9), False, False),
+            (box(4.5, 1, 5.5, 3), False, True),
+        ]:
+            self.assertEqual(in_window(extents, u), window, extents)
+            self.assertEqual(in_crossing(extents, u), crossing, extents)
+
+    def test_fence(self):
+        fence = points((0, 0), (10, 10), (20, 0))
+        self.assertTrue(in_fence(box(4, 4, 6, 6), fence))
+        self.assertTrue(in_fence(box(4, 5, 5, 6), fence))  # touching corner
+        self.assertFalse(in_fence(box(4, 6, 5, 7), fence))
+        self.assertTrue(in_fence(box(14, 5, 16, 9), fence))
+        self.assertFalse(in_fence(box(8, 0, 12, 6), fence))  # under the peak
+        self.assertTrue(in_fence(box(-1, -1, 1, 1), points((0, 0), (0, 0))))
+
+    def test_invalid_region(self):
+        with self.assertRaises(ValueError):
+            in_window(box(0, 0, 1, 1), points((0, 0)))
+        with self.assertRaises(ValueError):
+            in_fence(box(0, 0, 1, 1), points((0, 0)))
@@ -0,0 +1,163 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.retry` and the retries of `sacad.com`."""
+
+import importlib.util
+import random
+import unittest
+
+from sacad.error import AcadComError
+from sacad.retry import (
+    AdaptiveRetryPolicy,
+    FixedRetryPolicy,
+    RetryError,
+    RetryStats,
+    retryable,
+)
+
+HAS_PYWIN32 = importlib.util.find_spec('pythoncom') is not None
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _policy(cls, clock, **kwargs):
+    return cls(sleep=clock.sleep, clock=clock, **kwargs)
+
+
+class _Busy:
+    def __init__(self, policy, rejections, seconds=0.0):
+        self.retry_policy = policy
+        self.retry_stats = RetryStats()
+        self.rejections = rejections
+        self.seconds = seconds
+
+    @retryable
+    def call(self):
+        self.retry_policy.clock.now += self.seconds
+        if self.rejections > 0:
+            self.rejections -= 1
+            raise RetryError(RuntimeError('rejected'))
+        return 'done'
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+    def test_fixed(self):
+        clock = _FakeClock()
+        policy = _policy(FixedRetryPolicy, clock, delay=0.1, max_count=3)
+        self.assertEqual(list(policy.delays()), [0.1, 0.1, 0.1])
+
+    def test_adaptive_fast_then_backoff(self):
+        clock = _FakeClock()
+        policy = _policy(AdaptiveRetryPolicy, clock, fast_count=2,
+                         fast_delay=0.001, initial_delay=0.01, factor=2,
+                         max_delay=0.04, jitter=0, budget=100)
+        delays = policy.delays()
+        self.assertEqual([next(delays) for _ in range(7)],
+                         [0.001, 0.001, 0.01, 0.02, 0.04, 0.04, 0.04])
+
+    def test_adaptive_jitter(self):
+        clock = _FakeClock()
+        policy = _policy(AdaptiveRetryPolicy, clock, fast_count=0,
+                         initial_delay=0.1, factor=1, jitter=0.5, budget=100,
+                         rng=random.Random(0))
+        delays = policy.delays()
+        for _ in range(100):
+            self.assertTrue(0.05 <= next(delays) <= 0.1)
+
+    def test_adaptive_budget(self):
+        clock = _FakeClock()
+        busy = _Busy(_policy(AdaptiveRetryPolicy, clock, budget=2.0),
+                     rejections=10 ** 6)
+        with self.assertRaises(AcadComError):
+            busy.call()
+        self.assertAlmostEqual(clock.now, 2.0)
+        self.assertAlmostEqual(busy.retry_stats.wait_seconds, 2.0)
+        self.assertEqual(busy.retry_stats.failures, 1)
+
+    def test_adaptive_budget_from_first_attempt(self):
+        clock = _FakeClock()
+        busy = _Busy(_policy(AdaptiveRetryPolicy, clock, budget=2.0),
+                     rejections=10 ** 6, seconds=1.5)
+        with self.assertRaises(AcadComError):
+            busy.call()
+        self.assertLess(busy.retry_stats.wait_seconds, 0.5)
+        self.assertEqual(busy.retry_stats.retries, 1)
+
+    def test_stats(self):
+        clock = _FakeClock()
+        busy = _Busy(_policy(FixedRetryPolicy, clock, delay=0.1), 3)
+        self.assertEqual(busy.call(), 'done')
+        self.assertEqual(busy.call(), 'done')
+
+        stats = busy.retry_stats
+        self.assertEqual(stats.calls, 2)
+        self.assertEqual(stats.rejected_attempts, 3)
+        self.assertEqual(stats.retries, 3)
+        self.assertEqual(stats.failures, 0)
+        self.assertAlmostEqual(stats.wait_seconds, 0.3)
+
+
+@unittest.skipUnless(HAS_PYWIN32, 'pywin32 is not installed.')
+class ComAcadRetryTestCase(unittest.TestCase):
+    def setUp(self):
+        import pythoncom
+        from sacad.com import ComAcad, RPC_E_CALL_REJECTED
+
+        self.clock = _FakeClock()
+        self.app = _FakeApp(pythoncom.com_error, RPC_E_CALL_REJECTED)
+        self.com = ComAcad.from_app(self.app, retry_policy=_policy(
+            AdaptiveRetryPolicy, self.clock, budget=1.0))
+
+    def test_rejected_then_accepted(self):
+        self.app.ActiveDocument.rejections = 5
+        self.com.ping('skey')
+
+        self.assertEqual(len(self.app.ActiveDocument.commands), 1)
+        self.assertEqual(self.com.retry_stats.rejected_attempts, 5)
+        self.assertLess(self.clock.now, 0.2)
+
+    def test_busy_until_budget(self):
+        self.app.ActiveDocument.rejections = 10 ** 6
+        with self.assertRaises(AcadComError):
+            self.com.ping('skey')
+        self.assertAlmostEqual(self.com.retry_stats.wait_seconds, 1.0)
+
+
+class _FakeApp:
+    def __init__(self, com_error, hresult):
+        self.ActiveDocument = _FakeDocument(com_error, hresult)
+
+
+class _FakeDocument:
+    def __init__(self, com_error, hresult):
+        self.com_error = com_error
+        self.hresult = hresult
+        self.rejections = 0
+        self.commands = []
+
+    def SendCommand(self, cmd):
+        if self.rejections > 0:
+            self.rejections -= 1
+            raise self.com_error(self.hresult, 'Call was rejected by callee.',
+                                 None, None)
+        self.commands.append(cmd)
@@ -0,0 +1,57 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.benchmark.scenario`."""
+
+import unittest
+
+from sacad.benchmark import scenario
+from sacad.loopback import LoopbackSession
+
+
+class ScenarioTestCase(unittest.TestCase):
+    def test_scenarios(self):
+        sizes = {'mandelbrot': 12, 'mandelbrot/batch': 12, 'entities': 2,
+                 'select/delete': 50}
+        for name, size in sizes.items():
+            with self.subTest(name):
+                phases = scenario.measure(scenario.SCENARIOS[name], size,
+                                          memory=False)
+                self.assertGreater(phases.entities, 0)
+                self.assertGreater(phases.serialization, 0)
+                self.assertGreater(phases.execution, 0)
+                self.assertGreaterEqual(phases.transport, 0)
+                self.assertIsNone(phases.peak_memory)
+
+    def test_run_and_report(self):
+        results = scenario.run(['entities'], [1, 2], repeat=1, serve=True)
+        self.assertEqual([p.entities for p in results['entities'].values()],
+                         [20, 40])
+        self.assertTrue(all(p.peak_memory > 0
+                            for p in results['entities'].values()))
+
+        report = scenario.report(results).splitlines()
+        self.assertEqual(len(report), 4)
+        self.assertTrue(report[2].startswith('entities'))
+
+    def test_variants_draw_the_same(self):
+        for names in (('mandelbrot', 'mandelbrot/batch'),
+                      ('entities', 'entities/lazy')):
+            drawn = []
+            for name in names:
+                session = LoopbackSession()
+                try:
+                    session.open()
+                    scenario.SCENARIOS[name](scenario.Probe(session), 24)
+                finally:
+                    session.close()
+                drawn.append(session.acad.model_space)
+            self.assertEqual(drawn[0], drawn[1], names)
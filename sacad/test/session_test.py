@@ -0,0 +1,218 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.session`."""
+
+import os
+import socket
+import tempfile
+import time
+import unittest
+
+from queue import SimpleQueue
+from threading import Thread
+from unittest import mock
+
+from sacad import config
+from sacad.result import Result, Status
+from sacad.session import Session
+
+
+class _Peer(Thread):
+    """Plays the role of SacadMgd, driven by the commands of _Com."""
+
+    def __init__(self, host, port):
+        super().__init__(daemon=True)
+        self.sock = socket.create_connection((host, port))
+        self.file = self.sock.makefile('rb')
+        self.cmds = SimpleQueue()
+
+    def run(self):
+        try:
+            while (cmd := self.cmds.get()) is not None:
+                self.execute(*cmd)
+        except (EOFError, OSError):
+            pass
+        finally:
+            self.file.close()
+            self.sock.close()
+
+    def execute(self, name, arg):
+        if name == 'ping':
+            self.send('pong' if self.recv() == 'ping' else 'error')
+        elif name in ('dbop', 'docop'):
+            self.recv()
+            self.send(Result(status=Status.SUCCESS).serialize())
+        elif name == 'serve':
+            self.serve(arg)
+
+    def serve(self, idle_timeout):
+        self.sock.settimeout(idle_timeout)
+        try:
+            while True:
+                try:
+                    op, payload = self.recv().split('\n', 1)
+                except socket.timeout:
+                    break
+                if op == 'stop':
+                    self.send('stop')
+                    break
+                elif op == 'ping':
+                    self.send('pong')
+                else:
+                    self.send(Result(status=Status.SUCCESS,
+                                     message=payload).serialize())
+        finally:
+            self.sock.settimeout(None)
+
+    def recv(self):
+        num_bytes = self.file.readline()
+        if not num_bytes:
+            raise EOFError
+        return self.file.read(int(num_bytes)).decode()
+
+    def send(self, msg):
+        data = msg.encode()
+        self.sock.sendall(f'{len(data)}\n'.encode() + data)
+
+
+class _Com:
+    def __init__(self, loaded=True):
+        self.calls = []
+        self.peer = None
+        self.loaded = loaded
+
+    def show(self):
+        pass
+
+    def netload(self, _path):
+        self.calls.append('netload')
+        self.loaded = True
+
+    def connect(self, host, _skey):
+        self.calls.append('connect')
+        if self.loaded:
+            self.peer = _Peer(*host.split(':'))
+            self.peer.start()
+
+    def ping(self, _skey):
+        self.calls.append('ping')
+        self.peer.cmds.put(('ping', None))
+
+    def dbop(self, _skey):
+        self.calls.append('dbop')
+        self.peer.cmds.put(('dbop', None))
+
+    def serve(self, _skey, idle_timeout):
+        self.calls.append('serve')
+        self.peer.cmds.put(('serve', idle_timeout))
+
+
+class _Session(Session):
+    loaded = True
+
+    def _precheck(self):
+        pass
+
+    def _new_com(self):
+        return _Com(self.loaded)
+
+
+class ServingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.session = _Session('LOOPBACK', '127.0.0.1', 0)
+        self.session._port = _free_port()
+        self.session.open(netload=False)
+        self.com = self.session.com_acad
+
+    def tearDown(self):
+        self.session.close()
+        self.com.peer.cmds.put(None)
+        self.com.peer.join()
+
+    def test_without_serving(self):
+        for _ in range(3):
+            result = Result.deserialize(self.session.db_operation('{}'))
+            self.assertEqual(result.status, Status.SUCCESS)
+        self.assertEqual(self.com.calls.count('dbop'), 3)
+
+    def test_one_command_for_many_requests(self):
+        self.session.start_serving(idle_timeout=10)
+        for i in range(100):
+            result = Result.deserialize(self.session.db_operation(str(i)))
+            self.assertEqual(result.message, str(i))
+        self.assertTrue(self.session.is_alive())
+        self.session.stop_serving()
+
+        self.assertEqual(self.com.calls, ['connect', 'ping', 'serve'])
+        self.assertFalse(self.session.is_serving())
+
+        self.session.db_operation('{}')
+        self.assertEqual(self.com.calls[-1], 'dbop')
+
+    def test_reenter_after_idle_timeout(self):
+        self.session.start_serving(idle_timeout=1.2)
+        self.session.db_operation('first')
+        time.sleep(0.3)
+        self.assertFalse(self.session.is_serving())
+
+        result = Result.deserialize(self.session.db_operation('second'))
+        self.assertEqual(result.message, 'second')
+        self.assertEqual(self.com.calls.count('serve'), 2)
+
+    def test_idle_timeout_within_margin(self):
+        for idle_timeout in (0.5, config.serve_expiry_margin_seconds):
+            with self.assertRaises(ValueError):
+                self.session.start_serving(idle_timeout=idle_timeout)
+            self.assertFalse(self.session.is_serving())
+            self.session.db_operation('{}')
+            self.assertEqual(self.com.calls[-1], 'dbop')
+
+
+class OpenTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.tmpdir.name, '2023'))
+        patcher = mock.patch.multiple(
+            config, dll_location=self.tmpdir.name, env_cache_file=None,
+            connection_probe_timeout_seconds=0.2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.session = _Session('2023', '127.0.0.1', _free_port())
+
+    def tearDown(self):
+        com = self.session.com_acad
+        self.session.close()
+        com.peer.cmds.put(None)
+        com.peer.join()
+        self.tmpdir.cleanup()
+
+    def test_skip_netload_if_loaded(self):
+        self.session.open(netload=None)
+        self.assertEqual(self.session.com_acad.calls, ['connect', 'ping'])
+
+    def test_netload_if_not_loaded(self):
+        self.session.loaded = False
+        self.session.open(netload=None)
+        self.assertEqual(self.session.com_acad.calls,
+                         ['connect', 'netload', 'connect', 'ping'])
+
+    def test_netload_by_default(self):
+        self.session.open()
+        self.assertEqual(self.session.com_acad.calls,
+                         ['netload', 'connect', 'ping'])
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
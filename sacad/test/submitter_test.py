@@ -0,0 +1,187 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.submitter`."""
+
+import importlib.util
+import threading
+import unittest
+
+from sacad.acdb import Group, LayerTableRecord, Line, MODEL_SPACE
+from sacad.crud import DBInsert, DBInsertQuery
+from sacad.error import AcadTcpError
+from sacad.jsonify import Jsonify
+from sacad.loopback import LoopbackSession
+from sacad.result import DBInsertResult, Status
+from sacad.submitter import BackgroundSubmitter
+
+HAS_PYWIN32 = importlib.util.find_spec('pythoncom') is not None
+
+
+class _Session:
+    """Inserts everything but entities on the layer named "bad"."""
+
+    def __init__(self):
+        self.queries = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def is_alive(self):
+        return True
+
+    def reset(self):
+        pass
+
+    def db_operation(self, msg):
+        self.gate.wait(5)
+        query = Jsonify.deserialize(msg)
+        self.queries.append(query)
+
+        db = query.database
+        entities = db.get_block(MODEL_SPACE).entities
+        failed = [i for i, e in enumerate(entities) if e.layer == 'bad']
+        num_records = len(db.layer_table) + len(db.group_dict)
+        return DBInsertResult(
+            status=Status.SUCCESS,
+            num_inserted=len(entities) - len(failed) + num_records,
+            num_failure=len(failed),
+            failed_entities=failed if query.report_failed_entities else None,
+        ).serialize()
+
+
+def _insert(session, *entities, **kwargs) -> DBInsert:
+    op = DBInsert(session, DBInsertQuery(**kwargs))
+    op.model_space.insert_many(entities)
+    return op
+
+
+class BackgroundSubmitterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.session = _Session()
+        self.submitter = BackgroundSubmitter(linger=0.05, sta=False)
+
+    def tearDown(self):
+        self.submitter.close()
+
+    def test_coalesce(self):
+        self.session.gate.clear()
+        futures = [self.submitter.submit(_insert(self.session, Line()))
+                   for _ in range(50)]
+        self.session.gate.set()
+        self.submitter.flush()
+
+        self.assertLessEqual(len(self.session.queries), 2)
+        self.assertEqual(sum(len(q.database.get_block(MODEL_SPACE).entities)
+                             for q in self.session.queries), 50)
+        for f in futures:
+            self.assertEqual(f.result().num_inserted, 1)
+            self.assertEqual(f.result().status, Status.SUCCESS)
+
+    def test_max_entities(self):
+        submitter = BackgroundSubmitter(max_entities=4, linger=10, sta=False)
+        with submitter:
+            futures = [submitter.submit(_insert(self.session, Line(), Line()))
+                       for _ in range(4)]
+            futures[-1].result(5)
+
+        self.assertEqual([len(q.database.get_block(MODEL_SPACE).entities)
+                          for q in self.session.queries], [4, 4])
+
+    def test_share_of_failures(self):
+        futures = [
+            self.submitter.submit(_insert(self.session, Line(), Line())),
+            self.submitter.submit(_insert(
+                self.session, Line(), Line(layer='bad'), Line())),
+            self.submitter.submit(_insert(self.session, Line(layer='bad'))),
+        ]
+        self.submitter.flush()
+        self.assertEqual(len(self.session.queries), 1)
+
+        results = [f.result() for f in futures]
+        self.assertEqual([r.num_inserted for r in results], [2, 2, 0])
+        self.assertEqual([r.num_failure for r in results], [0, 1, 1])
+        self.assertEqual([r.status for r in results],
+                         [Status.SUCCESS, Status.WARNING, Status.FAILURE])
+        self.assertEqual(results[1].failed_entities, [1])
+
+    def test_records_and_groups(self):
+        first = _insert(self.session, Line())
+        first.layer_table.insert(LayerTableRecord(name='L'))
+        second = _insert(self.session)
+        second.layer_table.insert(LayerTableRecord(name='L'))
+        for op in (first, second):
+            eid = op.model_space.insert_and_ref(Line())
+            op.query.database.group_dict['G'] = Group(
+                name='G', entity_ids=[eid])
+
+        futures = [self.submitter.submit(first), self.submitter.submit(second)]
+        self.submitter.flush()
+
+        db = self.session.queries[0].database
+        self.assertEqual(len(self.session.queries), 1)
+        self.assertEqual(len(db.group_dict['G'].entity_ids), 2)
+        self.assertEqual(futures[0].result().num_inserted, 2 + 2)
+        self.assertEqual(futures[1].result().num_inserted, 1)
+
+    def test_not_coalesced(self):
+        conflict = _insert(self.session, upsert=True)
+        conflict.layer_table.insert(LayerTableRecord(name='L', is_off=True))
+        ops = [
+            _insert(self.session, Line()),
+            _insert(self.session, Line(), upsert=True),
+            _insert(self.session, Line(), upsert=True),
+            conflict,
+        ]
+        ops[2].layer_table.insert(LayerTableRecord(name='L'))
+        futures = [self.submitter.submit(op) for op in ops]
+        self.submitter.flush()
+
+        self.assertEqual(len(self.session.queries), 3)
+        self.assertTrue(all(f.result().status == Status.SUCCESS
+                            for f in futures))
+
+    def test_exception(self):
+        def fail(_msg):
+            raise AcadTcpError('broken')
+
+        self.session.db_operation = fail
+        futures = [self.submitter.submit(_insert(self.session, Line()))
+                   for _ in range(3)]
+        for f in futures:
+            self.assertIsInstance(f.exception(5), AcadTcpError)
+
+
+class SessionThreadTestCase(unittest.TestCase):
+    def setUp(self):
+        self.session = LoopbackSession()
+
+    def tearDown(self):
+        self.session.close()
+
+    def insert_one(self, sta):
+        with BackgroundSubmitter(linger=0, sta=sta) as submitter:
+            fut = submitter.submit(_insert(self.session, Line()))
+            self.assertEqual(fut.result(5).num_inserted, 1)
+
+    def test_opened_by_lane(self):
+        self.insert_one(sta=False)
+        self.assertIsNotNone(self.session.com_acad)
+
+    def test_opened_by_caller(self):
+        self.session.open(netload=False)
+        self.insert_one(sta=False)
+        self.insert_one(sta=False)
+        self.assertEqual(len(self.session.acad.model_space), 2)
+
+    @unittest.skipUnless(HAS_PYWIN32, 'pywin32 is not installed.')
+    def test_opened_by_caller_sta(self):
+        self.session.open(netload=False)
+        self.insert_one(sta=True)
@@ -0,0 +1,53 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.tracking`."""
+
+import unittest
+
+from sacad.acdb import Line, Polyline, Vertex
+from sacad.acge import Vector3d
+from sacad.tracking import ChangeTracker
+
+
+class ChangeTrackerTestCase(unittest.TestCase):
+    def test_dirty_fields(self):
+        line = Line(id=1, layer='A', start_point=Vector3d(0, 0, 0))
+        tracker = ChangeTracker()
+        tracker.track(line)
+        self.assertEqual(tracker.dirty_fields(line), [])
+        self.assertEqual(list(tracker.patches()), [])
+
+        line.layer = 'B'
+        line.start_point = Vector3d(1, 0, 0)
+        line.color_index = 1
+        line.end_point = None
+        self.assertEqual(sorted(tracker.dirty_fields(line)),
+                         ['color_index', 'layer', 'start_point'])
+        self.assertEqual(list(tracker.patches()), [Line(
+            id=1, layer='B', start_point=Vector3d(1, 0, 0), color_index=1)])
+
+        tracker.commit()
+        self.assertEqual(list(tracker.patches()), [])
+
+    def test_in_place(self):
+        polyline = Polyline(id=1, vertices=[Vertex(point=Vector3d(0, 0))])
+        tracker = ChangeTracker()
+        tracker.track(polyline)
+        polyline.vertices.append(Vertex(point=Vector3d(1, 0)))
+        self.assertEqual(tracker.dirty_fields(polyline), ['vertices'])
+
+        tracker.untrack(polyline)
+        self.assertEqual(len(tracker), 0)
+
+    def test_without_id(self):
+        with self.assertRaises(ValueError):
+            ChangeTracker().track(Line())
@@ -0,0 +1,44 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Unit test cases for `sacad.benchmark.transport`."""
+
+import unittest
+
+from sacad.benchmark import transport
+
+
+class TransportTestCase(unittest.TestCase):
+    def test_requester(self):
+        trans = transport.RequesterTransport(response_size=3)
+        try:
+            request = trans.connect()
+            self.assertEqual(request('hello'), 'xxx')
+            self.assertEqual(request('é' * 1000), 'xxx')
+        finally:
+            trans.close()
+
+    def test_measure(self):
+        results = transport.run(sizes=[100], concurrencies=[1, 2],
+                                seconds=0.1)
+        self.assertEqual([m.concurrency for m in results], [1, 2])
+        for m in results:
+            self.assertGreater(m.requests, 0)
+            self.assertEqual(m.bytes, m.requests * 200)
+            self.assertLessEqual(m.percentile(50), m.percentile(99))
+        self.assertEqual(len(transport.report(results).splitlines()), 3)
+
+    def test_percentile(self):
+        m = transport.Measurement(size=1, concurrency=1, requests=4,
+                                  seconds=1, bytes=0,
+                                  latencies=[1.0, 2.0, 3.0, 4.0])
+        self.assertEqual([m.percentile(q) for q in (0, 50, 75, 99, 100)],
+                         [1.0, 2.0, 3.0, 4.0, 4.0])
@@ -0,0 +1,93 @@
+# Copyright (c) 2022 Chin Ako <nadesico19@gmail.com>
+# sacad is licensed under Mulan PSL v2.
+# You can use this software according to the terms and conditions of the Mulan
+# PSL v2.
+# You may obtain a copy of Mulan PSL v2 at:
+#          http://license.coscl.org.cn/MulanPSL2
+# THIS SOFTWARE IS PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES OF ANY KIND,
+# EITHER EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO NON-INFRINGEMENT,
+# MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
+# See the Mulan PSL v2 for more details.
+
+"""Recording of the fields of DBObjects changed after they are selected."""
+
+import copy
+import dataclasses
+
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sacad.acdb import DBObject
+
+__all__ = [
+    'ChangeTracker',
+]
+
+_ATOMS = (str, int, float, bool, Enum, type(None))
+
+
+class ChangeTracker:
+    """
+    Record the fields of DBObjects changed since they are tracked, so that
+    DBUpdate sends only those fields.
+
+    Rather than hooking assignments to fields, which would slow down the
+    construction of every object, fields of tracked objects are compared with
+    a snapshot taken when they are tracked. Thus in-place changes, e.g. to
+    vertices of a polyline, are recorded as well.
+
+    A field changed to None is not recorded, since None means "not
+    specified" to SacadMgd.
+    """
+
+    def __init__(self):
+        self._tracked: Dict[int, Tuple[DBObject, Dict[str, Any]]] = {}
+
+    def __len__(self):
+        return len(self._tracked)
+
+    def track(self, *dbobjs: DBObject):
+        for obj in dbobjs:
+            if obj.id is None:
+                raise ValueError(f'{obj!r} is not from AutoCAD, without id.')
+            self._tracked[id(obj)] = (obj, _snapshot(obj))
+
+    def untrack(self, *dbobjs: DBObject):
+        for obj in dbobjs:
+            self._tracked.pop(id(obj), None)
+
+    def dirty_fields(self, dbobj: DBObject) -> List[str]:
+        """Names of the fields changed since the object is tracked."""
+        obj, snapshot = self._tracked[id(dbobj)]
+        return [name for name, value in snapshot.items()
+                if getattr(obj, name) is not None
+                and getattr(obj, name) != value]
+
+    def patches(self) -> Iterator[DBObject]:
+        """
+        An object of the same type with the id and only the changed fields
+        for each tracked object that has been changed.
+        """
+        for obj, _ in self._tracked.values():
+            names = self.dirty_fields(obj)
+            if names:
+                yield type(obj)(id=obj.id,
+                                **{n: getattr(obj, n) for n in names})
+
+    def commit(self):
+        """Take the current fields as unchanged, e.g. after they are sent."""
+        for key, (obj, _) in self._tracked.items():
+            self._tracked[key] = (obj, _snapshot(obj))
+
+
+def _snapshot(obj: DBObject) -> Dict[str, Any]:
+    return {f.name: _freeze(getattr(obj, f.name))
+            for f in dataclasses.fields(obj) if f.name != 'id'}
+
+
+def _freeze(value: Any) -> Any:
+    # Points (Vector3d...) are tuples of numbers, which are never changed.
+    if isinstance(value, _ATOMS) or isinstance(value, tuple) \
+            and all(isinstance(v, _ATOMS) for v in value):
+        return value
+    return copy.deepcopy(value)